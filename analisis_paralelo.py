@@ -0,0 +1,330 @@
+"""Análisis de un archivo grande repartiendo el léxico y el parser entre varios procesos.
+
+El código se corta en trozos en límites de sentencia (un ';' que no esté dentro de
+una cadena ni de un comentario) y cada proceso trabajador lee y parsea sus trozos
+sin tocar la tabla de símbolos: anota lo que harían las reglas (ParserDeTrozos). El
+proceso principal va aplicando esas acciones, trozo por trozo y en orden, con las
+acciones semánticas de Compilador (declarar, asignar, mostrar...), mientras los
+trabajadores siguen con los trozos siguientes:
+
+    with AnalizadorParalelo(procesos=8) as analizador:
+        respuesta = analizador.analizar(codigo)     # La misma que Compilador().analizar()
+        respuesta['paralelo']                       # {'trozos', 'fusiones'}
+
+Los mensajes, las estadísticas y el resultado son los de Compilador.analizar() sobre el
+mismo código. Un trozo se puede parsear aparte si el parser termina bien su último
+';' y el trozo siguiente empieza como empieza una sentencia; si no (un error de
+sintaxis que se salta hasta el ';' del trozo siguiente, una sentencia sin terminar),
+se vuelve a parsear junto con el siguiente en el proceso principal y se cuenta en
+'fusiones' (ver AnalizadorParalelo._unir). Si algo falla en los
+trabajadores o al aplicar las acciones, el código se analiza completo de la forma
+normal. Los programas chicos (menos de dos trozos) también.
+
+No usa receptor, instrumentación ni la caché en disco: para eso, Compilador.
+"""
+import os
+import re
+import sys
+from multiprocessing import Pool
+
+import lexer as reglas
+from lexer import limpiar_errores_lexicos
+from nodos import VARIABLE, ERROR, Nodo, Variable, compactar, expandir
+from parser import Compilador
+
+TAMANO_MINIMO_TROZO = 1 << 16    # Caracteres: con menos, repartir cuesta más que parsear
+TROZOS_POR_PROCESO = 4           # Más trozos que procesos: reparte mejor y el principal
+                                 # empieza a aplicar acciones antes
+
+# Acciones anotadas por ParserDeTrozos, en el orden en que el parser llamó a las reglas
+DECLARACION = 0         # (DECLARACION, nombre, tipo, línea)
+ASIGNACION = 1          # (ASIGNACION, nombre, expresión compactada, línea)
+MENSAJE = 2             # (MENSAJE, texto literal o expresión compactada, línea)
+SIN_PUNTO_Y_COMA = 3    # (SIN_PUNTO_Y_COMA, línea)
+ERROR_SINTAXIS = 4      # (ERROR_SINTAXIS, línea, valor del token)
+FIN_INESPERADO = 5      # (FIN_INESPERADO,)
+
+# Primeros tokens con los que el trozo anterior reduce su última sentencia igual que si
+# el código estuviera completo (None: el código se acabó)
+SIGUEN_A_SENTENCIA = frozenset(('IDENTIFICADOR', 'MENSAJE', None))
+SIN_LEER = object()     # Primer token todavía no leído
+
+# ⭐ Lo que el lexer nunca mira por dentro: un ';' ahí adentro no termina una sentencia.
+# Son las mismas expresiones de lexer.py (PLY las compila con re.VERBOSE)
+OPACOS = re.compile('|'.join(f"(?:{regla.__doc__})" for regla in (
+    reglas.t_CADENA_TEXTO, reglas.t_COMENTARIO_SIMPLE, reglas.t_COMENTARIO_MULTILINEA)), re.VERBOSE)
+
+
+def cortar(codigo, trozos):
+    """Límites de los trozos como (inicio, fin, línea inicial), cortando después de un ';'
+
+    Cada corte es el primer ';' de verdad desde la posición que le toca (len / trozos);
+    pueden salir menos trozos si no hay ';' suficientes. El lexer no cuenta los saltos
+    de línea dentro de un comentario /* */, así que la línea inicial tampoco.
+    """
+    largo = len(codigo)
+    opacos = OPACOS.finditer(codigo)
+    siguiente = next(opacos, None)
+    limites = []
+    inicio, linea = 0, 1
+    ocultos = 0         # Saltos de línea dentro de comentarios entre 'inicio' y el corte
+    for i in range(1, trozos):
+        pos = max(largo * i // trozos, inicio)
+        while True:
+            # Los opacos que terminan antes de 'pos' ya quedaron atrás
+            while siguiente is not None and siguiente.end() <= pos:
+                ocultos += codigo.count('\n', siguiente.start(), siguiente.end())
+                siguiente = next(opacos, None)
+            if siguiente is not None and siguiente.start() < pos:
+                pos = siguiente.end()           # 'pos' cayó dentro de uno: se sigue después
+                continue
+            fin_hueco = siguiente.start() if siguiente is not None else largo
+            punto_y_coma = codigo.find(';', pos, fin_hueco)
+            if punto_y_coma >= 0 or siguiente is None:
+                break
+            pos = siguiente.end()
+        if punto_y_coma < 0:
+            break
+        corte = punto_y_coma + 1
+        limites.append((inicio, corte, linea))
+        linea += codigo.count('\n', inicio, corte) - ocultos
+        inicio, ocultos = corte, 0
+    limites.append((inicio, largo, linea))
+    return limites
+
+
+class ParserDeTrozos(Compilador):
+    """Compilador que solo parsea: cada regla anota su acción en vez de aplicarla
+
+    Las acciones semánticas no cambian cómo se parsea (lo único que lee la tabla es
+    usar_variable, que decide entre Variable y ErrorVariable, y eso se decide al
+    aplicar la acción). Las expresiones salen compactadas, listas para mandarlas al
+    proceso principal.
+    """
+
+    def __init__(self, lexico='ply'):
+        super().__init__(lexico)
+        self.acciones = []
+
+    def parsear(self, codigo, linea, reanudando):
+        """Parsea un trozo que empieza en 'linea'; 'reanudando' si no es el primero
+
+        Retorna (acciones, errores léxicos, aceptado, limpio, primer token): 'aceptado' si
+        terminó con el programa completo (o sin sentencias, al reanudar), 'limpio' si el
+        parser terminó bien su último ';' y el tipo del primer token (None si no hay).
+        """
+        lexer = self.analizador_lexico
+        limpiar_errores_lexicos(lexer.errores_lexicos)
+        lexer.lineno = linea
+        self.acciones = acciones = []
+        self.primer_token = SIN_LEER
+        self.limpio = None
+        self._ultimo_token = None
+        self._reanudando = reanudando
+        self._fin_reanudado = False
+        try:
+            aceptado = self.parser.parse(codigo, lexer=lexer, tokenfunc=self._leer_token) is not None
+        finally:
+            self._reanudando = False
+        return (acciones, list(lexer.errores_lexicos), aceptado or self._fin_reanudado,
+                bool(self.limpio), self.primer_token)
+
+    def _leer_token(self):
+        """Siguiente token del trozo; al llegar al final revisa si el trozo quedó limpio"""
+        token = self.analizador_lexico.token()
+        ultimo = self._ultimo_token
+        if self.primer_token is SIN_LEER:
+            self.primer_token = token.type if token is not None else None
+        elif token is None and self.limpio is None:
+            # ⭐ Limpio: el parser acaba de poner el ';' en la pila y pide el siguiente. Si
+            # lo pide p_error saltándose tokens, con el código completo habría seguido
+            # saltando en el trozo siguiente
+            self.limpio = (ultimo is not None and ultimo.type == 'PUNTO_Y_COMA'
+                           and self.parser.symstack[-1] is ultimo)
+        self._ultimo_token = token
+        return token
+
+    def declarar(self, var, tipo_var, linea):
+        self.acciones.append((DECLARACION, var, tipo_var, linea))
+
+    def falta_punto_y_coma(self, linea):
+        self.acciones.append((SIN_PUNTO_Y_COMA, linea))
+
+    def asignar(self, var, expr, linea):
+        self.acciones.append((ASIGNACION, var, compactar(expr), linea))
+
+    def mostrar(self, valor_texto, linea):
+        if isinstance(valor_texto, Nodo):
+            valor_texto = compactar(valor_texto)
+        self.acciones.append((MENSAJE, valor_texto, linea))
+
+    def usar_variable(self, var):
+        return Variable(var)
+
+    def error_sintaxis(self, linea, valor):
+        self.acciones.append((ERROR_SINTAXIS, linea, valor))
+
+    def fin_inesperado(self):
+        self.acciones.append((FIN_INESPERADO,))
+
+
+# Parser del proceso trabajador (se arma una sola vez por proceso)
+_parser_trozos = None
+
+
+def iniciar_trabajador(lexico='ply'):
+    """Inicializa el ParserDeTrozos del proceso para no pagar el arranque en cada trozo"""
+    global _parser_trozos
+    _parser_trozos = ParserDeTrozos(lexico)
+
+
+def parsear_trozo(tarea):
+    """Parsea un trozo (código, línea inicial, reanudando) y retorna sus acciones"""
+    if _parser_trozos is None:
+        iniciar_trabajador()
+    return _parser_trozos.parsear(*tarea)
+
+
+class AnalizadorParalelo:
+    """Pool de procesos que parsean trozos y un Compilador que aplica sus acciones en orden"""
+
+    def __init__(self, procesos=None, tamano_trozo=TAMANO_MINIMO_TROZO, lexico='ply', optimizar=False):
+        self.procesos = procesos or os.cpu_count() or 1
+        self.tamano_trozo = tamano_trozo
+        self.compilador = Compilador(lexico, optimizar=optimizar)
+        self.parser_local = ParserDeTrozos(lexico)     # Para volver a parsear las fusiones
+        self.pool = None
+        if self.procesos > 1:
+            self.pool = Pool(self.procesos, initializer=iniciar_trabajador, initargs=(lexico,))
+
+    def analizar(self, codigo):
+        """Analiza el código en paralelo; retorna lo mismo que Compilador.analizar() y 'paralelo'"""
+        trozos = min(len(codigo) // self.tamano_trozo, self.procesos * TROZOS_POR_PROCESO)
+        limites = cortar(codigo, trozos) if self.pool is not None and trozos > 1 else None
+        if limites is None or len(limites) < 2:
+            return self._analizar_completo(codigo)
+
+        tareas = [(codigo[inicio:fin], linea, i > 0) for i, (inicio, fin, linea) in enumerate(limites)]
+        informe = {'trozos': len(limites), 'fusiones': 0}
+        try:
+            # ⭐ imap entrega los trozos en orden apenas están: se aplican mientras los
+            # trabajadores parsean los siguientes
+            parseados = self.pool.imap(parsear_trozo, tareas)
+            respuesta = self._aplicar(self._unir(codigo, limites, parseados, informe))
+        except Exception:
+            # Lo que haya fallado (o la excepción que también habría salido al analizar
+            # todo junto) queda igual que con Compilador.analizar()
+            return self._analizar_completo(codigo)
+        respuesta['paralelo'] = informe
+        return respuesta
+
+    def analizar_archivo(self, ruta):
+        """Analiza un archivo (UTF-8, con los saltos de línea normalizados) en paralelo
+
+        A diferencia de Compilador.analizar_archivo(), el archivo se lee completo: hay que
+        tenerlo entero para repartirlo.
+        """
+        with open(ruta, encoding='utf-8') as archivo:
+            return self.analizar(archivo.read())
+
+    def _analizar_completo(self, codigo):
+        respuesta = self.compilador.analizar(codigo)
+        respuesta['paralelo'] = {'trozos': 1, 'fusiones': 0}
+        return respuesta
+
+    def _unir(self, codigo, limites, parseados, informe):
+        """Los trozos parseados, en orden, con los que no se podían parsear aparte ya fusionados
+
+        Un trozo se puede usar tal cual si quedó limpio y el siguiente empieza con un token
+        que puede seguir a una sentencia: el parser no reduce la última sentencia hasta ver
+        ese token, y con otro habría reportado el error antes de reducirla. Si no, se
+        vuelve a parsear aquí desde su inicio (que sí empieza limpio) junto con el
+        siguiente; si tampoco así queda limpio, junto con todo el resto del código, para
+        no volver a parsear lo mismo una y otra vez (un ';' de más hace que p_error se
+        salte el resto del archivo sentencia por sentencia).
+        """
+        ultimo = len(limites) - 1
+        anterior = None     # (índice de su primer trozo, parseado) esperando al siguiente
+        for i, parseado in enumerate(parseados):
+            if anterior is not None:
+                desde, (acciones, errores, aceptado, limpio, _) = anterior
+                if limpio and parseado[4] in SIGUEN_A_SENTENCIA:
+                    yield acciones, errores, aceptado
+                else:
+                    informe['fusiones'] += 1
+                    if i - desde > 1:
+                        i = ultimo   # Ya falló una fusión: se parsea todo lo que queda
+                    inicio, _, linea = limites[desde]
+                    parseado = self.parser_local.parsear(codigo[inicio:limites[i][1]], linea, desde > 0)
+                    if i == ultimo:
+                        yield parseado[:3]
+                        return
+                    anterior = (desde, parseado)
+                    continue
+            anterior = (i, parseado)
+        yield anterior[1][:3]
+
+    def _aplicar(self, parseados):
+        """Aplica las acciones de los trozos con el Compilador y arma la respuesta
+
+        Hace lo mismo que las reglas y p_lista_sentencias en un análisis normal: las
+        variables leídas se marcan como no declaradas según la tabla de ese momento.
+        """
+        compilador = self.compilador
+        compilador.reset()
+        errores_lexicos = compilador.analizador_lexico.errores_lexicos
+        limpiar_errores_lexicos(errores_lexicos)
+        tabla = compilador.tabla_simbolos
+        intern = sys.intern
+
+        def armar(compacto):
+            return expandir([
+                entrada if entrada[0] != VARIABLE
+                else (VARIABLE if entrada[1] in tabla else ERROR, intern(entrada[1]))
+                for entrada in compacto
+            ])
+
+        sentencias = []
+        aceptado = False
+        for acciones, errores, aceptado in parseados:
+            errores_lexicos.extend(errores)
+            for accion in acciones:
+                tipo = accion[0]
+                if tipo == DECLARACION:
+                    sentencia = compilador.declarar(intern(accion[1]), accion[2], accion[3])
+                elif tipo == ASIGNACION:
+                    sentencia = compilador.asignar(intern(accion[1]), armar(accion[2]), accion[3])
+                elif tipo == MENSAJE:
+                    valor = accion[1]
+                    sentencia = compilador.mostrar(armar(valor) if type(valor) is tuple else valor, accion[2])
+                elif tipo == SIN_PUNTO_Y_COMA:
+                    sentencia = compilador.falta_punto_y_coma(accion[1])
+                elif tipo == ERROR_SINTAXIS:
+                    compilador.error_sintaxis(accion[1], accion[2])
+                    continue
+                else:
+                    compilador.fin_inesperado()
+                    continue
+                # Lo mismo que p_lista_sentencias después de cada sentencia
+                compilador.cache_tipos.clear()
+                if sentencia is not None:
+                    sentencias.append(sentencia)
+
+        return {
+            'exito': True,
+            'resultado': sentencias if aceptado else None,
+            'mensajes': compilador.diagnosticos.ordenados(errores_lexicos),
+            'estadisticas': compilador.obtener_estadisticas()
+        }
+
+    def cerrar(self):
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
@@ -0,0 +1,73 @@
+"""Benchmark de memoria: analizar() con el texto entero vs. analizar_archivo() por bloques.
+
+Genera un archivo grande con comentarios largos (también de varias líneas) y pocas
+variables, y reporta el pico de memoria (tracemalloc) y el tiempo de cada forma.
+Sale con código 1 si los mensajes no coinciden.
+
+    python benchmarks/archivo_grande.py [megas] [tamano_bloque]
+"""
+import os
+import sys
+import time
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import Compilador
+
+RELLENO = "// " + "comentario de relleno " * 3 + "\n"
+BLOQUE_COMENTARIO = "/* comentario\n" + "   de varias líneas\n" * 20 + "*/\n"
+
+
+def generar_archivo(ruta, megas):
+    """Escribe un programa de unos 'megas' MB en la ruta"""
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        for i in range(10):
+            archivo.write(f"v{i} Entero;\n")
+        escrito, i = 0, 0
+        while escrito < megas * 1_000_000:
+            parte = f"v{i % 10} = {i} + 1;\n" + RELLENO * 40 + BLOQUE_COMENTARIO
+            archivo.write(parte)
+            escrito += len(parte)
+            i += 1
+
+
+def medir(funcion):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = funcion()
+    tiempo = time.perf_counter() - inicio
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return resultado, tiempo, pico
+
+
+if __name__ == '__main__':
+    megas = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    tamano_bloque = int(sys.argv[2]) if len(sys.argv) > 2 else 1 << 20
+    compilador = Compilador()
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, 'grande.cos')
+        generar_archivo(ruta, megas)
+
+        def completo():
+            with open(ruta, encoding='utf-8') as archivo:
+                return compilador.analizar(archivo.read(), receptor=lambda sentencia: None)
+
+        def por_bloques():
+            return compilador.analizar_archivo(ruta, receptor=lambda sentencia: None,
+                                               tamano_bloque=tamano_bloque)
+
+        r_completo, t_completo, p_completo = medir(completo)
+        r_bloques, t_bloques, p_bloques = medir(por_bloques)
+
+    print(f"archivo: {megas} MB, {len(r_completo['mensajes'])} mensajes")
+    print(f"{'forma':<12} {'tiempo (s)':>10} {'pico (MB)':>10}")
+    print(f"{'completo':<12} {t_completo:>10.2f} {p_completo / 1e6:>10.1f}")
+    print(f"{'por bloques':<12} {t_bloques:>10.2f} {p_bloques / 1e6:>10.1f}")
+
+    if r_completo['mensajes'] != r_bloques['mensajes']:
+        print("❌ Los mensajes no coinciden")
+        sys.exit(1)
@@ -0,0 +1,54 @@
+"""Benchmark de arranque: Compilador() con tablas precompiladas vs. construyendo el LALR.
+
+    python benchmarks/arranque.py [repeticiones]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ply.lex as lex
+import ply.yacc as yacc
+import lexer
+from parser import Compilador
+
+
+class _SinLog:
+    """Silencia las advertencias de yacc al construir sin tablas"""
+    def warning(self, *args, **kwargs):
+        pass
+    error = info = debug = critical = warning
+
+
+def arranque_sin_tablas():
+    """Camino anterior: lexer desde las reglas y autómata LALR calculado en cada instancia"""
+    lex.lex(module=lexer)
+    compilador = Compilador.__new__(Compilador)
+    yacc.yacc(module=compilador, debug=False, write_tables=False,
+              tabmodule='_sin_tablas_precompiladas', errorlog=_SinLog())
+
+
+def arranque_con_tablas():
+    """Camino actual: lexer desde lextab.py y Compilador() desde parsetab.py"""
+    lexer.construir_analizador_lexico()
+    Compilador()
+
+
+def medir(funcion, repeticiones):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones
+
+
+if __name__ == '__main__':
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    arranque_con_tablas()  # Calienta imports de lextab/parsetab
+
+    sin_tablas = medir(arranque_sin_tablas, repeticiones)
+    con_tablas = medir(arranque_con_tablas, repeticiones)
+
+    print(f"Sin tablas:  {sin_tablas * 1000:8.3f} ms por arranque")
+    print(f"Con tablas:  {con_tablas * 1000:8.3f} ms por arranque")
+    print(f"Mejora:      {sin_tablas / con_tablas:8.2f}x")
@@ -0,0 +1,158 @@
+"""Caché en disco: analizar de nuevo contra leer el resultado guardado.
+
+Para varios tamaños de programa mide la latencia de un fallo (análisis completo más
+escritura), de un acierto (hash del código, lectura, mensajes y tabla de símbolos) y de
+armar después el árbol del acierto, que se hace recién al leer 'resultado'. Revisa que
+el acierto devuelva lo mismo que el análisis (éxito, mensajes, estadísticas y árbol) y
+deje la misma tabla de símbolos en el compilador.
+Después lanza varios procesos que analizan los mismos programas sobre una caché chica
+(con desalojo constante) y revisa que cada resultado sea el esperado.
+
+Sale con código 1 si algún resultado de la caché difiere.
+
+    python benchmarks/cache_disco.py [repeticiones] [procesos]
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+from multiprocessing import Pool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import Compilador
+from cache_compilacion import CacheCompilacion
+from generador import FORMAS
+
+TAMANOS = (10, 100, 1000, 10000)
+
+
+def huella(respuesta):
+    """Lo que tiene que coincidir entre un acierto y el análisis"""
+    estadisticas = {nombre: valor for nombre, valor in respuesta['estadisticas'].items()
+                    if nombre != 'cache_disco'}
+    arbol = respuesta['resultado']
+    return (respuesta['exito'], respuesta['mensajes'], estadisticas,
+            None if arbol is None else [sentencia.como_tupla() for sentencia in arbol])
+
+
+def simbolos(compilador):
+    return [(nombre, datos['tipo'], datos['linea'], datos['valor'] and datos['valor'].como_tupla())
+            for nombre, datos in compilador.tabla_simbolos.como_diccionario().items()]
+
+
+def programas_de_prueba():
+    return [(f"{forma}-{n}", FORMAS[forma](n, semilla=n))
+            for forma in ('declaraciones', 'errores', 'calculos') for n in (20, 200)]
+
+
+def trabajar(argumentos):
+    """Proceso de la prueba de concurrencia: analiza todo varias veces con la caché"""
+    carpeta, limite, vueltas = argumentos
+    compilador = Compilador(cache=CacheCompilacion(carpeta, limite))
+    esperados = {nombre: huella(Compilador().analizar(codigo))
+                 for nombre, codigo in programas_de_prueba()}
+    diferentes = 0
+    for _ in range(vueltas):
+        for nombre, codigo in programas_de_prueba():
+            diferentes += huella(compilador.analizar(codigo)) != esperados[nombre]
+    return diferentes, compilador.cache_disco.estadisticas()
+
+
+if __name__ == '__main__':
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    procesos = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    carpeta = tempfile.mkdtemp(prefix='cache_costenol_')
+    diferencias = 0
+    try:
+        cache = CacheCompilacion(os.path.join(carpeta, 'latencia'))
+        con_cache = Compilador(cache=cache)
+        sin_cache = Compilador()
+
+        print(f"{'forma':<14} {'sentencias':>10} {'análisis (ms)':>14} {'fallo (ms)':>11} "
+              f"{'acierto (ms)':>13} {'árbol (ms)':>11} {'aceleración':>12}")
+        for forma in ('declaraciones', 'calculos', 'errores'):
+            for n in TAMANOS:
+                codigo = FORMAS[forma](n)
+                inicio = time.perf_counter()
+                referencia = sin_cache.analizar(codigo)
+                t_analisis = time.perf_counter() - inicio
+                tabla = simbolos(sin_cache)
+
+                inicio = time.perf_counter()
+                fallo = con_cache.analizar(codigo)
+                t_fallo = time.perf_counter() - inicio
+
+                veces = max(1, repeticiones // max(1, n // 100))
+                inicio = time.perf_counter()
+                for _ in range(veces):
+                    acierto = con_cache.analizar(codigo)
+                t_acierto = (time.perf_counter() - inicio) / veces
+                inicio = time.perf_counter()
+                len(list(acierto['resultado']))
+                t_arbol = time.perf_counter() - inicio
+
+                if (fallo['estadisticas']['cache_disco'], acierto['estadisticas']['cache_disco']) != ('fallo', 'acierto'):
+                    print(f"❌ {forma}-{n}: se esperaba un fallo y después un acierto")
+                    diferencias += 1
+                if not huella(referencia) == huella(fallo) == huella(acierto):
+                    print(f"❌ {forma}-{n}: el acierto no devuelve lo mismo que el análisis")
+                    diferencias += 1
+                if simbolos(con_cache) != tabla:
+                    print(f"❌ {forma}-{n}: el acierto no deja la tabla de símbolos del análisis")
+                    diferencias += 1
+                print(f"{forma:<14} {n:>10} {t_analisis * 1e3:>14.3f} {t_fallo * 1e3:>11.3f} "
+                      f"{t_acierto * 1e3:>13.3f} {t_arbol * 1e3:>11.3f} {t_analisis / t_acierto:>11.0f}x")
+
+        # Con receptor el acierto entrega las mismas sentencias
+        codigo = FORMAS['calculos'](100)
+        recibidas = []
+        con_cache.analizar(codigo, receptor=lambda sentencia: recibidas.append(sentencia.como_tupla()))
+        if recibidas != huella(sin_cache.analizar(codigo))[3]:
+            print("❌ El receptor no recibió las mismas sentencias desde la caché")
+            diferencias += 1
+
+        # Un archivo que termina a media sentencia: sin receptor 'resultado' es None, y el
+        # acierto también, aunque la entrada se haya guardado desde un análisis con receptor
+        codigo = FORMAS['declaraciones'](10) + "z Entero;\nz = 1 +"
+        recibidas = []
+        con_cache.analizar(codigo, receptor=recibidas.append)
+        esperado = sin_cache.analizar(codigo)
+        if huella(con_cache.analizar(codigo)) != huella(esperado) or len(recibidas) != 11:
+            print("❌ El acierto no devuelve el mismo 'resultado' que un análisis sin receptor")
+            diferencias += 1
+
+        # El gancho de métricas también se entera de los aciertos
+        registros = []
+        medido = Compilador(cache=cache, gancho=registros.append)
+        respuesta = medido.analizar(codigo)
+        if ([r.get('cache_disco') for r in registros] != ['acierto']
+                or respuesta['estadisticas']['instrumentacion'] is not registros[0]):
+            print("❌ Un acierto no pasó por la instrumentación")
+            diferencias += 1
+        print(f"Caché de latencia: {cache.estadisticas()}, {cache.tamano()[1] / 1024:.0f} KiB")
+
+        # Concurrencia: límite chico para que los procesos desalojen mientras otros leen
+        limite = 96 << 10
+        compartida = os.path.join(carpeta, 'compartida')
+        inicio = time.perf_counter()
+        with Pool(procesos) as pool:
+            resultados = pool.map(trabajar, [(compartida, limite, 20)] * procesos)
+        t_concurrencia = time.perf_counter() - inicio
+        diferentes = sum(d for d, _ in resultados)
+        aciertos = sum(e['aciertos'] for _, e in resultados)
+        consultas = aciertos + sum(e['fallos'] for _, e in resultados)
+        desalojos = sum(e['desalojos'] for _, e in resultados)
+        entradas, ocupado = CacheCompilacion(compartida, limite).tamano()
+        print(f"{procesos} procesos sobre {limite >> 10} KiB: {consultas} análisis, {aciertos} aciertos, "
+              f"{desalojos} desalojos, {entradas} entradas ({ocupado >> 10} KiB) en {t_concurrencia:.2f} s")
+        if diferentes:
+            print(f"❌ {diferentes} resultados distintos con varios procesos")
+            diferencias += diferentes
+    finally:
+        shutil.rmtree(carpeta, ignore_errors=True)
+
+    if diferencias:
+        sys.exit(1)
+    print("✅ La caché devuelve lo mismo que el análisis")
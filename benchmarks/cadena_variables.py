@@ -0,0 +1,46 @@
+"""Benchmark de la caché de valores: cadenas 'b = a + a; c = b + b; ...'.
+
+Sin caché cada Mensaje.Texto recorre el árbol en tiempo exponencial según la
+profundidad de la cadena; con caché cada variable se evalúa una vez por asignación.
+
+    python benchmarks/cadena_variables.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import Compilador, FALTA
+
+
+class CompiladorSinCache(Compilador):
+    """Evalúa igual que antes de la caché, recorriendo siempre el valor guardado"""
+    def buscar_valor_memorizado(self, clase, variable):
+        return 0, FALTA
+
+
+def generar_cadena(profundidad):
+    lineas = ["a Real;", "a = 1;"]
+    anterior = 'a'
+    for i in range(profundidad):
+        lineas += [f"x{i} Real;", f"x{i} = {anterior} + {anterior};"]
+        anterior = f"x{i}"
+    lineas.append(f"Mensaje.Texto({anterior});")
+    return '\n'.join(lineas) + '\n'
+
+
+def medir(compilador, codigo):
+    inicio = time.perf_counter()
+    resultado = compilador.analizar(codigo)
+    return time.perf_counter() - inicio, resultado['estadisticas']
+
+
+if __name__ == '__main__':
+    con_cache, sin_cache = Compilador(), CompiladorSinCache()
+    print(f"{'profundidad':>11} {'sin caché (s)':>14} {'con caché (s)':>14} {'aciertos':>9} {'fallos':>7}")
+    for profundidad in (10, 14, 18, 20, 200):
+        codigo = generar_cadena(profundidad)
+        t_sin = medir(sin_cache, codigo)[0] if profundidad <= 20 else float('nan')
+        t_con, stats = medir(con_cache, codigo)
+        print(f"{profundidad:>11} {t_sin:>14.4f} {t_con:>14.4f} {stats['cache_aciertos']:>9} {stats['cache_fallos']:>7}")
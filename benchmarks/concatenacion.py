@@ -0,0 +1,100 @@
+"""Benchmark de la suma de textos: cadenas muy largas de 'Texto + Texto'.
+
+Dos formas de programa, con n piezas de LARGO caracteres:
+
+    expresion   una sola asignación 't = p0 + p1 + ... ;' con variables Texto
+    variables   una variable por pieza, 't5 = t4 + "..."', y se muestra la última
+
+Compara la evaluación con cuerdas (cuerdas.py: cada suma es un nodo y el texto se arma
+una vez al mostrarlo) contra sumar los str directamente, que copia todo lo acumulado
+en cada suma (cuadrático). Revisa que el texto mostrado sea el mismo y el esperado.
+
+    python benchmarks/concatenacion.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import parser as modulo_parser
+from parser import Compilador
+
+LARGO = 40
+TAMANOS = (2000, 8000, 32000, 128000)
+# Sin cuerdas, más que esto tarda demasiado; con variables, además, la caché de valores
+# guarda el texto de cada una (n² / 2 caracteres en total)
+MAXIMO_SIN_CUERDAS = {'expresion': 32000, 'variables': 8000}
+
+
+def pieza(i):
+    return f"{i:08d}" + "-" * (LARGO - 8)
+
+
+def en_una_expresion(n):
+    lineas = []
+    for i in range(n):
+        lineas += [f"p{i} Texto;", f"p{i} = \"{pieza(i)}\";"]
+    lineas.append("t Texto;")
+    lineas.append("t = " + " + ".join(f"p{i}" for i in range(n)) + ";")
+    lineas.append("Mensaje.Texto(t);")
+    return '\n'.join(lineas) + '\n'
+
+
+def en_variables(n):
+    lineas = ["t0 Texto;", f"t0 = \"{pieza(0)}\";"]
+    for i in range(1, n):
+        lineas += [f"t{i} Texto;", f"t{i} = t{i - 1} + \"{pieza(i)}\";"]
+    lineas.append(f"Mensaje.Texto(t{n - 1});")
+    return '\n'.join(lineas) + '\n'
+
+
+def sumar_str(op, val_izq, val_der):
+    """operar() de antes de las cuerdas, pero sumando los textos con str"""
+    try:
+        if op == '+':
+            return val_izq + val_der
+        if op == '-':
+            return val_izq - val_der
+        if op == '*':
+            return val_izq * val_der
+        if op == '/':
+            return val_izq / val_der if val_der != 0 else None
+    except TypeError:
+        return None
+    return None
+
+
+def medir(codigo, con_cuerdas):
+    """Tiempo semántico de CPU (validación y evaluación) y el texto mostrado"""
+    original = modulo_parser.operar
+    if not con_cuerdas:
+        modulo_parser.operar = sumar_str
+    try:
+        respuesta = Compilador(medir=True).analizar(codigo)
+    finally:
+        modulo_parser.operar = original
+    mostrado = respuesta['mensajes'][-1]['mensaje']
+    return respuesta['estadisticas']['instrumentacion']['semantico']['cpu'], mostrado
+
+
+if __name__ == '__main__':
+    distintos = 0
+    print(f"{'forma':<10} {'piezas':>7} {'caracteres':>11} {'con cuerdas (s)':>15} {'con str (s)':>12}")
+    for forma, generar in (('expresion', en_una_expresion), ('variables', en_variables)):
+        for n in TAMANOS:
+            codigo = generar(n)
+            esperado = ''.join(pieza(i) for i in range(n))
+            t_cuerdas, mostrado = medir(codigo, True)
+            distintos += f'"{esperado}"' not in mostrado
+            if n <= MAXIMO_SIN_CUERDAS[forma]:
+                t_str, mostrado_str = medir(codigo, False)
+                distintos += mostrado_str != mostrado
+                columna_str = f"{t_str:>12.3f}"
+            else:
+                columna_str = f"{'-':>12}"
+            print(f"{forma:<10} {n:>7} {n * LARGO:>11} {t_cuerdas:>15.3f} {columna_str}")
+
+    if distintos:
+        print(f"❌ {distintos} textos distintos")
+        sys.exit(1)
+    print("✅ Mismo texto con cuerdas y con str")
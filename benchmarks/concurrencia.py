@@ -0,0 +1,61 @@
+"""Prueba de estrés de concurrencia: cientos de análisis a la vez deben dar lo mismo que en serie.
+
+Sale con código 1 si algún resultado concurrente difiere del serial.
+
+    python benchmarks/concurrencia.py [programas] [hilos]
+"""
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import Compilador, analizar_muchos
+
+
+def generar_programa(semilla):
+    """Programa pequeño con aciertos, errores de tipo, léxicos y de sintaxis según la semilla"""
+    azar = random.Random(semilla)
+    lineas = []
+    for i in range(azar.randint(5, 40)):
+        opcion = azar.random()
+        if opcion < 0.3:
+            lineas.append(f"v{i} {azar.choice(['Entero', 'Real', 'Texto'])};")
+        elif opcion < 0.6:
+            lineas.append(f"v{azar.randint(0, i)} = {azar.randint(0, 9)} + {azar.randint(0, 9)},5;")
+        elif opcion < 0.75:
+            lineas.append(f"Mensaje.Texto(v{azar.randint(0, i)});")
+        elif opcion < 0.85:
+            lineas.append(f"{azar.randint(1, 9)}x{i} Entero;")   # Error léxico
+        elif opcion < 0.95:
+            lineas.append(f"v{i} Entero")                        # Falta el punto y coma
+        else:
+            lineas.append("$ @")                                  # Caracteres ilegales
+    return '\n'.join(lineas) + '\n'
+
+
+def resumen(resultado):
+    return ([(m['tipo'], m['linea'], m['mensaje']) for m in resultado['mensajes']],
+            resultado['estadisticas']['aciertos'], resultado['estadisticas']['errores'])
+
+
+if __name__ == '__main__':
+    programas = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    hilos = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    sys.setswitchinterval(1e-6)  # Forzar cambios de hilo frecuentes para destapar carreras
+
+    codigos = [generar_programa(semilla) for semilla in range(programas)]
+    serial = Compilador()
+    esperados = [resumen(serial.analizar(codigo)) for codigo in codigos]
+
+    inicio = time.perf_counter()
+    obtenidos = [resumen(r) for r in analizar_muchos(codigos, hilos=hilos)]
+    duracion = time.perf_counter() - inicio
+
+    diferentes = [i for i, (a, b) in enumerate(zip(esperados, obtenidos)) if a != b]
+    print(f"{programas} análisis con {hilos} hilos en {duracion:.3f} s")
+    if diferentes:
+        print(f"❌ {len(diferentes)} resultados difieren del análisis serial, p. ej. el #{diferentes[0]}")
+        sys.exit(1)
+    print("✅ Todos los resultados coinciden con el análisis serial")
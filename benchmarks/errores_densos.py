@@ -0,0 +1,36 @@
+"""Benchmark de recuperación de errores en archivos con muchos errores.
+
+Cada bloque declara una variable y dos líneas más abajo la vuelve a declarar con un
+tipo de sobra, así que p_error pregunta en cada bloque si la línea anterior tenía
+código. Con el índice por línea el tiempo por bloque debe quedarse constante al
+duplicar el archivo (antes crecía con la cantidad de mensajes).
+
+    python benchmarks/errores_densos.py [n_inicial] [duplicaciones]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import Compilador
+
+
+def generar_programa(n):
+    """Programa con n bloques de declaración seguida de un error de sintaxis"""
+    return ''.join(f"v{i} Entero;\n\nv{i} Entero Entero;\n" for i in range(n))
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    duplicaciones = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    compilador = Compilador()
+
+    print(f"{'bloques':>10} {'mensajes':>9} {'tiempo (s)':>11} {'µs/bloque':>10}")
+    for _ in range(duplicaciones):
+        codigo = generar_programa(n)
+        inicio = time.perf_counter()
+        resultado = compilador.analizar(codigo)
+        tiempo = time.perf_counter() - inicio
+        print(f"{n:>10} {len(resultado['mensajes']):>9} {tiempo:>11.3f} {tiempo / n * 1e6:>10.2f}")
+        n *= 2
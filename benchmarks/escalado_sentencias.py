@@ -0,0 +1,44 @@
+"""Benchmark de escalado: tiempo de analizar() según la cantidad de sentencias.
+
+Con la lista lineal (o con un receptor) el tiempo por sentencia debe quedarse
+más o menos constante al duplicar el tamaño del programa.
+
+    python benchmarks/escalado_sentencias.py [n_inicial] [duplicaciones]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import Compilador
+
+
+def generar_programa(n):
+    """Programa con n sentencias: declaraciones y asignaciones alternadas"""
+    lineas = []
+    for i in range(n // 2):
+        lineas.append(f"v{i} Entero;")
+        lineas.append(f"v{i} = {i} + 1;")
+    return '\n'.join(lineas) + '\n'
+
+
+def medir(compilador, codigo, receptor=None):
+    inicio = time.perf_counter()
+    compilador.analizar(codigo, receptor=receptor)
+    return time.perf_counter() - inicio
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    duplicaciones = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    compilador = Compilador()
+
+    print(f"{'sentencias':>10} {'lista (s)':>10} {'µs/sent':>8} {'receptor (s)':>13} {'µs/sent':>8}")
+    for _ in range(duplicaciones):
+        codigo = generar_programa(n)
+        contador = [0]
+        t_lista = medir(compilador, codigo)
+        t_receptor = medir(compilador, codigo, receptor=lambda s: contador.__setitem__(0, contador[0] + 1))
+        print(f"{n:>10} {t_lista:>10.3f} {t_lista / n * 1e6:>8.2f} {t_receptor:>13.3f} {t_receptor / n * 1e6:>8.2f}")
+        n *= 2
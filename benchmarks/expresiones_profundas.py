@@ -0,0 +1,114 @@
+"""Expresiones de cientos de miles de términos: chequeo de tipos y evaluación sin recursión.
+
+Cada caso se analiza y compila con el límite de recursión de Python bajado a
+LIMITE_RECURSION (cualquier recorrido recursivo del árbol fallaría con "¡Qué
+desastre!"), con n y 2n términos para ver que el tiempo crece lineal:
+
+    izquierda   x = 1 + 1 + ... + 1              (árbol que crece a la izquierda)
+    derecha     x = 1 + (1 + (... + 1))          (árbol que crece a la derecha)
+    variables   v1 = v0 + 1; v2 = v1 + 1; ...    (cadena de valores entre variables)
+    capturas    Captura.Real(Captura.Real(...))  (parámetros anidados)
+    texto       "a" + "a" + ... + "a"
+    error       1 + 1 + ... + 1 * "a"            (error fatal en la hoja más profunda)
+
+Revisa el último mensaje de cada análisis y la salida del programa compilado; sale con
+código 1 si algo no coincide.
+
+    python benchmarks/expresiones_profundas.py [términos]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import Compilador
+from nodos import compactar, expandir
+
+LIMITE_RECURSION = 150
+
+
+def izquierda(n):
+    return "x Real;\nx = " + " + ".join(["1"] * n) + ";\nMensaje.Texto(x);\n"
+
+
+def derecha(n):
+    return "x Real;\nx = " + "1 + (" * (n - 1) + "1" + ")" * (n - 1) + ";\nMensaje.Texto(x);\n"
+
+
+def variables(n):
+    lineas = ["v0 Real;", "v0 = 1;"]
+    for i in range(1, n):
+        lineas += [f"v{i} Real;", f"v{i} = v{i - 1} + 1;"]
+    return '\n'.join(lineas) + f"\nMensaje.Texto(v{n - 1});\n"
+
+
+def capturas(n):
+    return "c Real;\nc = " + "Captura.Real(" * n + "1" + ")" * n + ";\nMensaje.Texto(c);\n"
+
+
+def texto(n):
+    return "t Texto;\nt = " + " + ".join(['"a"'] * n) + ";\nMensaje.Texto(t);\n"
+
+
+def error(n):
+    return "x Real;\nx = " + " + ".join(["1"] * n) + ' * "a";\n'
+
+
+# Caso -> (generador, último mensaje esperado, salida esperada del programa o None)
+CASOS = {
+    'izquierda': (izquierda, lambda n: f'Nojoda monstruo está bueno el valor es "{n}"', lambda n: [str(n)]),
+    'derecha': (derecha, lambda n: f'Nojoda monstruo está bueno el valor es "{n}"', lambda n: [str(n)]),
+    'variables': (variables, lambda n: f'Nojoda monstruo está bueno el valor es "{n}"', lambda n: [str(n)]),
+    'capturas': (capturas, lambda n: 'Nojoda monstruo está bueno el valor es "1"', lambda n: ['1']),
+    'texto': (texto, lambda n: f'Nojoda monstruo está bueno el valor es "{"a" * n}"',
+              lambda n: ['a' * n]),
+    'error': (error, lambda n: 'Error: La operación "*" solo funciona con números, no con Entero y Texto',
+              lambda n: None),
+}
+
+
+def correr(generador, n):
+    codigo = generador(n)
+    compilador = Compilador()
+    anterior = sys.getrecursionlimit()
+    sys.setrecursionlimit(LIMITE_RECURSION)
+    try:
+        inicio = time.perf_counter()
+        resultado = compilador.compilar(codigo)
+        tiempo = time.perf_counter() - inicio
+        programa = resultado['programa']
+        salida = programa.ejecutar() if programa is not None else None
+        # La forma compacta (caché en disco) tampoco recorre el árbol con recursión
+        ida_y_vuelta = all(compactar(expandir(compactar(s))) == compactar(s) for s in resultado['resultado'])
+    finally:
+        sys.setrecursionlimit(anterior)
+    return resultado, salida, ida_y_vuelta, tiempo
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    fallas = 0
+
+    print(f"{'caso':<10} {'términos':>9} {'tiempo (s)':>11} {'µs/término':>11} {'2n / n':>7}")
+    for nombre, (generador, mensaje, salida_esperada) in CASOS.items():
+        tiempos = []
+        for terminos in (n, 2 * n):
+            resultado, salida, ida_y_vuelta, tiempo = correr(generador, terminos)
+            tiempos.append(tiempo)
+            ultimo = resultado['mensajes'][-1]['mensaje']
+            if not resultado['exito'] or ultimo != mensaje(terminos):
+                print(f"❌ {nombre} ({terminos}): {ultimo[:120]}")
+                fallas += 1
+            elif salida != salida_esperada(terminos):
+                print(f"❌ {nombre} ({terminos}): el programa compilado mostró otra cosa")
+                fallas += 1
+            elif not ida_y_vuelta:
+                print(f"❌ {nombre} ({terminos}): la forma compacta no vuelve al mismo árbol")
+                fallas += 1
+        print(f"{nombre:<10} {n:>9} {tiempos[0]:>11.2f} {tiempos[0] / n * 1e6:>11.2f} "
+              f"{tiempos[1] / tiempos[0]:>7.2f}")
+
+    if fallas:
+        sys.exit(1)
+    print(f"✅ Todos los casos con límite de recursión {LIMITE_RECURSION}")
@@ -0,0 +1,192 @@
+"""Generador de programas Costeñol sintéticos para los benchmarks.
+
+Cada forma recibe la cantidad de sentencias (aproximada) y una semilla, y siempre
+genera el mismo programa para los mismos parámetros:
+
+    declaraciones   muchas declaraciones de los tres tipos, con su asignación
+    expresiones     asignaciones con expresiones largas y anidadas entre paréntesis
+    cadena          cadena de variables donde cada una depende de la anterior
+    mensajes        muchos Mensaje.Texto con cadenas, variables y operaciones
+    errores         programa denso en errores (sobre todo punto y coma faltantes)
+    calculos        programa sin errores: entradas con Captura, cálculos encadenados y mensajes
+    constantes      programa sin errores de valores fijos: constantes derivadas y reasignaciones
+
+    python benchmarks/generador.py expresiones 20 > ejemplo.cos
+"""
+import sys
+import random
+
+TIPOS = ('Entero', 'Real', 'Texto')
+
+
+def _literal(tipo, azar):
+    if tipo == 'Entero':
+        return str(azar.randint(0, 999))
+    if tipo == 'Real':
+        return f"{azar.randint(0, 99)},{azar.randint(0, 99):02d}"
+    return f"\"texto {azar.randint(0, 999)}\""
+
+
+def declaraciones(n, semilla=0):
+    """n sentencias: declaraciones y asignaciones de literales, mitad y mitad"""
+    azar = random.Random(semilla)
+    lineas = []
+    for i in range(n // 2):
+        tipo = azar.choice(TIPOS)
+        lineas.append(f"d{i} {tipo};")
+        lineas.append(f"d{i} = {_literal(tipo, azar)};")
+    return '\n'.join(lineas) + '\n'
+
+
+def _expresion(variables, terminos, profundidad, azar):
+    """Expresión numérica de 'terminos' hojas con paréntesis hasta 'profundidad' niveles"""
+    if terminos == 1 or profundidad == 0:
+        partes = [azar.choice(variables) if azar.random() < 0.5 else str(azar.randint(1, 9))
+                  for _ in range(terminos)]
+        return ' + '.join(partes) if terminos > 1 else partes[0]
+    izquierda = azar.randint(1, terminos - 1)
+    op = azar.choice('+-*')
+    return (f"({_expresion(variables, izquierda, profundidad - 1, azar)}) {op} "
+            f"({_expresion(variables, terminos - izquierda, profundidad - 1, azar)})")
+
+
+def expresiones(n, semilla=0, terminos=16, profundidad=6):
+    """Unas pocas variables y n asignaciones con expresiones largas y anidadas"""
+    azar = random.Random(semilla)
+    variables = [f"e{i}" for i in range(8)]
+    lineas = [f"{v} Real;\n{v} = {i + 1};" for i, v in enumerate(variables)]
+    for i in range(n):
+        destino = variables[i % len(variables)]
+        lineas.append(f"{destino} = {_expresion(variables, terminos, profundidad, azar)};")
+    return '\n'.join(lineas) + '\n'
+
+
+def cadena(n, semilla=0, cada=25):
+    """Cadena de variables donde cada una depende de la anterior, mostrada cada 'cada' eslabones
+
+    Mostrarla seguido mantiene acotada la recursión de la evaluación (la caché guarda lo ya
+    evaluado), como pasa en un programa real.
+    """
+    lineas = ["c0 Real;", "c0 = 1;"]
+    i = 1
+    while len(lineas) < n:
+        lineas.append(f"c{i} Real;")
+        lineas.append(f"c{i} = c{i - 1} + {i % 7 + 1};")
+        if i % cada == 0:
+            lineas.append(f"Mensaje.Texto(c{i});")
+        i += 1
+    return '\n'.join(lineas) + '\n'
+
+
+def mensajes(n, semilla=0):
+    """Pocas variables y n Mensaje.Texto con cadenas, variables y operaciones"""
+    azar = random.Random(semilla)
+    lineas = ["m Entero;", "m = 7;", "r Real;", "r = 2,5;", "t Texto;", "t = \"hola\";"]
+    for i in range(n):
+        forma = azar.randrange(4)
+        if forma == 0:
+            lineas.append(f"Mensaje.Texto(\"mensaje número {i}\");")
+        elif forma == 1:
+            lineas.append(f"Mensaje.Texto({azar.choice('mrt')});")
+        elif forma == 2:
+            lineas.append(f"Mensaje.Texto(m * {azar.randint(1, 9)} + r);")
+        else:
+            lineas.append(f"Mensaje.Texto(t + \" y más {i}\");")
+    return '\n'.join(lineas) + '\n'
+
+
+def errores(n, semilla=0):
+    """n sentencias donde la mayoría tiene algún error: sin ';', redeclaradas, tipos malos"""
+    azar = random.Random(semilla)
+    lineas = []
+    for i in range(n):
+        forma = azar.randrange(5)
+        if forma == 0:
+            lineas.append(f"f{i} Entero")                 # Falta el punto y coma
+        elif forma == 1:
+            lineas.append(f"f{i} = {i} + 1")              # Falta el punto y coma
+        elif forma == 2:
+            lineas.append(f"f{i} Real;\nf{i} Real;")      # Redeclarada
+        elif forma == 3:
+            lineas.append(f"g{i} Entero;\ng{i} = \"texto\";")  # Tipo incompatible
+        else:
+            lineas.append(f"Mensaje.Texto(fantasma{i});")  # Variable que no existe
+    return '\n'.join(lineas) + '\n'
+
+
+def _promedio(variables, terminos, azar):
+    """Promedio con signos de 'terminos' términos: los valores no crecen sin control"""
+    partes = []
+    for _ in range(terminos):
+        forma = azar.randrange(4)
+        if forma == 0:
+            termino = str(azar.randint(1, 9))
+        elif forma == 1:
+            termino = f"({azar.choice(variables)} * {azar.randint(1, 2)})"
+        else:
+            termino = azar.choice(variables)
+        partes.append(termino)
+    suma = partes[0] + ''.join(f" {azar.choice('+-')} {parte}" for parte in partes[1:])
+    return f"({suma}) / {terminos}"
+
+
+def calculos(n, semilla=0, terminos=8, entradas=4, cada=10):
+    """Programa sin errores para ejecutar: 'entradas' Captura.Real y n variables nuevas
+
+    Cada variable es un promedio con signos de las ocho anteriores (nunca de sí misma,
+    para que el análisis pueda mostrarla) y cada 'cada' se muestra con Mensaje.Texto.
+    """
+    azar = random.Random(semilla)
+    variables = [f"x{i}" for i in range(entradas)]
+    lineas = [f"{v} Real;\n{v} = Captura.Real({i + 1});" for i, v in enumerate(variables)]
+    for i in range(n):
+        lineas.append(f"v{i} Real;\nv{i} = {_promedio(variables[-8:], terminos, azar)};")
+        variables.append(f"v{i}")
+        if i % cada == cada - 1:
+            lineas.append(f"Mensaje.Texto(v{i});")
+    return '\n'.join(lineas) + '\n'
+
+
+def constantes(n, semilla=0, cada=10, reasignar=0.3):
+    """Programa sin errores sin Captura, como una plantilla de configuración
+
+    Cada variable nueva combina productos de literales con variables anteriores; con
+    probabilidad 'reasignar' una variable anterior recibe antes otro valor fijo que
+    nadie alcanza a leer, y cada 'cada' variables se muestra una con Mensaje.Texto.
+    """
+    azar = random.Random(semilla)
+    lineas = ["k0 Real;", "k0 = 12 * 100;"]
+    variables = ['k0']
+    for i in range(1, n):
+        if azar.random() < reasignar:
+            lineas.append(f"{azar.choice(variables[-8:])} = {azar.randint(1, 9)} * {azar.randint(1, 99)};")
+        lineas.append(f"k{i} Real;")
+        partes = [f"{azar.randint(1, 9)} * {azar.randint(1, 9)}" for _ in range(2)]
+        partes.append(azar.choice(variables[-8:]))
+        azar.shuffle(partes)
+        lineas.append(f"k{i} = ({' + '.join(partes)}) / {azar.randint(2, 9)};")
+        variables.append(f"k{i}")
+        if i % cada == 0:
+            lineas.append(f"Mensaje.Texto(k{i});")
+    return '\n'.join(lineas) + '\n'
+
+
+FORMAS = {
+    'declaraciones': declaraciones,
+    'expresiones': expresiones,
+    'cadena': cadena,
+    'mensajes': mensajes,
+    'errores': errores,
+    'calculos': calculos,
+    'constantes': constantes,
+}
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] not in FORMAS:
+        print(f"Uso: python benchmarks/generador.py {{{'|'.join(FORMAS)}}} [sentencias] [semilla]",
+              file=sys.stderr)
+        sys.exit(2)
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    semilla = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    sys.stdout.write(FORMAS[sys.argv[1]](n, semilla))
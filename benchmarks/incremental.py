@@ -0,0 +1,47 @@
+"""Benchmark del análisis incremental: editar cerca del final de un archivo grande.
+
+Compara analizar() completo contra analizar_incremental() después de cambiar una
+línea cerca del final, y verifica que ambos den exactamente los mismos mensajes.
+
+    python benchmarks/incremental.py [lineas]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import Compilador
+
+
+def generar_programa(lineas):
+    partes = []
+    for i in range(lineas // 3):
+        partes += [f"v{i} Real;", f"v{i} = {i} * 2 + 1,5;", f"Mensaje.Texto(v{i});"]
+    return '\n'.join(partes) + '\n'
+
+
+def medir(funcion, codigo):
+    inicio = time.perf_counter()
+    resultado = funcion(codigo)
+    return time.perf_counter() - inicio, resultado
+
+
+if __name__ == '__main__':
+    lineas = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    codigo = generar_programa(lineas)
+    editado = codigo.replace(f"v{lineas // 3 - 5} = ", f"v{lineas // 3 - 5} = 7 + ", 1)
+
+    completo = Compilador()
+    incremental = Compilador()
+    t_inicial, _ = medir(incremental.analizar_incremental, codigo)
+    t_completo, esperado = medir(completo.analizar, editado)
+    t_incremental, obtenido = medir(incremental.analizar_incremental, editado)
+
+    print(f"Programa de {codigo.count(chr(10))} líneas")
+    print(f"Primer análisis (guardando puntos de control): {t_inicial * 1000:9.2f} ms")
+    print(f"Re-análisis completo tras editar:              {t_completo * 1000:9.2f} ms")
+    print(f"Re-análisis incremental tras editar:           {t_incremental * 1000:9.2f} ms")
+    iguales = esperado['mensajes'] == obtenido['mensajes']
+    print("✅ Mismos mensajes que el análisis completo" if iguales else "❌ Los mensajes difieren")
+    sys.exit(0 if iguales else 1)
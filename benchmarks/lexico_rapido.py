@@ -0,0 +1,106 @@
+"""Comparación del analizador léxico rápido contra el de PLY.
+
+Primero revisa la paridad sobre un corpus diferencial (casos borde y programas al azar
+con cadenas, comentarios, números pegados a letras y caracteres ilegales): mismo flujo
+de tokens (tipo, valor, línea, posición) y mismos errores léxicos. Sale con código 1 si
+algo difiere. Después mide tokens por segundo de cada uno.
+
+    python benchmarks/lexico_rapido.py [programas_al_azar] [lineas_benchmark]
+"""
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer import crear_analizador_lexico
+from lexer_rapido import AnalizadorLexicoRapido
+
+CASOS_BORDE = [
+    '', '\n\n\n', 'a\tb  \t\n\n c', '/', 'x/*', '*/*/', 'x; /* a *',
+    'a /* x\n y */ b;\n', '/* sin cerrar\n a;\n b;', 'a */ /* b */ c /*\n*/\n/*',
+    '"abc" // c /* \n d */ e', '"', '"x\n"', '"a\\"b" "\\\\"', '"\\\n"',
+    '12abc 3,4 5, ,6 1,2,3 007 0,0', '٣ ٣a 1,٣ ñ á', '\r\n@ # $ % ^ & ! ? ¿ {}',
+    'Texto Entero Real Captura Mensaje TextoX _x x_1 __',
+    'Mensaje.Texto("hola");\nx = Captura.Entero(5) * (2,5 - y) / z;',
+]
+
+PIEZAS = [
+    'x', 'valor_1', '_tmp', 'Texto', 'Entero', 'Real', 'Captura', 'Mensaje', '12', '0',
+    '3,14', '7,', ',5', '9abc', '"cadena"', '""', '"con \\" escape"', '"sin cerrar',
+    '// comentario', '/* bloque */', '/* de\nvarias\nlíneas */', '/*', '*/', '=', '+',
+    '-', '*', '/', '(', ')', ';', ',', '.', ' ', '\t', '\n', '\n\n', '@', 'ñ', '\r',
+]
+
+
+def tokens_de(lexer, codigo):
+    """Flujo de tokens y errores léxicos de un analizador para el código"""
+    lexer.lineno = 1
+    lexer.errores_lexicos = []
+    lexer.input(codigo)
+    flujo = []
+    while True:
+        tok = lexer.token()
+        if tok is None:
+            break
+        flujo.append((tok.type, tok.value, tok.lineno, tok.lexpos))
+    return flujo, lexer.errores_lexicos, lexer.lineno
+
+
+def programa_al_azar(azar, piezas=200):
+    return ''.join(azar.choice(PIEZAS) + azar.choice(('', ' ', ' ', '\n')) for _ in range(piezas))
+
+
+def programa_benchmark(lineas):
+    """Programa válido y realista para medir velocidad"""
+    partes = []
+    for i in range(lineas // 4):
+        partes.append(f"v{i} Real;\n")
+        partes.append(f"v{i} = ({i} + 2,5) * v{max(i - 1, 0)} - 7;\n")
+        partes.append(f"Mensaje.Texto(\"valor {i}\"); // comentario\n")
+        partes.append(f"Mensaje.Texto(v{i} / 3);\n")
+    return ''.join(partes)
+
+
+def medir(lexer, codigo, repeticiones=3):
+    """Mejor tiempo de tokenizar todo el código y cantidad de tokens"""
+    mejor, cantidad = float('inf'), 0
+    for _ in range(repeticiones):
+        lexer.lineno = 1
+        lexer.input(codigo)
+        inicio = time.perf_counter()
+        cantidad = 0
+        token = lexer.token
+        while token() is not None:
+            cantidad += 1
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return cantidad, mejor
+
+
+if __name__ == '__main__':
+    n_azar = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    lineas = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    ply_lexer = crear_analizador_lexico()
+    rapido = AnalizadorLexicoRapido()
+
+    azar = random.Random(2024)
+    corpus = CASOS_BORDE + [programa_al_azar(azar) for _ in range(n_azar)]
+    diferencias = 0
+    for codigo in corpus:
+        if tokens_de(ply_lexer, codigo) != tokens_de(rapido, codigo):
+            diferencias += 1
+            if diferencias <= 5:
+                print(f"❌ Difiere: {codigo[:70]!r}")
+    print(f"Paridad: {len(corpus) - diferencias}/{len(corpus)} programas iguales")
+
+    codigo = programa_benchmark(lineas)
+    n_ply, t_ply = medir(ply_lexer, codigo)
+    n_rapido, t_rapido = medir(rapido, codigo)
+    print(f"{'lexer':<8} {'tokens':>9} {'tiempo (s)':>11} {'tokens/s':>12}")
+    print(f"{'ply':<8} {n_ply:>9} {t_ply:>11.3f} {n_ply / t_ply:>12,.0f}")
+    print(f"{'rapido':<8} {n_rapido:>9} {t_rapido:>11.3f} {n_rapido / t_rapido:>12,.0f}")
+    print(f"Aceleración: {t_ply / t_rapido:.2f}x")
+
+    if diferencias:
+        sys.exit(1)
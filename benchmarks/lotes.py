@@ -0,0 +1,84 @@
+"""Ejecución por lotes con NumPy contra ejecutar el programa fila por fila.
+
+Compila un programa de generador.calculos con unas sentencias más al final (una
+división por una resta de entradas que a veces da cero, un Captura.Entero y un
+Captura.Texto) y lo corre sobre muchas filas de entradas:
+
+    filas   Programa.ejecutar una vez por fila
+    lote    Programa.ejecutar_lote con una columna por Captura
+
+Revisa que cada fila del lote sea igual a la ejecución de esa fila; sale con código 1
+si alguna difiere.
+
+    python benchmarks/lotes.py [sentencias] [filas]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+except ImportError:
+    sys.exit("Este benchmark necesita NumPy (pip install numpy)")
+
+from parser import Compilador
+from generador import calculos
+
+EXTRA = """
+q Real;
+q = x1 / (x0 - x2);
+Mensaje.Texto(q);
+n Entero;
+n = Captura.Entero(3);
+Mensaje.Texto(n * 2 - 1);
+nombre Texto;
+nombre = Captura.Texto("nadie") + " terminó";
+Mensaje.Texto(nombre);
+"""
+
+
+def columnas_al_azar(filas, semilla=11):
+    """x0..x3 reales (x0 y x2 iguales en una de cada diez filas), un entero y un texto"""
+    azar = np.random.default_rng(semilla)
+    reales = [np.round(azar.uniform(-50, 50, filas), 2) for _ in range(4)]
+    reales[2] = np.where(np.arange(filas) % 10 == 0, reales[0], reales[2])
+    enteros = azar.integers(-1000, 1000, filas)
+    textos = np.array([f"fila {i}" for i in range(filas)], dtype=object)
+    return reales + [enteros, textos]
+
+
+if __name__ == '__main__':
+    sentencias = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    filas = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+
+    programa = Compilador().compilar(calculos(sentencias) + EXTRA)['programa']
+    if programa is None:
+        print("❌ El programa generado tiene errores")
+        sys.exit(1)
+    columnas = columnas_al_azar(filas)
+    programa.ejecutar()         # Traduce antes de medir
+
+    inicio = time.perf_counter()
+    filas_python = list(zip(*(columna.tolist() for columna in columnas)))
+    por_filas = [programa.ejecutar(fila) for fila in filas_python]
+    t_filas = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    lote = programa.ejecutar_lote(columnas)
+    t_lote = time.perf_counter() - inicio
+
+    diferentes = sum(list(lote[i]) != por_filas[i] for i in range(filas))
+    no_evaluables = int(np.sum(lote == "[operación no evaluable]"))
+    print(f"{sentencias} sentencias, {filas} filas, {lote.shape[1]} mensajes por fila "
+          f"({no_evaluables} no evaluables)")
+    print(f"{'forma':<6} {'tiempo (s)':>11} {'filas/s':>11}")
+    print(f"{'filas':<6} {t_filas:>11.3f} {filas / t_filas:>11,.0f}")
+    print(f"{'lote':<6} {t_lote:>11.3f} {filas / t_lote:>11,.0f}")
+    print(f"Aceleración: {t_filas / t_lote:.1f}x")
+
+    if diferentes:
+        print(f"❌ {diferentes} filas distintas")
+        sys.exit(1)
+    print("✅ Todas las filas iguales")
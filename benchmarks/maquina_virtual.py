@@ -0,0 +1,133 @@
+"""Ejecutar el bytecode compilado en la máquina de pila contra recorrer el árbol.
+
+Compila una vez un programa de generador.calculos (entradas con Captura, cálculos
+encadenados y mensajes) y lo ejecuta muchas veces con entradas distintas:
+
+    arbol       recorre las expresiones del árbol recursivamente, despachando por
+                type(nodo) como evaluar_operacion
+    maquina     Programa.interpretar: el bytecode en la máquina de pila
+
+La cifra principal es maquina contra arbol. Aparte se mide Programa.ejecutar, que no
+interpreta el bytecode sino que lo traduce una vez a una función de Python. Se toma el
+mejor tiempo de varias rondas intercaladas, para que una racha de carga no caiga sobre
+una sola forma.
+
+Revisa que el árbol, la máquina y ejecutar den la misma salida en cada corrida (y que sin
+entradas la máquina muestre lo mismo que los mensajes del análisis); sale con código 1 si
+algo difiere.
+
+    python benchmarks/maquina_virtual.py [sentencias] [corridas]
+"""
+import os
+import re
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import Compilador
+from maquina import NO_EVALUABLE, formatear_valor, convertir_entrada
+from nodos import Numero, Cadena, Variable, Capturar, OperacionBinaria, Declarar, Asignar, Nodo
+from generador import calculos
+
+MENSAJE_VALOR = re.compile(r'el valor es "(.*)"$')
+RONDAS = 5
+
+
+def ejecutar_arbol(sentencias, entradas):
+    """Ejecución de referencia: recorre el árbol de cada expresión cada vez"""
+    valores = {}
+    siguiente = iter(entradas).__next__
+    salida = []
+
+    def evaluar(nodo):
+        tipo_nodo = type(nodo)
+        if tipo_nodo is OperacionBinaria:
+            izq, der = evaluar(nodo.izq), evaluar(nodo.der)
+            op = nodo.op
+            if op == '+':
+                return izq + der
+            if op == '-':
+                return izq - der
+            if op == '*':
+                return izq * der
+            return izq / der if der else NO_EVALUABLE
+        if tipo_nodo is Variable:
+            return valores[nodo.nombre]
+        if tipo_nodo is Numero or tipo_nodo is Cadena:
+            return nodo.valor
+        if tipo_nodo is Capturar:
+            evaluar(nodo.parametro)
+            return convertir_entrada(nodo.tipo, siguiente())
+        raise ValueError(nodo)
+
+    for sentencia in sentencias:
+        tipo_sentencia = type(sentencia)
+        if tipo_sentencia is Declarar:
+            continue
+        if tipo_sentencia is Asignar:
+            valores[sentencia.nombre] = evaluar(sentencia.expresion)
+        else:
+            valor = sentencia.valor
+            salida.append(formatear_valor(evaluar(valor) if isinstance(valor, Nodo) else valor))
+    return salida
+
+
+def medir(formas, corridas):
+    """Mejor tiempo de cada forma en RONDAS rondas intercaladas, y sus salidas"""
+    tiempos = dict.fromkeys(formas, float('inf'))
+    salidas = {}
+    for _ in range(RONDAS):
+        for forma, funcion in formas.items():
+            inicio = time.perf_counter()
+            salidas[forma] = [funcion(entradas) for entradas in corridas]
+            tiempos[forma] = min(tiempos[forma], time.perf_counter() - inicio)
+    return tiempos, salidas
+
+
+if __name__ == '__main__':
+    sentencias = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    n_corridas = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    inicio = time.perf_counter()
+    compilado = Compilador().compilar(calculos(sentencias))
+    t_compilar = time.perf_counter() - inicio
+    programa = compilado['programa']
+    if programa is None:
+        print("❌ El programa generado tiene errores")
+        sys.exit(1)
+    arbol = compilado['resultado']
+
+    # Sin entradas, Captura devuelve su parámetro: tiene que coincidir con el análisis
+    del_analisis = [MENSAJE_VALOR.search(m['mensaje']).group(1) for m in compilado['mensajes']
+                    if m['mensaje'].startswith('Nojoda monstruo')]
+    inicio = time.perf_counter()
+    diferencias = int(programa.ejecutar() != del_analisis)     # La primera vez traduce
+    t_traducir = time.perf_counter() - inicio
+
+    azar = random.Random(7)
+    corridas = [[f"{azar.randint(-99, 99)},{azar.randint(0, 99)}" for _ in range(4)]
+                for _ in range(n_corridas)]
+
+    tiempos, salidas = medir({'arbol': lambda entradas: ejecutar_arbol(arbol, entradas),
+                              'maquina': programa.interpretar,
+                              'traducido': programa.ejecutar}, corridas)
+    diferencias += sum(a != b or a != c for a, b, c in
+                       zip(salidas['arbol'], salidas['maquina'], salidas['traducido']))
+
+    print(f"{sentencias} sentencias, {len(programa)} instrucciones; análisis + compilación: "
+          f"{t_compilar:.3f} s; primera ejecución (traduce): {t_traducir:.3f} s")
+    print(f"{'forma':<10} {'corridas':>8} {'tiempo (s)':>11} {'corridas/s':>11} {'vs árbol':>9}")
+    for forma in ('arbol', 'maquina'):
+        tiempo = tiempos[forma]
+        print(f"{forma:<10} {n_corridas:>8} {tiempo:>11.3f} {n_corridas / tiempo:>11.1f} "
+              f"{tiempos['arbol'] / tiempo:>8.2f}x")
+    print(f"Máquina de pila: {tiempos['arbol'] / tiempos['maquina']:.2f}x más rápida que el árbol")
+    print(f"Aparte, Programa.ejecutar (bytecode traducido a Python): {tiempos['traducido']:.3f} s, "
+          f"{tiempos['arbol'] / tiempos['traducido']:.2f}x el árbol")
+
+    if diferencias:
+        print(f"❌ {diferencias} salidas distintas")
+        sys.exit(1)
+    print("✅ Misma salida en todas las corridas")
@@ -0,0 +1,167 @@
+"""Benchmark del árbol sintáctico: nodos con __slots__ vs. las tuplas etiquetadas anteriores.
+
+Reporta bytes por nodo (tracemalloc) y el tiempo por nodo de dos recorridos con la
+forma de los del parser:
+
+- tipos: el despacho de seis casos de calcular_tipo_expresion (error, número, cadena,
+  variable, captura, operación), recursivo como el chequeo con tuplas, que leía
+  expresion[0] en cada comparación.
+- valores: la evaluación en postorden con pilas propias de evaluar_operacion, donde
+  un texto en la pila es el operador de una operación ya visitada.
+
+Los nodos despachan por type(nodo) con 'is', como el parser. Se toma el mejor tiempo
+de varias rondas intercaladas, para que una racha de carga no caiga sobre un solo caso.
+
+    python benchmarks/memoria_ast.py [nodos]
+"""
+import os
+import sys
+import time
+import random
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nodos import Numero, Cadena, Variable, ErrorVariable, Capturar, OperacionBinaria
+
+NOMBRES = [sys.intern(f"v{i}") for i in range(100)]
+RONDAS = 40
+
+
+def construir(hojas, como_tupla, azar):
+    """Árbol balanceado de operaciones con 'hojas' números y variables"""
+    if hojas == 1:
+        if azar.random() < 0.5:
+            valor = azar.randint(0, 9)
+            return ('numero', valor) if como_tupla else Numero(valor)
+        nombre = azar.choice(NOMBRES)
+        return ('variable', nombre) if como_tupla else Variable(nombre)
+    mitad = hojas // 2
+    # Sin '*': los productos crecen a enteros de cientos de bits y la aritmética tapa el recorrido
+    op = azar.choice('+-')
+    izq = construir(mitad, como_tupla, azar)
+    der = construir(hojas - mitad, como_tupla, azar)
+    return ('operacion_binaria', op, izq, der) if como_tupla else OperacionBinaria(op, izq, der)
+
+
+# Tipos como enteros: 0 Entero, 1 Real, 2 Texto, 3 error
+def tipo_tupla(expresion):
+    if expresion[0] == 'error':
+        return 3
+    if expresion[0] == 'numero':
+        return 0
+    elif expresion[0] == 'cadena':
+        return 2
+    elif expresion[0] == 'variable':
+        return 0
+    elif expresion[0] == 'capturar':
+        return tipo_tupla(expresion[2])
+    elif expresion[0] == 'operacion_binaria':
+        izq, der = tipo_tupla(expresion[2]), tipo_tupla(expresion[3])
+        return izq if izq == der else 1
+    return 3
+
+
+def tipo_nodo(expresion):
+    tipo = type(expresion)
+    if tipo is ErrorVariable:
+        return 3
+    if tipo is Numero:
+        return 0
+    elif tipo is Cadena:
+        return 2
+    elif tipo is Variable:
+        return 0
+    elif tipo is Capturar:
+        return tipo_nodo(expresion.parametro)
+    elif tipo is OperacionBinaria:
+        izq, der = tipo_nodo(expresion.izq), tipo_nodo(expresion.der)
+        return izq if izq == der else 1
+    return 3
+
+
+def operar(op, izq, der):
+    return izq + der if op == '+' else izq - der
+
+
+def valor_tupla(expresion):
+    pendientes, valores = [expresion], []
+    apilar, apilar_valor = pendientes.append, valores.append
+    while pendientes:
+        nodo = pendientes.pop()
+        if type(nodo) is str:
+            der = valores.pop()
+            valores[-1] = operar(nodo, valores[-1], der)
+            continue
+        etiqueta = nodo[0]
+        if etiqueta == 'operacion_binaria':
+            apilar(nodo[1])
+            apilar(nodo[3])
+            apilar(nodo[2])
+        elif etiqueta == 'numero':
+            apilar_valor(nodo[1])
+        elif etiqueta == 'variable':
+            apilar_valor(1)
+        else:
+            apilar_valor(None)
+    return valores[0]
+
+
+def valor_nodo(expresion):
+    pendientes, valores = [expresion], []
+    apilar, apilar_valor = pendientes.append, valores.append
+    while pendientes:
+        nodo = pendientes.pop()
+        tipo = type(nodo)
+        if tipo is str:
+            der = valores.pop()
+            valores[-1] = operar(nodo, valores[-1], der)
+            continue
+        if tipo is OperacionBinaria:
+            apilar(nodo.op)
+            apilar(nodo.der)
+            apilar(nodo.izq)
+        elif tipo is Numero:
+            apilar_valor(nodo.valor)
+        elif tipo is Variable:
+            apilar_valor(1)
+        else:
+            apilar_valor(None)
+    return valores[0]
+
+
+def construir_medido(como_tupla, hojas):
+    tracemalloc.start()
+    arbol = construir(hojas, como_tupla, random.Random(7))
+    memoria = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return arbol, memoria
+
+
+if __name__ == '__main__':
+    hojas = int(sys.argv[1]) // 2 if len(sys.argv) > 1 else 20000
+    total_nodos = 2 * hojas - 1
+    # El chequeo de tipos con tuplas es recursivo: un árbol balanceado no pasa de ~20 niveles
+    tuplas, mem_tupla = construir_medido(True, hojas)
+    nodos, mem_nodo = construir_medido(False, hojas)
+    if (tipo_tupla(tuplas), valor_tupla(tuplas)) != (tipo_nodo(nodos), valor_nodo(nodos)):
+        sys.exit("❌ Tuplas y nodos no dan el mismo resultado")
+
+    casos = (('tuplas', 'tipos', tipo_tupla, tuplas), ('nodos', 'tipos', tipo_nodo, nodos),
+             ('tuplas', 'valores', valor_tupla, tuplas), ('nodos', 'valores', valor_nodo, nodos))
+    tiempos = {(forma, recorrido): float('inf') for forma, recorrido, _, _ in casos}
+    for _ in range(RONDAS):
+        for forma, recorrido, recorrer, arbol in casos:
+            inicio = time.perf_counter()
+            recorrer(arbol)
+            tiempos[forma, recorrido] = min(tiempos[forma, recorrido], time.perf_counter() - inicio)
+
+    print(f"Nodos por árbol: {total_nodos}")
+    print(f"{'':8} {'bytes/nodo':>11} {'tipos (ns/nodo)':>16} {'valores (ns/nodo)':>18}")
+    for forma, memoria in (('tuplas', mem_tupla), ('nodos', mem_nodo)):
+        print(f"{forma:8} {memoria / total_nodos:>11.1f} "
+              f"{tiempos[forma, 'tipos'] / total_nodos * 1e9:>16.1f} "
+              f"{tiempos[forma, 'valores'] / total_nodos * 1e9:>18.1f}")
+    print(f"{'nodos vs. tuplas':<21} "
+          f"{tiempos['tuplas', 'tipos'] / tiempos['nodos', 'tipos']:>15.2f}x "
+          f"{tiempos['tuplas', 'valores'] / tiempos['nodos', 'valores']:>17.2f}x")
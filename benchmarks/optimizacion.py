@@ -0,0 +1,87 @@
+"""Efecto del optimizador (optimizador.py) sobre programas de generador.py.
+
+Para cada forma mide, sin y con optimización:
+
+    análisis    Compilador(optimizar=True): tiempo semántico (validación y evaluación de
+                valores) y memoria que queda ocupada por el resultado y tabla_simbolos
+    ejecución   compilar(optimizar=True): instrucciones y tiempo de Programa.interpretar
+
+Revisa que los mensajes del análisis y la salida de la ejecución sean los mismos con y
+sin optimización; sale con código 1 si algo difiere.
+
+    python benchmarks/optimizacion.py [sentencias] [corridas]
+"""
+import os
+import sys
+import time
+import random
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import Compilador
+from generador import constantes, calculos, mensajes
+
+FORMAS = {'constantes': constantes, 'calculos': calculos, 'mensajes': mensajes}
+
+
+def analizar(codigo, optimizar, repeticiones=3):
+    """Mejor tiempo semántico, memoria retenida (bytes) y la respuesta"""
+    compilador = Compilador(medir=True, optimizar=optimizar)
+    semantico = float('inf')
+    for _ in range(repeticiones):
+        respuesta = compilador.analizar(codigo)
+        semantico = min(semantico, respuesta['estadisticas']['instrumentacion']['semantico']['pared'])
+
+    # La memoria se mide aparte: lo que sigue ocupado después de analizar
+    compilador = Compilador(optimizar=optimizar)
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    retenida = compilador.analizar(codigo)
+    memoria = tracemalloc.get_traced_memory()[0] - antes
+    tracemalloc.stop()
+    del retenida
+    return semantico, memoria, respuesta
+
+
+def ejecutar(programa, corridas):
+    inicio = time.perf_counter()
+    salidas = [programa.interpretar(entradas) for entradas in corridas]
+    return time.perf_counter() - inicio, salidas
+
+
+if __name__ == '__main__':
+    sentencias = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+    n_corridas = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    azar = random.Random(7)
+    corridas = [[f"{azar.randint(-99, 99)},{azar.randint(0, 99)}" for _ in range(4)]
+                for _ in range(n_corridas)]
+    diferencias = 0
+
+    print(f"{'forma':<11} {'':<10} {'semántico (s)':>13} {'memoria (MB)':>12} "
+          f"{'instrucciones':>13} {'ejecución (s)':>13}")
+    for forma, generar in FORMAS.items():
+        codigo = generar(sentencias)
+        filas = {}
+        for optimizar in (False, True):
+            semantico, memoria, respuesta = analizar(codigo, optimizar)
+            compilado = Compilador().compilar(codigo, optimizar=optimizar)
+            programa = compilado['programa']
+            tiempo, salidas = ejecutar(programa, corridas)
+            filas[optimizar] = (semantico, memoria, len(programa), tiempo, respuesta['mensajes'],
+                                salidas, compilado.get('optimizacion'))
+        for optimizar, etiqueta in ((False, 'normal'), (True, 'optimizado')):
+            semantico, memoria, instrucciones, tiempo = filas[optimizar][:4]
+            print(f"{forma:<11} {etiqueta:<10} {semantico:>13.4f} {memoria / 1e6:>12.2f} "
+                  f"{instrucciones:>13} {tiempo:>13.3f}")
+        informe = filas[True][6]
+        sobrescritas = sum(e['motivo'] == 'sobrescrita' for e in informe['eliminadas'])
+        print(f"{'':<11} {informe['plegadas']} plegadas, {informe['propagadas']} propagadas, "
+              f"{len(informe['eliminadas'])} asignaciones eliminadas ({sobrescritas} sobrescritas)")
+        diferencias += filas[False][4] != filas[True][4]
+        diferencias += filas[False][5] != filas[True][5]
+
+    if diferencias:
+        print(f"❌ {diferencias} resultados distintos")
+        sys.exit(1)
+    print("✅ Mismos mensajes y misma salida con y sin optimización")
@@ -0,0 +1,67 @@
+"""Benchmark del análisis paralelo de un solo archivo grande (analisis_paralelo.py).
+
+Para cada forma de generador.py analiza el mismo programa con Compilador.analizar() y
+con AnalizadorParalelo para cada cantidad de procesos, y muestra el tiempo de pared,
+la aceleración, los trozos y cuántos hubo que fusionar. El léxico y el parser se
+reparten; las acciones semánticas siguen en un solo proceso, así que la aceleración
+tiene como techo lo que pesa el análisis semántico (ver benchmarks/suite.py, por fases).
+
+Revisa que mensajes, estadísticas y resultado sean los mismos que en serie; sale con
+código 1 si algo difiere.
+
+    python benchmarks/paralelo.py [sentencias] [procesos ...]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import Compilador
+from analisis_paralelo import AnalizadorParalelo
+from generador import declaraciones, mensajes, errores, calculos
+
+FORMAS = {'declaraciones': declaraciones, 'mensajes': mensajes, 'errores': errores, 'calculos': calculos}
+
+
+def como_tuplas(resultado):
+    return None if resultado is None else [sentencia.como_tupla() for sentencia in resultado]
+
+
+def medir(analizar, codigo):
+    inicio = time.perf_counter()
+    respuesta = analizar(codigo)
+    return time.perf_counter() - inicio, respuesta
+
+
+if __name__ == '__main__':
+    sentencias = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    nucleos = os.cpu_count() or 1
+    procesos = [int(p) for p in sys.argv[2:]] or sorted({2, max(2, nucleos // 2), max(2, nucleos)})
+    diferencias = 0
+
+    print(f"{nucleos} núcleo(s)")
+    print(f"{'forma':<14} {'MB':>6} {'procesos':>8} {'tiempo (s)':>10} {'aceleración':>11} "
+          f"{'trozos':>6} {'fusiones':>8}")
+    analizadores = {n: AnalizadorParalelo(procesos=n) for n in procesos}
+    try:
+        for forma, generar in FORMAS.items():
+            codigo = generar(sentencias)
+            serie, esperado = medir(Compilador().analizar, codigo)
+            print(f"{forma:<14} {len(codigo) / 1e6:>6.1f} {'serie':>8} {serie:>10.3f} {'':>11} {'':>6} {'':>8}")
+            for n, analizador in analizadores.items():
+                tiempo, respuesta = medir(analizador.analizar, codigo)
+                informe = respuesta['paralelo']
+                print(f"{'':<14} {'':>6} {n:>8} {tiempo:>10.3f} {serie / tiempo:>10.2f}x "
+                      f"{informe['trozos']:>6} {informe['fusiones']:>8}")
+                diferencias += respuesta['mensajes'] != esperado['mensajes']
+                diferencias += respuesta['estadisticas'] != esperado['estadisticas']
+                diferencias += como_tuplas(respuesta['resultado']) != como_tuplas(esperado['resultado'])
+    finally:
+        for analizador in analizadores.values():
+            analizador.cerrar()
+
+    if diferencias:
+        print(f"❌ {diferencias} resultados distintos")
+        sys.exit(1)
+    print("✅ Mismos mensajes, estadísticas y resultado en paralelo y en serie")
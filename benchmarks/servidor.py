@@ -0,0 +1,119 @@
+"""Servidor de compilación: un proceso nuevo por análisis contra pedidos al servidor.
+
+Compara tres formas de analizar los mismos programas chicos:
+
+    en frío     un 'python -c' por programa (importar, armar el Compilador, analizar)
+    servidor    un cliente mandando un pedido a la vez por el socket
+    análisis    solo el análisis dentro del proceso (el piso de la latencia)
+
+Después varios clientes en paralelo mandan pedidos a la vez para medir el rendimiento
+y ver los lotes que arma el servidor, con sus percentiles de latencia. Revisa que cada
+respuesta tenga los mismos mensajes que el análisis en el proceso; sale con código 1
+si alguna difiere.
+
+    python benchmarks/servidor.py [pedidos] [clientes]
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from parser import Compilador
+from servidor_compilacion import ClienteCompilacion
+from generador import FORMAS
+
+EN_FRIO = 10
+
+
+def programas_de_prueba(cantidad):
+    formas = ('declaraciones', 'calculos', 'errores', 'mensajes')
+    return [FORMAS[formas[i % len(formas)]](5 + i % 20, semilla=i) for i in range(cantidad)]
+
+
+def en_frio(codigo):
+    comando = ("import sys; from parser import Compilador; "
+               "Compilador().analizar(sys.stdin.read())")
+    subprocess.run([sys.executable, '-c', comando], input=codigo, text=True, cwd=RAIZ, check=True)
+
+
+def cliente(ruta, programas):
+    latencias, respuestas = [], []
+    with ClienteCompilacion(ruta) as conexion:
+        for codigo in programas:
+            inicio = time.perf_counter()
+            respuestas.append(conexion.analizar(codigo))
+            latencias.append(time.perf_counter() - inicio)
+    return latencias, respuestas
+
+
+def mediana(valores):
+    return sorted(valores)[len(valores) // 2]
+
+
+if __name__ == '__main__':
+    pedidos = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    clientes = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    programas = programas_de_prueba(pedidos)
+
+    compilador = Compilador()
+    esperados, analisis = [], []
+    for codigo in programas:
+        inicio = time.perf_counter()
+        esperados.append(compilador.analizar(codigo)['mensajes'])
+        analisis.append(time.perf_counter() - inicio)
+
+    frio = []
+    for codigo in programas[:EN_FRIO]:
+        inicio = time.perf_counter()
+        en_frio(codigo)
+        frio.append(time.perf_counter() - inicio)
+
+    carpeta = tempfile.mkdtemp(prefix='servidor_costenol_')
+    ruta = os.path.join(carpeta, 'compilador.sock')
+    servidor = subprocess.Popen([sys.executable, os.path.join(RAIZ, 'servidor_compilacion.py'),
+                                 '--socket', ruta, '-j', str(min(clientes, os.cpu_count() or 1))],
+                                stderr=subprocess.DEVNULL)
+    diferentes = 0
+    try:
+        # Un pedido a la vez: latencia de ida y vuelta
+        latencias, respuestas = cliente(ruta, programas)
+        diferentes += sum(r['mensajes'] != e for r, e in zip(respuestas, esperados))
+
+        # Varios clientes a la vez: rendimiento y lotes
+        partes = [programas[i::clientes] for i in range(clientes)]
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(clientes) as hilos:
+            resultados = list(hilos.map(lambda parte: cliente(ruta, parte), partes))
+        t_paralelo = time.perf_counter() - inicio
+        for i, (_, respuestas) in enumerate(resultados):
+            diferentes += sum(r['mensajes'] != e for r, e in zip(respuestas, esperados[i::clientes]))
+
+        with ClienteCompilacion(ruta) as conexion:
+            estadisticas = conexion.estadisticas()
+    finally:
+        servidor.terminate()
+        servidor.wait()
+        shutil.rmtree(carpeta, ignore_errors=True)
+
+    print("Programas de 5 a 24 sentencias; mediana por pedido:")
+    print(f"  en frío     {mediana(frio) * 1e3:>9.2f} ms  ({EN_FRIO} procesos)")
+    print(f"  servidor    {mediana(latencias) * 1e3:>9.2f} ms  ({pedidos} pedidos)")
+    print(f"  análisis    {mediana(analisis) * 1e3:>9.2f} ms")
+    print(f"Servidor vs. en frío: {mediana(frio) / mediana(latencias):.0f}x menos latencia")
+    print(f"{clientes} clientes: {pedidos / t_paralelo:.0f} pedidos/s, "
+          f"{estadisticas['pedidos_por_lote']:.1f} pedidos por lote en promedio")
+    latencia = estadisticas['latencia_ms']
+    print(f"Latencia en el servidor (ms): p50 {latencia['p50']:.2f}, p90 {latencia['p90']:.2f}, "
+          f"p99 {latencia['p99']:.2f}, máx {latencia['max']:.2f} "
+          f"({estadisticas['respondidos']} respondidos, {estadisticas['lotes']} lotes)")
+
+    if diferentes:
+        print(f"❌ {diferentes} respuestas distintas del análisis en el proceso")
+        sys.exit(1)
+    print("✅ El servidor responde lo mismo que el análisis")
@@ -0,0 +1,84 @@
+"""analizar_stream: mensajes a medida que salen y corte temprano con max_errores.
+
+Sobre un programa grande lleno de errores compara analizar() completo contra
+analizar_stream() con varios max_errores (el tiempo debería depender de N y no del
+tamaño de la entrada), mide cuánto tarda en llegar el primer mensaje y el ritmo del
+flujo completo. Revisa que el flujo completo traiga los mismos mensajes y estadísticas
+que analizar() y que cada corte sea un prefijo del flujo con exactamente N errores;
+sale con código 1 si algo no coincide.
+
+    python benchmarks/stream.py [sentencias]
+"""
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import Compilador
+from generador import errores
+
+CORTES = (1, 10, 100, 1000, 10000)
+
+
+def consumir(flujo):
+    """Mensajes del generador y el resumen que retorna al terminar"""
+    mensajes = []
+    while True:
+        try:
+            mensajes.append(next(flujo))
+        except StopIteration as fin:
+            return mensajes, fin.value
+
+
+def clave(mensaje):
+    return mensaje['tipo'], mensaje['linea'], mensaje['mensaje']
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    codigo = errores(n)
+    compilador = Compilador()
+    fallas = 0
+
+    inicio = time.perf_counter()
+    completo = compilador.analizar(codigo)
+    t_completo = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    flujo = compilador.analizar_stream(codigo)
+    next(flujo)
+    t_primero = time.perf_counter() - inicio
+    flujo.close()
+
+    inicio = time.perf_counter()
+    todos, resumen = consumir(compilador.analizar_stream(codigo))
+    t_flujo = time.perf_counter() - inicio
+    if Counter(map(clave, todos)) != Counter(map(clave, completo['mensajes'])) \
+            or resumen['estadisticas'] != completo['estadisticas'] or resumen['cortado']:
+        print("❌ El flujo completo no trae lo mismo que analizar()")
+        fallas += 1
+
+    total_errores = completo['estadisticas']['errores']
+    print(f"{n} sentencias, {len(completo['mensajes'])} mensajes, {total_errores} errores")
+    print(f"analizar() completo        {t_completo:>9.3f} s")
+    print(f"flujo completo             {t_flujo:>9.3f} s  ({len(todos) / t_flujo:,.0f} mensajes/s)")
+    print(f"primer mensaje del flujo   {t_primero * 1e3:>9.3f} ms")
+    print(f"{'max_errores':>11} {'mensajes':>9} {'tiempo (ms)':>12} {'vs. completo':>13}")
+    for corte in CORTES:
+        if corte > total_errores:
+            break
+        inicio = time.perf_counter()
+        mensajes, resumen = consumir(compilador.analizar_stream(codigo, max_errores=corte))
+        tiempo = time.perf_counter() - inicio
+        cantidad = sum(mensaje['tipo'] == 'error' for mensaje in mensajes)
+        if mensajes != todos[:len(mensajes)] or cantidad != corte or not resumen['cortado'] \
+                or resumen['estadisticas']['errores'] != corte:
+            print(f"❌ max_errores={corte}: el corte no es un prefijo del flujo con {corte} errores")
+            fallas += 1
+        print(f"{corte:>11} {len(mensajes):>9} {tiempo * 1e3:>12.2f} {t_completo / tiempo:>12.0f}x")
+
+    if fallas:
+        sys.exit(1)
+    print("✅ El flujo coincide con analizar() y los cortes son prefijos exactos")
@@ -0,0 +1,160 @@
+"""Suite de benchmarks: tiempo por fase y memoria de Compilador.analizar sobre programas sintéticos.
+
+Para cada forma de generador.py y cada tamaño mide (mejor de varias repeticiones), con la
+instrumentación de Compilador(medir=True) (ver metricas.py):
+
+    lexico      tokenizar todo el programa
+    sintactico  parser y acciones, sin la parte semántica
+    semantico   tiempo dentro de la validación de tipos y la evaluación de valores
+    total       Compilador.analizar completo
+    memoria     pico de memoria asignada durante analizar (tracemalloc)
+
+Los resultados se guardan en benchmarks/resultados/<etiqueta>.json (por defecto la
+etiqueta es el commit actual) para poder comparar dos commits:
+
+    python benchmarks/suite.py                              # mide y guarda
+    python benchmarks/suite.py --comparar resultados/abc1234.json   # mide y compara
+    python benchmarks/suite.py --comparar viejo.json nuevo.json     # solo compara
+
+Al comparar, un valor que empeora más que el umbral se marca como regresión y el
+programa sale con código 1.
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import subprocess
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from parser import Compilador
+from generador import FORMAS
+
+CARPETA_RESULTADOS = os.path.join(RAIZ, 'benchmarks', 'resultados')
+TAMANOS = (500, 1000, 2000, 4000)
+METRICAS = ('lexico', 'sintactico', 'semantico', 'total', 'memoria')
+MINIMO_SIGNIFICATIVO = {'memoria': 64 * 1024}   # Por debajo de esto la diferencia es ruido
+MINIMO_TIEMPO = 0.002
+
+
+def medir_programa(codigo, repeticiones, con_memoria):
+    """Mejor tiempo de cada fase sobre varias repeticiones, y el pico de memoria"""
+    compilador = Compilador(medir=True)
+    medidas = dict.fromkeys(('lexico', 'sintactico', 'semantico', 'total'), float('inf'))
+    for _ in range(repeticiones):
+        metricas = compilador.analizar(codigo)['estadisticas']['instrumentacion']
+        for fase in medidas:
+            medidas[fase] = min(medidas[fase], metricas[fase]['pared'])
+
+    if con_memoria:
+        # Corrida aparte: tracemalloc hace todo mucho más lento
+        metricas = Compilador(memoria=True).analizar(codigo)['estadisticas']['instrumentacion']
+        medidas['memoria'] = metricas['memoria_pico']
+    return medidas
+
+
+def etiqueta_actual():
+    """Commit actual (corto), con '+' si hay cambios sin guardar; 'local' fuera de git"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        cambios = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=RAIZ,
+                                 capture_output=True, text=True, check=True).stdout.strip()
+        return commit + ('+' if cambios else '')
+    except (OSError, subprocess.CalledProcessError):
+        return 'local'
+
+
+def ejecutar(formas, tamanos, repeticiones, con_memoria):
+    resultados = {}
+    print(f"{'forma':<14} {'tamaño':>7} {'léxico':>8} {'sintáctico':>10} {'semántico':>9} "
+          f"{'total (s)':>9} {'memoria (MB)':>12}")
+    for forma in formas:
+        resultados[forma] = {}
+        for tamano in tamanos:
+            medidas = medir_programa(FORMAS[forma](tamano), repeticiones, con_memoria)
+            resultados[forma][str(tamano)] = medidas
+            memoria = f"{medidas['memoria'] / 1e6:>12.1f}" if 'memoria' in medidas else f"{'-':>12}"
+            print(f"{forma:<14} {tamano:>7} {medidas['lexico']:>8.3f} {medidas['sintactico']:>10.3f} "
+                  f"{medidas['semantico']:>9.3f} {medidas['total']:>9.3f} {memoria}")
+    return resultados
+
+
+def comparar(base, nuevo, umbral):
+    """Imprime las diferencias entre dos corridas y retorna las regresiones encontradas"""
+    regresiones = []
+    print(f"\nComparación {base['etiqueta']} → {nuevo['etiqueta']} (umbral {umbral:.0%})")
+    for forma, por_tamano in nuevo['resultados'].items():
+        for tamano, medidas in por_tamano.items():
+            anteriores = base['resultados'].get(forma, {}).get(tamano)
+            if anteriores is None:
+                continue
+            for metrica in METRICAS:
+                if metrica not in medidas or metrica not in anteriores:
+                    continue
+                antes, ahora = anteriores[metrica], medidas[metrica]
+                minimo = MINIMO_SIGNIFICATIVO.get(metrica, MINIMO_TIEMPO)
+                if ahora - antes > max(minimo, antes * umbral):
+                    regresiones.append((forma, tamano, metrica, antes, ahora))
+                    cambio = (ahora / antes - 1) if antes else float('inf')
+                    print(f"  ❌ {forma} {tamano} {metrica}: {antes:.4g} → {ahora:.4g} (+{cambio:.0%})")
+    if not regresiones:
+        print("  ✅ Sin regresiones")
+    return regresiones
+
+
+def cargar(ruta):
+    with open(ruta, encoding='utf-8') as archivo:
+        return json.load(archivo)
+
+
+def main(argv=None):
+    argumentos = argparse.ArgumentParser(description="Benchmarks por fase del compilador Costeñol")
+    argumentos.add_argument('--formas', default=','.join(FORMAS),
+                            help="formas de programa separadas por coma")
+    argumentos.add_argument('--tamanos', default=','.join(map(str, TAMANOS)),
+                            help="cantidades de sentencias separadas por coma")
+    argumentos.add_argument('--repeticiones', type=int, default=3)
+    argumentos.add_argument('--sin-memoria', action='store_true', help="no medir el pico de memoria")
+    argumentos.add_argument('--etiqueta', default=None, help="nombre de la corrida (por defecto, el commit)")
+    argumentos.add_argument('--comparar', nargs='+', metavar='JSON',
+                            help="corrida base (y opcionalmente la nueva, para comparar sin medir)")
+    argumentos.add_argument('--umbral', type=float, default=0.10,
+                            help="empeoramiento relativo que cuenta como regresión")
+    opciones = argumentos.parse_args(argv)
+
+    if opciones.comparar and len(opciones.comparar) == 2:
+        base, nuevo = (cargar(ruta) for ruta in opciones.comparar)
+        return 1 if comparar(base, nuevo, opciones.umbral) else 0
+
+    formas = opciones.formas.split(',')
+    for forma in formas:
+        if forma not in FORMAS:
+            argumentos.error(f"forma desconocida: {forma}")
+    tamanos = [int(tamano) for tamano in opciones.tamanos.split(',')]
+
+    nuevo = {
+        'etiqueta': opciones.etiqueta or etiqueta_actual(),
+        'fecha': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'maquina': platform.node(),
+        'repeticiones': opciones.repeticiones,
+        'resultados': ejecutar(formas, tamanos, opciones.repeticiones, not opciones.sin_memoria),
+    }
+
+    os.makedirs(CARPETA_RESULTADOS, exist_ok=True)
+    ruta = os.path.join(CARPETA_RESULTADOS, f"{nuevo['etiqueta']}.json")
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        json.dump(nuevo, archivo, ensure_ascii=False, indent=2)
+    print(f"\nResultados guardados en {os.path.relpath(ruta)}")
+
+    if opciones.comparar:
+        return 1 if comparar(cargar(opciones.comparar[0]), nuevo, opciones.umbral) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""Benchmark de la tabla de símbolos: slots y arreglos paralelos vs. el diccionario de diccionarios.
+
+Llena las dos tablas con las mismas variables y reporta bytes por variable (tracemalloc)
+y el tiempo de las consultas que hace el chequeo de tipos: buscar la variable, ver si
+tiene valor y leer su tipo. Después analiza un programa de declaraciones para dar el
+peso de la tabla dentro de un análisis real.
+
+    python benchmarks/tabla_simbolos.py [variables]
+"""
+import os
+import sys
+import time
+import random
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import Compilador
+from simbolos import TablaSimbolos
+from tipos import Tipo
+from nodos import Numero
+from generador import declaraciones
+
+TIPOS = ('Entero', 'Real', 'Texto')
+
+
+def llenar_diccionarios(nombres, valor):
+    tabla = {}
+    for linea, nombre in enumerate(nombres, 1):
+        tabla[nombre] = {'tipo': TIPOS[linea % 3], 'valor': None, 'linea': linea}
+        tabla[nombre]['valor'] = valor
+    return tabla
+
+
+def llenar_slots(nombres, valor):
+    tabla = TablaSimbolos()
+    for linea, nombre in enumerate(nombres, 1):
+        tabla.asignar(tabla.declarar(nombre, TIPOS[linea % 3], linea), valor)
+    return tabla
+
+
+def consultar_diccionarios(tabla, consultas):
+    # Lo que hacía calcular_tipo_expresion con una variable
+    tipos = 0
+    for nombre in consultas:
+        if nombre in tabla and tabla[nombre]['valor'] is not None:
+            tipos += Tipo(tabla[nombre]['tipo']) is Tipo.REAL
+    return tipos
+
+
+def consultar_slots(tabla, consultas):
+    tipos = 0
+    for nombre in consultas:
+        slot = tabla.slot(nombre)
+        if slot is not None and tabla.valores[slot] is not None:
+            tipos += tabla.tipo(slot) is Tipo.REAL
+    return tipos
+
+
+def medir(llenar, consultar, nombres, consultas):
+    valor = Numero(1)
+    tracemalloc.start()
+    tabla = llenar(nombres, valor)
+    memoria = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    inicio = time.perf_counter()
+    resultado = consultar(tabla, consultas)
+    return memoria, time.perf_counter() - inicio, resultado
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    # Los nombres ya existen en el código fuente: no se cuentan en la tabla
+    nombres = [sys.intern(f"v{i}") for i in range(n)]
+    azar = random.Random(3)
+    consultas = [azar.choice(nombres) for _ in range(n * 5)]
+
+    mem_dic, t_dic, r_dic = medir(llenar_diccionarios, consultar_diccionarios, nombres, consultas)
+    mem_slot, t_slot, r_slot = medir(llenar_slots, consultar_slots, nombres, consultas)
+
+    print(f"Variables: {n}, consultas: {len(consultas)}")
+    print(f"{'':13} {'bytes/variable':>15} {'consulta (ns)':>14}")
+    for nombre, memoria, tiempo in (('diccionarios', mem_dic, t_dic), ('slots', mem_slot, t_slot)):
+        print(f"{nombre:13} {memoria / n:>15.1f} {tiempo / len(consultas) * 1e9:>14.1f}")
+    print(f"Memoria: {mem_dic / mem_slot:.1f}x menos; consultas: {t_dic / t_slot:.2f}x más rápidas")
+
+    # Con tracemalloc encendido el análisis es varias veces más lento: uno más chico
+    compilador = Compilador(memoria=True)
+    metricas = compilador.analizar(declaraciones(n // 2))['estadisticas']['instrumentacion']
+    print(f"Análisis de {n // 4} declaraciones con asignación: {metricas['total']['pared']:.2f} s, "
+          f"pico de memoria {metricas['memoria_pico'] / 2**20:.1f} MiB "
+          f"({len(compilador.tabla_simbolos)} símbolos)")
+
+    if r_dic != r_slot:
+        print("❌ Las dos tablas no responden lo mismo")
+        sys.exit(1)
@@ -0,0 +1,403 @@
+"""Caché en disco de resultados de análisis, direccionada por contenido.
+
+La clave es el hash del código fuente junto con la firma del compilador (el código de
+los módulos que deciden el resultado y la versión de Python), así que un cambio en la
+gramática, en los mensajes o en las reglas de tipos deja inservibles las entradas
+viejas sin tener que borrarlas. Cada entrada guarda con marshal el resultado de
+analizar(): éxito, mensajes, estadísticas, la tabla de símbolos y el árbol en forma
+compacta (nodos.compactar).
+
+    cache = CacheCompilacion('~/.cache/costenol', limite_bytes=256 << 20)
+    compilador = Compilador(cache=cache)
+    compilador.analizar(codigo)['estadisticas']['cache_disco']   # 'acierto' o 'fallo'
+    cache.estadisticas()
+
+Varios procesos pueden usar la misma carpeta: cada entrada se escribe en un archivo
+temporal y se renombra (nadie lee un archivo a medias), y una entrada que desaparece
+entre el listado y la lectura cuenta como fallo. Cuando la carpeta pasa del límite se
+borran las entradas usadas hace más tiempo (la fecha de modificación se actualiza en
+cada acierto).
+
+Un acierto no arma el árbol: devuelve mensajes y estadísticas, y 'resultado' (igual
+que los valores de la tabla de símbolos) es una secuencia que arma los nodos la primera
+vez que se lee. El compilador queda reiniciado y con la tabla de símbolos del análisis
+guardado; el receptor, si lo hay, recibe las sentencias al final.
+"""
+import os
+import sys
+import time
+import errno
+import hashlib
+import marshal
+import tempfile
+from collections.abc import Sequence
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None    # Sin fcntl (Windows) dos procesos pueden desalojar a la vez: no pasa nada
+
+from nodos import compactar, expandir
+from lexer import limpiar_errores_lexicos
+from metricas import metricas_acierto
+
+MAGIA = b'COSC2\n'
+EXTENSION = '.bin'
+LIMITE_POR_DEFECTO = 256 << 20
+# Módulos cuyo código decide el resultado de analizar()
+MODULOS_FIRMA = ('lexer.py', 'parser.py', 'nodos.py', 'tipos.py', 'simbolos.py', 'diagnosticos.py',
+                 'optimizador.py', 'cuerdas.py')
+
+_firma = None
+
+def firma_compilador():
+    """Hash del código del compilador, de la versión de Python y del orden de bytes
+
+    La tabla de símbolos se guarda con los bytes de sus arreglos (ver guardar)
+    """
+    global _firma
+    if _firma is None:
+        h = hashlib.sha256(repr((sys.version_info[:2], sys.byteorder)).encode('ascii'))
+        carpeta = os.path.dirname(os.path.abspath(__file__))
+        for nombre in MODULOS_FIRMA:
+            with open(os.path.join(carpeta, nombre), 'rb') as archivo:
+                h.update(nombre.encode('ascii') + b'\0' + archivo.read())
+        _firma = h.digest()
+    return _firma
+
+
+class CacheCompilacion:
+    """Resultados de analizar() guardados en una carpeta, con desalojo LRU"""
+
+    def __init__(self, carpeta, limite_bytes=LIMITE_POR_DEFECTO):
+        self.carpeta = os.path.abspath(os.path.expanduser(carpeta))
+        self.limite_bytes = limite_bytes
+        self.aciertos = 0
+        self.fallos = 0
+        self.escrituras = 0
+        self.desalojos = 0
+        self._escrito_sin_revisar = None    # None: todavía no se midió la carpeta
+        os.makedirs(self.carpeta, exist_ok=True)
+
+    # ---------------- CLAVES ----------------
+    def clave_texto(self, codigo, plegado=False):
+        # Con Compilador(optimizar=True) el árbol guardado cambia: es otra entrada
+        h = hashlib.sha256(firma_compilador())
+        h.update(b'texto-plegado\0' if plegado else b'texto\0')
+        h.update(codigo.encode('utf-8', 'surrogatepass'))
+        return h.hexdigest()
+
+    def clave_archivo(self, ruta, plegado=False):
+        """Clave por los bytes del archivo (leído por bloques)"""
+        h = hashlib.sha256(firma_compilador())
+        h.update(b'archivo-plegado\0' if plegado else b'archivo\0')
+        with open(ruta, 'rb') as archivo:
+            for bloque in iter(lambda: archivo.read(1 << 20), b''):
+                h.update(bloque)
+        return h.hexdigest()
+
+    def _ruta(self, clave):
+        return os.path.join(self.carpeta, clave[:2], clave[2:] + EXTENSION)
+
+    # ---------------- LECTURA Y ESCRITURA ----------------
+    def leer(self, clave):
+        """Entrada guardada para la clave, o None
+
+        Un diccionario con 'exito', 'mensajes', 'estadisticas' (sin 'cache_disco'),
+        'lista' (si el análisis sin receptor devolvía la lista de sentencias o None),
+        'sentencias' y 'simbolos' (nombres, bytes de tipos, bytes de líneas, valores).
+        Sentencias y valores son NodosGuardados: todavía no se armó ningún nodo.
+        """
+        ruta = self._ruta(clave)
+        try:
+            with open(ruta, 'rb') as archivo:
+                datos = archivo.read()
+        except OSError:
+            return None
+        try:
+            if not datos.startswith(MAGIA):
+                raise ValueError("magia")
+            (exito, mensajes, estadisticas, lista, cantidad, arbol,
+             nombres, tipos, lineas, valores) = marshal.loads(memoryview(datos)[len(MAGIA):])
+        except (ValueError, EOFError, TypeError):
+            self._borrar(ruta)      # Entrada dañada: se descarta
+            return None
+        try:
+            os.utime(ruta)          # ⭐ Recién usada: la última en salir al desalojar
+        except OSError:
+            pass
+        return {
+            'exito': exito,
+            'mensajes': [{'tipo': tipo, 'linea': linea, 'mensaje': mensaje}
+                         for tipo, linea, mensaje in mensajes],
+            'estadisticas': estadisticas,
+            'lista': lista,
+            'sentencias': NodosGuardados(arbol, cantidad),
+            'simbolos': (nombres, tipos, lineas, NodosGuardados(valores, len(nombres))),
+        }
+
+    def guardar(self, clave, respuesta, sentencias, compilador):
+        """Guarda un resultado de analizar() con todas sus sentencias
+
+        'sentencias' son las que se redujeron (las que recibiría un receptor); el estado
+        que falta (tabla de símbolos y si se redujo 'programa') se toma del compilador,
+        que acaba de analizar.
+        """
+        tabla = compilador.tabla_simbolos
+        estadisticas = {nombre: valor for nombre, valor in respuesta['estadisticas'].items()
+                        if nombre not in ('instrumentacion', 'cache_disco')}
+        # ⭐ Árbol y valores van como bytes de marshal dentro de la entrada: leerla no
+        # los decodifica, eso lo hace NodosGuardados cuando alguien los usa
+        datos = MAGIA + marshal.dumps((
+            respuesta['exito'],
+            [(m['tipo'], m['linea'], m['mensaje']) for m in respuesta['mensajes']],
+            estadisticas,
+            compilador.programa_reducido,
+            len(sentencias),
+            marshal.dumps([compactar(sentencia) for sentencia in sentencias]),
+            tabla.nombres,
+            tabla.tipos.tobytes(),
+            tabla.lineas.tobytes(),
+            marshal.dumps([None if valor is None else compactar(valor) for valor in tabla.valores]),
+        ))
+        ruta = self._ruta(clave)
+        carpeta = os.path.dirname(ruta)
+        os.makedirs(carpeta, exist_ok=True)
+        descriptor, temporal = tempfile.mkstemp(dir=carpeta, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as archivo:
+                archivo.write(datos)
+            os.replace(temporal, ruta)      # ⭐ Atómico: los lectores ven la entrada entera o nada
+        except BaseException:
+            self._borrar(temporal)
+            raise
+        self.escrituras += 1
+        self._revisar_limite(len(datos))
+
+    # ---------------- DESALOJO ----------------
+    def _revisar_limite(self, escritos):
+        # Recorrer la carpeta cuesta: se hace la primera vez y cada vez que se escribe
+        # un décimo del límite desde la última revisión
+        if self._escrito_sin_revisar is not None:
+            self._escrito_sin_revisar += escritos
+            if self._escrito_sin_revisar < self.limite_bytes // 10:
+                return
+        self._escrito_sin_revisar = 0
+        self.desalojar()
+
+    def desalojar(self, objetivo=None):
+        """Borra las entradas usadas hace más tiempo hasta quedar bajo el límite
+
+        Sin 'objetivo', si la carpeta pasó del límite se baja al 90 % para no volver a
+        revisar enseguida.
+        """
+        with _Candado(os.path.join(self.carpeta, '.desalojo')) as tomado:
+            if not tomado:
+                return      # Otro proceso está desalojando
+            entradas = []
+            total = 0
+            for sub in _listar(self.carpeta):
+                if not sub.is_dir():
+                    continue
+                for entrada in _listar(sub.path):
+                    if not entrada.name.endswith(EXTENSION):
+                        continue    # Temporal de una escritura en curso
+                    try:
+                        estado = entrada.stat()
+                    except OSError:
+                        continue
+                    entradas.append((estado.st_mtime, estado.st_size, entrada.path))
+                    total += estado.st_size
+            if objetivo is None:
+                if total <= self.limite_bytes:
+                    return
+                objetivo = self.limite_bytes * 9 // 10
+            entradas.sort()
+            for _, tamano, ruta in entradas:
+                if total <= objetivo:
+                    break
+                if self._borrar(ruta):
+                    self.desalojos += 1
+                total -= tamano
+
+    def limpiar(self):
+        """Borra todas las entradas"""
+        self.desalojar(objetivo=0)
+
+    def _borrar(self, ruta):
+        try:
+            os.remove(ruta)
+            return True
+        except OSError:
+            return False    # Ya la borró otro proceso
+
+    def tamano(self):
+        """Entradas y bytes que ocupa la carpeta ahora"""
+        entradas = total = 0
+        for sub in _listar(self.carpeta):
+            if sub.is_dir():
+                for entrada in _listar(sub.path):
+                    if not entrada.name.endswith(EXTENSION):
+                        continue
+                    try:
+                        total += entrada.stat().st_size
+                        entradas += 1
+                    except OSError:
+                        pass
+        return entradas, total
+
+    def estadisticas(self):
+        """Aciertos, fallos, escrituras y desalojos de este proceso"""
+        consultas = self.aciertos + self.fallos
+        return {
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+            'escrituras': self.escrituras,
+            'desalojos': self.desalojos,
+        }
+
+    # ---------------- ANÁLISIS CON CACHÉ ----------------
+    def analizar(self, compilador, codigo, receptor=None):
+        """Compilador.analizar() pasando primero por la caché"""
+        clave = self.clave_texto(codigo, compilador.optimizar)
+        return self._analizar(compilador, clave, receptor, lambda recibir: compilador._analizar(codigo, recibir))
+
+    def analizar_archivo(self, compilador, ruta, receptor, tamano_bloque):
+        """Compilador.analizar_archivo() de una ruta pasando primero por la caché"""
+        clave = self.clave_archivo(ruta, compilador.optimizar)
+
+        def analizar(recibir):
+            with open(ruta, encoding='utf-8') as archivo:
+                return compilador._analizar(None, recibir, archivo, tamano_bloque)
+        return self._analizar(compilador, clave, receptor, analizar)
+
+    def _analizar(self, compilador, clave, receptor, analizar):
+        if compilador.medir:
+            pared, cpu = time.perf_counter(), time.process_time()
+        guardado = self.leer(clave)
+        if guardado is not None:
+            self.aciertos += 1
+            respuesta = self._responder(compilador, guardado, receptor)
+            if compilador.medir:
+                compilador._publicar_metricas(respuesta, metricas_acierto(
+                    compilador, time.perf_counter() - pared, time.process_time() - cpu))
+            return respuesta
+
+        self.fallos += 1
+        # ⭐ Las sentencias se juntan con un receptor aunque quien llamó no pase uno: así
+        # la entrada sirve para los dos casos (sin receptor, 'programa' pudo no reducirse)
+        sentencias = []
+        recibir = compilador._preparar_receptor(receptor)
+
+        def recibir_y_guardar(sentencia):
+            sentencias.append(sentencia)
+            if recibir is not None:
+                recibir(sentencia)
+        respuesta = analizar(recibir_y_guardar)
+        if receptor is None:
+            respuesta['resultado'] = sentencias if compilador.programa_reducido else None
+        if respuesta['exito']:
+            # ⭐ Los análisis que fallaron con una excepción no se guardan
+            try:
+                self.guardar(clave, respuesta, sentencias, compilador)
+            except OSError:
+                pass    # Sin espacio o sin permisos: la caché es opcional
+        respuesta['estadisticas']['cache_disco'] = 'fallo'
+        return respuesta
+
+    def _responder(self, compilador, guardado, receptor):
+        """Respuesta de analizar() a partir de una entrada, dejando el compilador como el análisis"""
+        compilador.reset()
+        limpiar_errores_lexicos(compilador.analizador_lexico.errores_lexicos)
+        compilador.tabla_simbolos.restaurar(*guardado['simbolos'])
+        compilador.programa_reducido = guardado['lista']
+
+        sentencias = guardado['sentencias']
+        if receptor is not None:
+            recibir = compilador._preparar_receptor(receptor)
+            for sentencia in sentencias:
+                recibir(sentencia)
+            resultado = None
+        else:
+            resultado = sentencias if guardado['lista'] else None
+        estadisticas = guardado['estadisticas']
+        estadisticas['cache_disco'] = 'acierto'
+        return {
+            'exito': guardado['exito'],
+            'resultado': resultado,
+            'mensajes': guardado['mensajes'],
+            'estadisticas': estadisticas,
+        }
+
+
+class NodosGuardados(Sequence):
+    """Lista de nodos compactados (o None) que se arma con nodos.expandir al leerla
+
+    Un acierto de la caché no paga el armado del árbol, que crece con el programa: lo
+    paga quien lea 'resultado' o los valores de la tabla de símbolos, una sola vez.
+    """
+    __slots__ = ('_datos', '_cantidad', '_nodos')
+
+    def __init__(self, datos, cantidad):
+        self._datos = datos         # Bytes de marshal con la lista de formas compactas
+        self._cantidad = cantidad
+        self._nodos = None
+
+    def _armar(self):
+        if self._nodos is None:
+            self._nodos = [None if compacto is None else expandir(compacto)
+                           for compacto in marshal.loads(self._datos)]
+            self._datos = None
+        return self._nodos
+
+    def __len__(self):
+        return self._cantidad
+
+    def __getitem__(self, indice):
+        return self._armar()[indice]
+
+    def __iter__(self):
+        return iter(self._armar())
+
+    def __eq__(self, otra):
+        if isinstance(otra, NodosGuardados):
+            otra = otra._armar()
+        return self._armar() == otra if isinstance(otra, list) else NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self._armar())
+
+
+def _listar(carpeta):
+    try:
+        with os.scandir(carpeta) as entradas:
+            return list(entradas)
+    except OSError:
+        return []
+
+
+class _Candado:
+    """Candado entre procesos sin espera (flock); sin fcntl siempre se toma"""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.archivo = None
+
+    def __enter__(self):
+        if fcntl is None:
+            return True
+        self.archivo = open(self.ruta, 'a')
+        try:
+            fcntl.flock(self.archivo, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError as e:
+            if e.errno not in (errno.EAGAIN, errno.EACCES, errno.EWOULDBLOCK):
+                raise
+            return False
+
+    def __exit__(self, *excepcion):
+        if self.archivo is not None:
+            self.archivo.close()    # Cerrar suelta el candado
@@ -0,0 +1,147 @@
+"""Compilador por lotes, sin interfaz gráfica (para CI).
+
+Recibe archivos o directorios, reparte los archivos en un pool de procesos con un
+Compilador ya armado en cada uno y escribe un JSON por línea con los diagnósticos
+de cada archivo. El resumen (aciertos, errores, archivos por segundo) sale por stderr.
+
+    python compilar_lote.py programas/ extra.cos -j 8 > diagnosticos.jsonl
+
+Con --cache CARPETA los archivos que no cambiaron desde la última corrida salen de la
+caché en disco (ver cache_compilacion.py), compartida por todos los procesos.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from multiprocessing import Pool
+
+from parser import Compilador
+from cache_compilacion import CacheCompilacion
+
+# Compilador del proceso trabajador (se arma una sola vez por proceso)
+_compilador = None
+
+
+def iniciar_trabajador(cache=None):
+    """Inicializa el Compilador del proceso para no pagar el arranque en cada archivo
+
+    'cache' es (carpeta, límite en bytes) o None; cada proceso abre su propia CacheCompilacion.
+    """
+    global _compilador
+    _compilador = Compilador(cache=CacheCompilacion(*cache) if cache else None)
+
+
+def descartar_sentencia(sentencia):
+    """Receptor que no guarda las sentencias (el lote solo necesita los mensajes)"""
+
+
+def analizar_archivo(ruta):
+    """Analiza un archivo y retorna sus diagnósticos listos para JSON"""
+    if _compilador is None:
+        iniciar_trabajador()
+
+    try:
+        # ⭐ Lectura por bloques; las sentencias se descartan porque solo se reportan mensajes.
+        # Con caché no hace falta el receptor: un acierto así ni siquiera arma el árbol
+        receptor = descartar_sentencia if _compilador.cache_disco is None else None
+        resultado = _compilador.analizar_archivo(ruta, receptor=receptor)
+    except (OSError, UnicodeDecodeError) as e:
+        return {
+            'archivo': ruta,
+            'exito': False,
+            'aciertos': 0,
+            'errores': 1,
+            'mensajes': [{'tipo': 'error', 'linea': '?', 'mensaje': f"¡Ombe! No pude leer el archivo: {e}"}]
+        }
+
+    diagnostico = {
+        'archivo': ruta,
+        'exito': resultado['exito'],
+        'aciertos': resultado['estadisticas']['aciertos'],
+        'errores': resultado['estadisticas']['errores'],
+        'mensajes': resultado['mensajes']
+    }
+    if 'cache_disco' in resultado['estadisticas']:
+        diagnostico['cache'] = resultado['estadisticas']['cache_disco']
+    return diagnostico
+
+
+def recolectar_archivos(rutas, extension):
+    """Expande los directorios (recursivamente) a los archivos con la extensión indicada"""
+    archivos = []
+    for ruta in rutas:
+        if os.path.isdir(ruta):
+            for raiz, directorios, nombres in os.walk(ruta):
+                directorios.sort()
+                archivos.extend(os.path.join(raiz, nombre) for nombre in sorted(nombres)
+                                if nombre.endswith(extension))
+        else:
+            archivos.append(ruta)
+    return archivos
+
+
+def compilar_lote(archivos, procesos=None, salida=sys.stdout, cache=None):
+    """Analiza los archivos en paralelo escribiendo un JSON por línea, en el orden de entrada
+
+    'cache' es (carpeta, límite en bytes) para usar la caché en disco, o None.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    totales = {'archivos': 0, 'aciertos': 0, 'errores': 0, 'archivos_con_errores': 0}
+    if cache:
+        totales['cache_aciertos'] = 0
+
+    def registrar(diagnostico):
+        salida.write(json.dumps(diagnostico, ensure_ascii=False) + '\n')
+        totales['archivos'] += 1
+        totales['aciertos'] += diagnostico['aciertos']
+        totales['errores'] += diagnostico['errores']
+        if diagnostico['errores']:
+            totales['archivos_con_errores'] += 1
+        if diagnostico.get('cache') == 'acierto':
+            totales['cache_aciertos'] += 1
+
+    inicio = time.perf_counter()
+    if procesos == 1:
+        iniciar_trabajador(cache)
+        for ruta in archivos:
+            registrar(analizar_archivo(ruta))
+    else:
+        # Lotes pequeños: reparte bien la carga sin pagar un viaje por archivo
+        tamano_lote = max(1, min(64, len(archivos) // (procesos * 8)))
+        with Pool(procesos, initializer=iniciar_trabajador, initargs=(cache,)) as pool:
+            for diagnostico in pool.imap(analizar_archivo, archivos, chunksize=tamano_lote):
+                registrar(diagnostico)
+    totales['segundos'] = time.perf_counter() - inicio
+    totales['archivos_por_segundo'] = totales['archivos'] / totales['segundos'] if totales['segundos'] else 0.0
+    return totales
+
+
+def main(argv=None):
+    argumentos = argparse.ArgumentParser(description="Compila programas Costeñol sin abrir la ventana")
+    argumentos.add_argument('rutas', nargs='+', help="archivos o directorios a compilar")
+    argumentos.add_argument('-j', '--procesos', type=int, default=None,
+                            help="procesos trabajadores (por defecto, uno por núcleo)")
+    argumentos.add_argument('--extension', default='.cos',
+                            help="extensión de los archivos a buscar dentro de los directorios")
+    argumentos.add_argument('--cache', metavar='CARPETA', default=None,
+                            help="guarda y reutiliza los resultados en esta carpeta")
+    argumentos.add_argument('--cache-limite', metavar='MB', type=int, default=256,
+                            help="tamaño máximo de la caché en MB (por defecto 256)")
+    opciones = argumentos.parse_args(argv)
+
+    archivos = recolectar_archivos(opciones.rutas, opciones.extension)
+    cache = (opciones.cache, opciones.cache_limite << 20) if opciones.cache else None
+    totales = compilar_lote(archivos, opciones.procesos, cache=cache)
+
+    print(f"📊 {totales['archivos']} archivo(s): {totales['aciertos']} aciertos, "
+          f"{totales['errores']} errores en {totales['archivos_con_errores']} archivo(s) "
+          f"— {totales['archivos_por_segundo']:.1f} archivos/s", file=sys.stderr)
+    if 'cache_aciertos' in totales:
+        print(f"💾 Caché: {totales['cache_aciertos']} de {totales['archivos']} archivo(s) sin analizar de nuevo",
+              file=sys.stderr)
+    return 1 if totales['errores'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""Genera las tablas precompiladas del lexer (lextab.py) y del parser (parsetab.py).
+
+Hay que correrlo cada vez que cambien las reglas t_* de lexer.py o las p_* de parser.py:
+
+    python construir_tablas.py              # regenera las tablas
+    python construir_tablas.py --verificar  # falla si las tablas están viejas (para CI)
+"""
+import os
+import sys
+import importlib
+import ply.lex as lex
+import ply.yacc as yacc
+
+import lexer
+from parser import Compilador
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+
+def firma_parser():
+    """Firma de la gramática tal como la calcula yacc para validar parsetab.py"""
+    compilador = Compilador()
+    pdict = {k: getattr(compilador, k) for k in dir(compilador)}
+    info = yacc.ParserReflect(pdict)
+    info.get_all()
+    return info.signature()
+
+
+def tablas_vigentes():
+    """Retorna (lexer_ok, parser_ok) comparando las tablas guardadas con las reglas actuales"""
+    importlib.invalidate_caches()
+    try:
+        lextab = importlib.reload(importlib.import_module('lextab'))
+        lexer_ok = getattr(lextab, '_firma', None) == lexer.firma_lexica()
+    except ImportError:
+        lexer_ok = False
+    try:
+        parsetab = importlib.reload(importlib.import_module('parsetab'))
+        parser_ok = getattr(parsetab, '_lr_signature', None) == firma_parser()
+    except ImportError:
+        parser_ok = False
+    return lexer_ok, parser_ok
+
+
+def construir():
+    """Escribe lextab.py y parsetab.py junto a los fuentes"""
+    # Lexer: se arma desde las reglas (no desde una tabla vieja) y se le agrega la firma
+    analizador = lex.lex(module=lexer)
+    analizador.writetab('lextab', DIRECTORIO)
+    with open(os.path.join(DIRECTORIO, 'lextab.py'), 'a') as archivo:
+        archivo.write('_firma = %r\n' % lexer.firma_lexica())
+
+    # Parser: se borra la tabla anterior para que yacc no la reutilice
+    ruta_parsetab = os.path.join(DIRECTORIO, 'parsetab.py')
+    if os.path.exists(ruta_parsetab):
+        os.remove(ruta_parsetab)
+    sys.modules.pop('parsetab', None)
+    importlib.invalidate_caches()
+    yacc.yacc(module=Compilador(), debug=False, write_tables=True,
+              tabmodule='parsetab', outputdir=DIRECTORIO)
+
+
+if __name__ == '__main__':
+    if '--verificar' in sys.argv[1:]:
+        lexer_ok, parser_ok = tablas_vigentes()
+        print(f"lextab.py:   {'al día' if lexer_ok else 'VIEJA'}")
+        print(f"parsetab.py: {'al día' if parser_ok else 'VIEJA'}")
+        sys.exit(0 if lexer_ok and parser_ok else 1)
+
+    construir()
+    print("Tablas generadas: lextab.py, parsetab.py")
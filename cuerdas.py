@@ -0,0 +1,51 @@
+# ------------------- CUERDAS DE TEXTO -------------------
+# Valor de una suma 'Texto + Texto': en vez de copiar los dos textos en uno nuevo (lo
+# que hace que 'a + b + c + ...' con n piezas cueste n² caracteres copiados) se guarda
+# un nodo con sus dos partes. El texto se arma una sola vez, al mostrarlo, recorriendo
+# las hojas en orden y uniéndolas con join: O(largo total).
+
+class Cuerda:
+    """Concatenación pendiente de dos textos (str o Cuerda)"""
+    __slots__ = ('izq', 'der', 'longitud', '_texto')
+
+    def __init__(self, izq, der):
+        self.izq = izq
+        self.der = der
+        self.longitud = len(izq) + len(der)
+        self._texto = None      # El texto ya armado, después del primer str()
+
+    def __len__(self):
+        return self.longitud
+
+    def __str__(self):
+        """El texto completo (se arma la primera vez y se guarda)"""
+        if self._texto is not None:
+            return self._texto
+        # Preorden con pila propia (derecha antes que izquierda): una cadena de cientos
+        # de miles de sumas no desborda la recursión
+        piezas = []
+        pila = [self]
+        while pila:
+            parte = pila.pop()
+            if type(parte) is str:
+                piezas.append(parte)
+            elif parte._texto is not None:
+                piezas.append(parte._texto)
+            else:
+                pila.append(parte.der)
+                pila.append(parte.izq)
+        self._texto = ''.join(piezas)
+        return self._texto
+
+    def __repr__(self):
+        return f"Cuerda({len(self)} caracteres)"
+
+TEXTOS = (str, Cuerda)
+
+def concatenar(izq, der):
+    """'izq + der' entre textos sin copiarlos (los vacíos no agregan nodos)"""
+    if not len(der):
+        return izq
+    if not len(izq):
+        return der
+    return Cuerda(izq, der)
@@ -0,0 +1,122 @@
+from heapq import merge
+
+# ------------------- MENSAJES DE LA CONSOLA -------------------
+# Los mensajes se guardan en orden de llegada, con un índice por línea y contadores
+# por tipo; así p_error pregunta "¿la línea N tiene código?" sin recorrer la lista y
+# las estadísticas salen sin contar de nuevo.
+
+def _linea(mensaje):
+    return mensaje['linea']
+
+class Diagnosticos:
+    """Mensajes del análisis indexados por línea"""
+
+    def __init__(self, avisar=None, guardar=True):
+        """'avisar' recibe cada mensaje apenas se agrega; con guardar=False solo se llevan
+        el índice por línea y los contadores (analizar_stream no guarda los mensajes)"""
+        self.avisar = avisar
+        self.guardar = guardar
+        self.mensajes = []          # Todos, en orden de llegada
+        self.numerados = []         # Los que tienen número de línea, en orden de llegada
+        self.sin_linea = []         # Los de línea '?', que van al final
+        self.por_linea = {}         # Línea -> cantidad de mensajes de éxito o error
+        self.conteo = {'exito': 0, 'error': 0}
+        self.desorden = None        # Posición en 'numerados' del primero que llegó fuera de orden
+
+    def __len__(self):
+        return len(self.mensajes)
+
+    def __iter__(self):
+        return iter(self.mensajes)
+
+    def agregar(self, tipo, linea, mensaje):
+        """Agrega un mensaje y actualiza el índice y los contadores"""
+        msg = {
+            'tipo': tipo,
+            'linea': linea,
+            'mensaje': mensaje
+        }
+        if tipo in self.conteo:
+            self.conteo[tipo] += 1
+            if isinstance(linea, int):
+                self.por_linea[linea] = self.por_linea.get(linea, 0) + 1
+
+        if self.guardar:
+            self.mensajes.append(msg)
+            if isinstance(linea, int):
+                numerados = self.numerados
+                if self.desorden is None and numerados and linea < numerados[-1]['linea']:
+                    self.desorden = len(numerados)
+                numerados.append(msg)
+            else:
+                self.sin_linea.append(msg)
+
+        if self.avisar is not None:
+            self.avisar(msg)
+
+    def tiene_codigo(self, linea):
+        """Indica si la línea ya tiene un mensaje de éxito o de error"""
+        return linea in self.por_linea
+
+    def truncar(self, cantidad):
+        """Deja solo los primeros 'cantidad' mensajes (para volver a un punto de control)"""
+        while len(self.mensajes) > cantidad:
+            msg = self.mensajes.pop()
+            tipo, linea = msg['tipo'], msg['linea']
+            if tipo in self.conteo:
+                self.conteo[tipo] -= 1
+
+            # Los mensajes que se quitan son los últimos en llegar a su lista
+            if isinstance(linea, int):
+                self.numerados.pop()
+                if tipo in self.conteo:
+                    restantes = self.por_linea[linea] - 1
+                    if restantes:
+                        self.por_linea[linea] = restantes
+                    else:
+                        del self.por_linea[linea]
+            else:
+                self.sin_linea.pop()
+
+        if self.desorden is not None and self.desorden >= len(self.numerados):
+            self.desorden = None
+
+    def ordenados(self, errores_lexicos=()):
+        """Lista nueva con los mensajes y los errores léxicos ordenados por línea
+
+        Los errores léxicos ya vienen en orden de línea, igual que casi siempre los del
+        parser, así que basta con intercalarlos; los de línea '?' quedan al final.
+        """
+        numerados = self.numerados
+        if self.desorden is not None:
+            numerados = sorted(numerados, key=_linea)    # Estable: respeta la llegada
+
+        if errores_lexicos:
+            mensajes = list(merge(numerados, errores_lexicos, key=_linea))
+        else:
+            mensajes = list(numerados)
+        mensajes.extend(self.sin_linea)
+        return mensajes
+
+
+class ErroresEnVivo:
+    """Reemplaza la lista de errores léxicos del lexer en analizar_stream
+
+    Cada error se pasa a 'avisar' apenas el lexer lo agrega y no se guarda; solo se
+    cuenta, para las estadísticas.
+    """
+    __slots__ = ('avisar', 'cantidad')
+
+    def __init__(self, avisar):
+        self.avisar = avisar
+        self.cantidad = 0
+
+    def __len__(self):
+        return self.cantidad
+
+    def append(self, error):
+        self.cantidad += 1
+        self.avisar(error)
+
+    def clear(self):
+        self.cantidad = 0
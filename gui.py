@@ -1,6 +1,20 @@
+import queue
+import threading
+import time
+from bisect import bisect_left
 import tkinter as tk
+import tkinter.font as tkfont
 from tkinter import scrolledtext
 
+from parser import AnalisisCancelado
+
+ESPERA_TECLEO_MS = 300      # Pausa al escribir antes de analizar solo
+REFRESCO_MS = 16            # Revisión de resultados y progreso (~60 cuadros por segundo)
+PADDING_CONSOLA = 10        # Margen de arriba y abajo de la consola (px)
+
+ICONOS = {'exito': "✅ ", 'error': "❌ "}
+FILTROS = (('Todos', None), ('Éxitos', 'exito'), ('Errores', 'error'))
+
 class CompiladorGUI:
     def __init__(self, root, compilador):
         self.root = root
@@ -9,7 +23,25 @@ class CompiladorGUI:
         self.root.geometry("1300x750")
         self.root.configure(bg='#f0f4f8')
         
+        # ⭐ El análisis corre en un hilo aparte; la ventana solo recibe resultados
+        self.pedido = threading.Condition()
+        self.codigo_pendiente = None
+        self.cancelar_analisis = threading.Event()
+        self.resultados = queue.Queue()
+        self.analizando = False
+        self.espera_id = None
+        
+        # ⭐ Consola virtual: solo se pintan los mensajes que caben en pantalla
+        self.mensajes = []
+        self.mensajes_vista = []        # Mensajes que pasan el filtro
+        self.filas_resumen = []
+        self.inicio_consola = 0         # Primera fila visible
+        self.filtro = tk.StringVar(value='Todos')
+        
         self.crear_interfaz()
+        
+        threading.Thread(target=self.trabajador_analisis, daemon=True).start()
+        self.root.after(REFRESCO_MS, self.revisar_resultados)
     
     def crear_interfaz(self):
         """Crea todos los elementos de la interfaz"""
@@ -50,6 +82,12 @@ class CompiladorGUI:
                                       font=('Arial', 14, 'bold'), bg='#f8d7da', fg='#721c24',
                                       width=10, relief=tk.RAISED, bd=2, padx=10, pady=5)
         self.errores_label.pack(side=tk.LEFT, padx=5)
+        
+        # Progreso del análisis en curso o duración del último
+        self.estado_label = tk.Label(self.stats_frame, text="Listo",
+                                     font=('Arial', 10), bg='white', fg='#7f8c8d',
+                                     width=16, justify=tk.LEFT)
+        self.estado_label.pack(side=tk.LEFT, padx=5)
     
     def crear_panel_editor(self, parent):
         """Crea el panel del editor de código"""
@@ -83,6 +121,9 @@ class CompiladorGUI:
                                                      padx=10, pady=10,
                                                      wrap=tk.WORD)
         self.codigo_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        # Analizar mientras se escribe, cuando el usuario hace una pausa
+        self.codigo_text.bind('<<Modified>>', self.programar_analisis)
     
     def crear_ejemplos(self, parent):
         """Crea el área de ejemplos con mejor visibilidad"""
@@ -136,18 +177,51 @@ altura = 1,75;"""
                 font=('Arial', 14, 'bold'),
                 bg='#e74c3c', fg='white').pack(side=tk.LEFT, padx=15, pady=10)
         
+        # Ir a una línea
+        tk.Button(console_header, text="Ir", font=('Arial', 9, 'bold'),
+                  command=self.ir_a_linea).pack(side=tk.RIGHT, padx=(0, 10))
+        self.linea_entry = tk.Entry(console_header, width=6, font=('Consolas', 10))
+        self.linea_entry.pack(side=tk.RIGHT, padx=5)
+        self.linea_entry.bind('<Return>', self.ir_a_linea)
+        tk.Label(console_header, text="Línea:", font=('Arial', 10),
+                 bg='#e74c3c', fg='white').pack(side=tk.RIGHT)
+        
+        # Filtro por tipo de mensaje
+        for texto, _ in reversed(FILTROS):
+            tk.Radiobutton(console_header, text=texto, value=texto, variable=self.filtro,
+                           indicatoron=0, font=('Arial', 9), padx=6,
+                           command=self.aplicar_filtro).pack(side=tk.RIGHT, padx=2)
+        
         # Área de consola
         console_frame = tk.Frame(right_panel, bg='#1e1e1e')
         console_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        self.consola_text = scrolledtext.ScrolledText(console_frame, 
-                                                      font=('Consolas', 10),
-                                                      bg='#1e1e1e', fg='#d4d4d4',
-                                                      relief=tk.FLAT,
-                                                      padx=10, pady=10,
-                                                      state=tk.DISABLED,
-                                                      wrap=tk.WORD)
+        # La barra mueve la ventana de mensajes, no el texto (que solo tiene lo visible)
+        self.consola_scroll = tk.Scrollbar(console_frame, command=self.desplazar_consola)
+        self.consola_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        # ⭐ Sin ajuste de línea: cada mensaje es una sola fila de pantalla, así que las
+        # filas que caben se pueden contar por alto (los largos se ven con esta barra)
+        consola_scroll_x = tk.Scrollbar(console_frame, orient=tk.HORIZONTAL)
+        consola_scroll_x.pack(side=tk.BOTTOM, fill=tk.X)
+        
+        self.consola_text = tk.Text(console_frame,
+                                    font=('Consolas', 10),
+                                    bg='#1e1e1e', fg='#d4d4d4',
+                                    relief=tk.FLAT,
+                                    padx=10, pady=PADDING_CONSOLA,
+                                    state=tk.DISABLED,
+                                    wrap=tk.NONE,
+                                    xscrollcommand=consola_scroll_x.set)
         self.consola_text.pack(fill=tk.BOTH, expand=True)
+        consola_scroll_x.config(command=self.consola_text.xview)
+        # La fila más alta es la del resumen (Consolas 11): contando con esa, nunca se
+        # pinta una fila por debajo del borde
+        self.alto_fila = tkfont.Font(font=('Consolas', 11, 'bold')).metrics('linespace')
+        
+        self.consola_text.bind('<Configure>', lambda event: self.pintar_consola())
+        self.consola_text.bind('<MouseWheel>', self.rueda_consola)
+        self.consola_text.bind('<Button-4>', self.rueda_consola)
+        self.consola_text.bind('<Button-5>', self.rueda_consola)
         
         # Configurar tags de colores
         self.consola_text.tag_config('exito', foreground='#4ade80', font=('Consolas', 10, 'bold'))
@@ -156,56 +230,181 @@ altura = 1,75;"""
         self.consola_text.tag_config('linea', foreground='#60a5fa', font=('Consolas', 9))
         self.consola_text.tag_config('resumen', foreground='#c084fc', font=('Consolas', 11, 'bold'))
 
+    def programar_analisis(self, event=None):
+        """Reprograma el análisis para cuando el usuario deje de escribir"""
+        if not self.codigo_text.edit_modified():
+            return
+        self.codigo_text.edit_modified(False)
+        
+        if self.espera_id is not None:
+            self.root.after_cancel(self.espera_id)
+        self.espera_id = self.root.after(ESPERA_TECLEO_MS, self.analizar_codigo)
+    
     def analizar_codigo(self):
-        """Ejecuta el análisis del código"""
+        """Pide al hilo de análisis que analice el código actual"""
+        if self.espera_id is not None:
+            self.root.after_cancel(self.espera_id)
+            self.espera_id = None
         codigo = self.codigo_text.get('1.0', tk.END)
         
-        # Limpiar consola
-        self.consola_text.config(state=tk.NORMAL)
-        self.consola_text.delete('1.0', tk.END)
-        
-        # Analizar con el compilador
-        resultado = self.compilador.analizar(codigo)
-        
-        # Mostrar mensajes
-        self.mostrar_mensajes(resultado['mensajes'])
+        with self.pedido:
+            self.codigo_pendiente = codigo
+            # Si hay un análisis en curso, ya quedó viejo
+            self.cancelar_analisis.set()
+            self.pedido.notify()
+    
+    def trabajador_analisis(self):
+        """Hilo de análisis: siempre analiza la versión más reciente del código"""
+        while True:
+            with self.pedido:
+                while self.codigo_pendiente is None:
+                    self.pedido.wait()
+                codigo, self.codigo_pendiente = self.codigo_pendiente, None
+                self.cancelar_analisis.clear()
+            
+            self.analizando = True
+            inicio = time.perf_counter()
+            try:
+                # ⭐ Incremental: solo desde la primera sentencia editada
+                resultado = self.compilador.analizar_incremental(codigo, cancelar=self.cancelar_analisis)
+            except AnalisisCancelado:
+                continue
+            finally:
+                self.analizando = False
+            
+            # Si llegó otra edición mientras tanto, este resultado ya no sirve
+            if not self.cancelar_analisis.is_set():
+                self.resultados.put((resultado, time.perf_counter() - inicio))
+    
+    def revisar_resultados(self):
+        """Muestra el último resultado listo y el progreso (corre en el hilo de la ventana)"""
+        ultimo = None
+        try:
+            while True:
+                ultimo = self.resultados.get_nowait()
+        except queue.Empty:
+            pass
+        
+        if ultimo is not None:
+            resultado, duracion = ultimo
+            self.mostrar_resultado(resultado)
+            self.estado_label.config(text=f"Último análisis:\n{duracion * 1000:.0f} ms")
+        elif self.analizando:
+            self.estado_label.config(text=f"Analizando…\n{self.compilador.progreso() * 100:.0f}%")
+        
+        self.root.after(REFRESCO_MS, self.revisar_resultados)
+    
+    def mostrar_resultado(self, resultado):
+        """Pinta el resultado de un análisis en la consola y en el header"""
+        stats = resultado['estadisticas']
+        self.mostrar_mensajes(resultado['mensajes'], stats)
         
         # Actualizar estadísticas SOLO en el header
-        stats = resultado['estadisticas']
         self.actualizar_estadisticas(stats['aciertos'], stats['errores'])
-        
-        self.consola_text.config(state=tk.DISABLED)
     
-    def mostrar_mensajes(self, mensajes):
-        """Muestra los mensajes en la consola"""
-        for msg in mensajes:
-            linea_text = f"[Línea {msg['linea']}] "
-            self.consola_text.insert(tk.END, linea_text, 'linea')
-            
-            if msg['tipo'] == 'exito':
-                self.consola_text.insert(tk.END, f"✅ {msg['mensaje']}\n", 'exito')
-            elif msg['tipo'] == 'error':
-                self.consola_text.insert(tk.END, f"❌ {msg['mensaje']}\n", 'error')
-            else:
-                self.consola_text.insert(tk.END, f"⚠️  {msg['mensaje']}\n", 'advertencia')
-        
-        # Resumen final
-        if mensajes:
-            self.mostrar_resumen(mensajes)
+    def mostrar_mensajes(self, mensajes, estadisticas):
+        """Carga los mensajes en la consola (solo se pinta la parte visible)"""
+        self.mensajes = mensajes
+        self.filas_resumen = self.mostrar_resumen(estadisticas) if mensajes else []
+        self.aplicar_filtro()
     
-    def mostrar_resumen(self, mensajes):
-        """Muestra el resumen de compilación"""
-        aciertos = sum(1 for m in mensajes if m['tipo'] == 'exito')
-        errores = sum(1 for m in mensajes if m['tipo'] == 'error')
+    def mostrar_resumen(self, estadisticas):
+        """Arma las filas del resumen de compilación con las estadísticas ya calculadas"""
+        aciertos = estadisticas['aciertos']
+        errores = estadisticas['errores']
         
-        self.consola_text.insert(tk.END, f"\n{'='*50}\n", 'resumen')
-        self.consola_text.insert(tk.END, f"📊 RESUMEN FINAL\n", 'resumen')
-        self.consola_text.insert(tk.END, f"{'='*50}\n", 'resumen')
+        filas = [("\n", 'resumen'), (f"{'='*50}\n", 'resumen'),
+                 ("📊 RESUMEN FINAL\n", 'resumen'), (f"{'='*50}\n", 'resumen')]
         
         if errores == 0 and aciertos > 0:
-            self.consola_text.insert(tk.END, "¡Quedó chevere! Todo bien 🎉\n", 'exito')
+            filas.append(("¡Quedó chevere! Todo bien 🎉\n", 'exito'))
         elif errores > 0:
-            self.consola_text.insert(tk.END, f"¡Ombe! Hay {errores} error(es) que arreglar\n", 'error')
+            filas.append((f"¡Ombe! Hay {errores} error(es) que arreglar\n", 'error'))
+        return filas
+    
+    def aplicar_filtro(self):
+        """Deja en la vista solo los mensajes del tipo elegido"""
+        tipo = dict(FILTROS)[self.filtro.get()]
+        if tipo is None:
+            self.mensajes_vista = self.mensajes
+        else:
+            self.mensajes_vista = [msg for msg in self.mensajes if msg['tipo'] == tipo]
+        self.inicio_consola = 0
+        self.pintar_consola()
+    
+    def filas_visibles(self):
+        """Cantidad de filas que caben en la consola"""
+        alto = self.consola_text.winfo_height()
+        if alto <= 1:           # Todavía no se ha dibujado la ventana
+            return 40
+        # Sin el margen de arriba y abajo ni el borde del widget
+        alto -= 2 * (PADDING_CONSOLA + int(self.consola_text.cget('borderwidth'))
+                     + int(self.consola_text.cget('highlightthickness')))
+        return max(1, alto // self.alto_fila)
+    
+    def pintar_consola(self):
+        """Pinta solo las filas visibles, con un único insert"""
+        mensajes = self.mensajes_vista
+        total = len(mensajes) + len(self.filas_resumen)
+        filas = self.filas_visibles()
+        inicio = self.inicio_consola = max(0, min(self.inicio_consola, total - filas))
+        fin = min(total, inicio + filas)
+        
+        partes = []
+        for i in range(inicio, fin):
+            if i < len(mensajes):
+                msg = mensajes[i]
+                tipo = msg['tipo'] if msg['tipo'] in ICONOS else 'advertencia'
+                partes += (f"[Línea {msg['linea']}] ", 'linea',
+                           f"{ICONOS.get(tipo, '⚠️  ')}{msg['mensaje']}\n", tipo)
+            else:
+                partes += self.filas_resumen[i - len(mensajes)]
+        
+        self.consola_text.config(state=tk.NORMAL)
+        self.consola_text.delete('1.0', tk.END)
+        if partes:
+            self.consola_text.insert('1.0', *partes)
+        self.consola_text.config(state=tk.DISABLED)
+        
+        if total:
+            self.consola_scroll.set(inicio / total, fin / total)
+        else:
+            self.consola_scroll.set(0, 1)
+    
+    def desplazar_consola(self, accion, cantidad, unidad=None):
+        """Atiende la barra de desplazamiento de la consola"""
+        total = len(self.mensajes_vista) + len(self.filas_resumen)
+        if accion == tk.MOVETO:
+            self.inicio_consola = int(float(cantidad) * total)
+        elif accion == tk.SCROLL:
+            paso = self.filas_visibles() if unidad == tk.PAGES else 1
+            self.inicio_consola += int(cantidad) * paso
+        self.pintar_consola()
+    
+    def rueda_consola(self, event):
+        """Desplaza la consola con la rueda del ratón"""
+        if event.num == 4 or event.delta > 0:
+            self.inicio_consola -= 3
+        else:
+            self.inicio_consola += 3
+        self.pintar_consola()
+        return 'break'
+    
+    def ir_a_linea(self, event=None):
+        """Lleva la consola al primer mensaje de la línea pedida y el editor a esa línea"""
+        try:
+            linea = int(self.linea_entry.get())
+        except ValueError:
+            return
+        
+        # Los mensajes vienen ordenados por línea; los de línea '?' van al final
+        self.inicio_consola = bisect_left(
+            self.mensajes_vista, linea,
+            key=lambda msg: msg['linea'] if isinstance(msg['linea'], int) else float('inf'))
+        self.pintar_consola()
+        
+        self.codigo_text.mark_set(tk.INSERT, f"{linea}.0")
+        self.codigo_text.see(f"{linea}.0")
     
     def actualizar_estadisticas(self, aciertos, errores):
         """Actualiza las estadísticas SOLO en el header"""
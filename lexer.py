@@ -1,19 +1,22 @@
+import hashlib
+import sys
 import ply.lex as lex
 
-# Variable global para almacenar errores léxicos
+# Variable global para almacenar errores léxicos del lexer compartido (analizador_lexico).
+# ⭐ Cada clon de crear_analizador_lexico() lleva su propia lista en lexer.errores_lexicos
 errores_lexicos = []
 
-def agregar_error_lexico(linea, mensaje):
-    """Agrega un error léxico a la lista global"""
-    errores_lexicos.append({
+def agregar_error_lexico(linea, mensaje, errores=errores_lexicos):
+    """Agrega un error léxico a la lista indicada (por defecto la global)"""
+    errores.append({
         'tipo': 'error',
         'linea': linea,
         'mensaje': mensaje
     })
 
-def limpiar_errores_lexicos():
+def limpiar_errores_lexicos(errores=errores_lexicos):
     """Limpia la lista de errores léxicos"""
-    errores_lexicos.clear()
+    errores.clear()
 
 # ----------------------- TOKENS -----------------------------
 tokens = (
@@ -53,13 +56,16 @@ t_ignore = ' \t'
 # ⭐ ORDEN IMPORTANTE: Esta regla debe estar ANTES de t_IDENTIFICADOR
 def t_NUMERO_PEGADO_A_LETRA(t):
     r'\d+[a-zA-Z_][a-zA-Z0-9_]*'
-    agregar_error_lexico(t.lexer.lineno, f"¡Ey cole! Las variables no pueden empezar con números: '{t.value}'")
+    agregar_error_lexico(t.lexer.lineno, f"¡Ey cole! Las variables no pueden empezar con números: '{t.value}'",
+                         t.lexer.errores_lexicos)
     # NO retornamos el token, lo ignoramos completamente
     pass
 
 def t_IDENTIFICADOR(t):
     r'[a-zA-Z_][a-zA-Z0-9_]*'
     t.type = reservadas.get(t.value, 'IDENTIFICADOR')
+    if t.type == 'IDENTIFICADOR':
+        t.value = sys.intern(t.value)  # ⭐ Un solo objeto por nombre en el árbol y la tabla
     return t
 
 def t_NUMERO_REAL(t):
@@ -90,8 +96,116 @@ def t_nueva_linea(t):
     t.lexer.lineno += len(t.value)
 
 def t_error(t):
-    agregar_error_lexico(t.lexer.lineno, f"Carácter ilegal: '{t.value[0]}'")
+    agregar_error_lexico(t.lexer.lineno, f"Carácter ilegal: '{t.value[0]}'", t.lexer.errores_lexicos)
     t.lexer.skip(1)
 
+# --------------------TABLAS PRECOMPILADAS---------------------
+def firma_lexica():
+    """Hash de las reglas léxicas; si cambia, lextab.py quedó viejo"""
+    partes = [repr(tokens), t_ignore]
+    for nombre, valor in list(globals().items()):
+        if nombre.startswith('t_') and nombre != 't_ignore':
+            partes.append(nombre + ':' + (valor if isinstance(valor, str) else (valor.__doc__ or '')))
+    return hashlib.sha256('\n'.join(partes).encode('utf-8')).hexdigest()
+
+def construir_analizador_lexico():
+    """Carga el lexer desde lextab.py si está al día, si no lo construye desde las reglas"""
+    modulo = sys.modules[__name__]
+    try:
+        import lextab
+    except ImportError:
+        lextab = None
+
+    # ⭐ Tablas viejas o ausentes se rechazan: se arma el lexer desde cero (ver construir_tablas.py)
+    if lextab is not None and getattr(lextab, '_firma', None) == firma_lexica():
+        return lex.lex(module=modulo, optimize=True, lextab=lextab)
+    return lex.lex(module=modulo)
+
+def crear_analizador_lexico():
+    """Clon independiente del lexer, con su propio número de línea y lista de errores"""
+    clon = analizador_lexico.clone()
+    clon.lineno = 1
+    clon.errores_lexicos = []
+    return clon
+
+# --------------------ENTRADA POR BLOQUES---------------------
+TAMANO_BLOQUE = 1 << 20     # Caracteres que se leen del archivo cada vez
+
+class EntradaPorBloques:
+    """Alimenta al lexer con un archivo de texto leído por bloques
+
+    Cada bloque se corta en el último salto de línea: ningún token cruza un salto de
+    línea salvo los comentarios /* */, y si uno queda sin cerrar al final del bloque se
+    vuelve a leer desde el /* con el bloque siguiente. El número de línea sigue en el
+    lexer y las posiciones de los tokens son las del archivo completo.
+    """
+
+    def __init__(self, lexer, archivo, tamano_bloque=TAMANO_BLOQUE):
+        self.lexer = lexer
+        self.archivo = archivo
+        self.tamano_bloque = tamano_bloque
+        self.resto = ''             # Lo leído después del último salto de línea
+        self.base = 0               # Posición en el archivo del inicio del bloque actual
+        self.fin_archivo = False
+        lexer.input('')
+
+    def _cargar(self, desde, hasta_cierre=False):
+        """Pone en el lexer lo que falta del bloque actual desde 'desde' y el siguiente bloque
+
+        Con 'hasta_cierre' se sigue leyendo hasta encontrar un */ (o el fin del archivo).
+        Retorna False si ya no queda nada por leer.
+        """
+        lexer = self.lexer
+        partes = [lexer.lexdata[desde:]]
+        cola = partes[0][-1:]       # Último carácter cargado, por si el */ quedó partido
+        self.base += desde
+        leido, self.resto = self.resto, ''
+        while True:
+            inicio = 0
+            if hasta_cierre:
+                cierre = (cola + leido).find('*/')
+                if cierre >= 0:
+                    hasta_cierre = False
+                    inicio = cierre - len(cola) + 2
+            if not hasta_cierre:
+                corte = leido.rfind('\n', inicio) + 1
+                if corte:
+                    partes.append(leido[:corte])
+                    self.resto = leido[corte:]
+                    break
+            # Línea más larga que el bloque (o comentario abierto): se sigue leyendo
+            partes.append(leido)
+            cola = leido[-1:] or cola
+            if self.fin_archivo:
+                break
+            leido = self.archivo.read(self.tamano_bloque)
+            if not leido:
+                self.fin_archivo = True
+                break
+
+        texto = ''.join(partes)
+        if not texto:
+            return False
+        lexer.input(texto)
+        return True
+
+    def token(self):
+        """Siguiente token del archivo (None al terminar)"""
+        lexer = self.lexer
+        while True:
+            tok = lexer.token()
+            if tok is None:
+                if not self._cargar(lexer.lexlen):
+                    return None
+                continue
+            if (tok.type == 'DIVIDIDO' and not self.fin_archivo
+                    and lexer.lexdata.startswith('*', tok.lexpos + 1)):
+                # ⭐ Un /* cuyo */ todavía no se ha leído: se lee más y se vuelve a intentar
+                self._cargar(tok.lexpos, hasta_cierre=True)
+                continue
+            tok.lexpos += self.base
+            return tok
+
 # Construcción del analizador léxico
-analizador_lexico = lex.lex()
\ No newline at end of file
+analizador_lexico = construir_analizador_lexico()
+analizador_lexico.errores_lexicos = errores_lexicos
\ No newline at end of file
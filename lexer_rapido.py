@@ -0,0 +1,210 @@
+"""Analizador léxico rápido, escrito a mano, con el mismo flujo de tokens que el de PLY.
+
+Los tokens comunes (identificadores, números, cadenas, comentarios, símbolos de un
+carácter, saltos de línea y espacios) se reconocen por el primer carácter, sin pasar
+por la expresión maestra ni llamar a una función por token. Lo demás (números pegados
+a letras, caracteres ilegales, comillas sin cerrar) cae en una expresión maestra con las
+mismas reglas y el mismo orden que PLY y usa las funciones t_ de lexer.py, así que los
+mensajes de error son los mismos. Se elige con Compilador(lexico='rapido').
+"""
+import re
+import sys
+from functools import partial
+from ply.lex import LexToken
+
+import lexer as reglas
+
+# Firma de las reglas de lexer.py para la que se ajustó este analizador (ver firma_lexica)
+FIRMA_AJUSTADA = '0b2692c6fbcfc91eabb88fd7c872924fa226ad02c9c79c509a0dd5d4b0ded19e'
+
+class Token:
+    """Token con los mismos campos que usa el parser de PLY"""
+    # 'lexer' queda vacío: el parser lo llena solo en el token que se entrega a p_error
+    __slots__ = ('type', 'value', 'lineno', 'lexpos', 'lexer')
+
+    def __init__(self, tipo, valor, lineno, lexpos):
+        self.type = tipo
+        self.value = valor
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+    def __repr__(self):
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+# ---------------- EXPRESIÓN MAESTRA (igual que la de PLY) ----------------
+def _armar_expresion_maestra():
+    """Reglas de lexer.py en el orden de PLY: funciones por línea y cadenas por largo"""
+    funciones, cadenas = [], []
+    for nombre, valor in vars(reglas).items():
+        if not nombre.startswith('t_') or nombre in ('t_ignore', 't_error'):
+            continue
+        if callable(valor):
+            funciones.append((valor.__code__.co_firstlineno, nombre, valor))
+        else:
+            cadenas.append((nombre, valor))
+    funciones.sort()
+    cadenas.sort(key=lambda regla: len(regla[1]), reverse=True)
+
+    partes, acciones = [], {}
+    for _, nombre, funcion in funciones:
+        partes.append(f"(?P<{nombre}>{funcion.__doc__})")
+        acciones[nombre] = (funcion, nombre[2:])
+    for nombre, expresion in cadenas:
+        partes.append(f"(?P<{nombre}>{expresion})")
+        acciones[nombre] = (None, nombre[2:])
+    return re.compile('|'.join(partes), re.VERBOSE).match, acciones
+
+_MAESTRA, _ACCIONES = _armar_expresion_maestra()
+
+# ------------------- CLASES DEL PRIMER CARÁCTER -------------------
+OTRO, SIMBOLO, LETRA, DIGITO, BLANCO, SALTO, BARRA, COMILLA = range(8)
+
+_SIMBOLOS = {
+    '=': 'IGUAL', '+': 'MAS', '-': 'MENOS', '*': 'POR',
+    '(': 'PARENTESIS_IZQ', ')': 'PARENTESIS_DER',
+    ';': 'PUNTO_Y_COMA', ',': 'COMA', '.': 'PUNTO'
+}   # '/' no está: puede abrir un comentario
+
+_CLASES = dict.fromkeys(_SIMBOLOS, SIMBOLO)
+_CLASES.update(dict.fromkeys('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_', LETRA))
+_CLASES.update(dict.fromkeys('0123456789', DIGITO))
+_CLASES.update(dict.fromkeys(reglas.t_ignore, BLANCO))
+_CLASES['\n'] = SALTO
+_CLASES['/'] = BARRA
+_CLASES['"'] = COMILLA
+
+_IDENTIFICADOR = re.compile(r'[a-zA-Z_][a-zA-Z0-9_]*').match
+_NUMERO = re.compile(r'(\d+[a-zA-Z_][a-zA-Z0-9_]*)|(\d+,\d+)|(\d+)').match
+_SALTOS = re.compile(r'\n+').match
+_CADENA = re.compile(reglas.t_CADENA_TEXTO.__doc__, re.VERBOSE).match
+PEGADO, REAL, ENTERO = 1, 2, 3
+
+class AnalizadorLexicoRapido:
+    """Lexer compatible con el de PLY (input, token, lineno, lexpos) para el parser"""
+
+    def __init__(self):
+        if reglas.firma_lexica() != FIRMA_AJUSTADA:
+            raise RuntimeError("Las reglas de lexer.py cambiaron: hay que revisar lexer_rapido.py "
+                               "y actualizar FIRMA_AJUSTADA")
+        self.lineno = 1
+        self.errores_lexicos = []
+        self.input('')
+
+    def input(self, datos):
+        """Carga el texto a analizar (la lectura arranca en self.lexpos y self.lineno)"""
+        self.lexdata = datos
+        self.lexpos = 0
+        self.lexlen = len(datos)
+        # ⭐ token() es directamente next() sobre el generador: sin una llamada de Python por token
+        self.token = partial(next, self._escanear(), None)
+
+    def skip(self, n):
+        self.lexpos += n
+
+    def _delegar(self, funcion, tipo, valor, lineno, inicio, fin):
+        """Aplica una regla t_ de lexer.py como lo haría PLY"""
+        tok = LexToken()
+        tok.type = tipo
+        tok.value = valor
+        tok.lineno = lineno
+        tok.lexpos = inicio
+        tok.lexer = self
+        self.lexpos = fin
+        self.lineno = lineno
+        return funcion(tok)
+
+    def _escanear(self):
+        """Generador de tokens; guarda lexpos y lineno en el objeto a medida que avanza"""
+        lexdata = self.lexdata
+        pos = self.lexpos
+        fin = self.lexlen
+        lineno = self.lineno
+        clases = _CLASES
+        simbolos = _SIMBOLOS
+        reservadas = reglas.reservadas
+        intern = sys.intern
+
+        while pos < fin:
+            c = lexdata[pos]
+            clase = clases.get(c, OTRO)
+
+            if clase == LETRA:
+                m = _IDENTIFICADOR(lexdata, pos)
+                valor = m.group()
+                inicio, pos = pos, m.end()
+                self.lexpos = pos
+                tipo = reservadas.get(valor)
+                if tipo is None:
+                    yield Token('IDENTIFICADOR', intern(valor), lineno, inicio)
+                else:
+                    yield Token(tipo, valor, lineno, inicio)
+            elif clase == SIMBOLO:
+                pos += 1
+                self.lexpos = pos
+                yield Token(simbolos[c], c, lineno, pos - 1)
+            elif clase == BLANCO:
+                pos += 1
+            elif clase == SALTO:
+                fin_saltos = _SALTOS(lexdata, pos).end()
+                lineno += fin_saltos - pos
+                pos = fin_saltos
+                self.lineno = lineno
+            elif clase == DIGITO:
+                m = _NUMERO(lexdata, pos)
+                valor = m.group()
+                inicio, pos = pos, m.end()
+                cual = m.lastindex
+                if cual == ENTERO:
+                    self.lexpos = pos
+                    yield Token('NUMERO_ENTERO', int(valor), lineno, inicio)
+                elif cual == REAL:
+                    self.lexpos = pos
+                    yield Token('NUMERO_REAL', float(valor.replace(',', '.')), lineno, inicio)
+                else:
+                    tok = self._delegar(reglas.t_NUMERO_PEGADO_A_LETRA, 'NUMERO_PEGADO_A_LETRA',
+                                        valor, lineno, inicio, pos)
+                    pos, lineno = self.lexpos, self.lineno
+                    if tok is not None:
+                        yield tok
+            elif clase == BARRA:
+                siguiente = lexdata[pos + 1:pos + 2]
+                if siguiente == '/':
+                    # Comentario hasta el fin de la línea (el salto no se consume)
+                    pos = lexdata.find('\n', pos)
+                    if pos < 0:
+                        pos = fin
+                    continue
+                if siguiente == '*':
+                    cierre = lexdata.find('*/', pos + 2)
+                    if cierre >= 0:
+                        pos = cierre + 2    # Como en PLY, no cuenta las líneas de adentro
+                        continue
+                pos += 1
+                self.lexpos = pos
+                yield Token('DIVIDIDO', '/', lineno, pos - 1)
+            elif clase == COMILLA and (m := _CADENA(lexdata, pos)) is not None:
+                inicio, pos = pos, m.end()
+                self.lexpos = pos
+                yield Token('CADENA_TEXTO', lexdata[inicio + 1:pos - 1], lineno, inicio)
+            else:
+                # Comillas sin cerrar y todo lo raro: expresión maestra de PLY
+                m = _MAESTRA(lexdata, pos)
+                if m is None:
+                    # Solo el carácter ilegal: t_error no mira más allá de t.value[0]
+                    tok = self._delegar(reglas.t_error, 'error', lexdata[pos:pos + 1],
+                                        lineno, pos, pos)
+                    if self.lexpos == pos:
+                        raise RuntimeError(f"Carácter ilegal sin saltar en la posición {pos}")
+                else:
+                    funcion, tipo = _ACCIONES[m.lastgroup]
+                    if funcion is None:
+                        tok = Token(tipo, m.group(), lineno, pos)
+                        self.lexpos = m.end()
+                    else:
+                        tok = self._delegar(funcion, tipo, m.group(), lineno, pos, m.end())
+                pos, lineno = self.lexpos, self.lineno
+                if tok is not None:
+                    yield tok
+
+        self.lexpos = pos + 1     # Igual que PLY al llegar al final
+        self.lineno = lineno
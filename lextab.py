@@ -0,0 +1,11 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('CADENA_TEXTO', 'CAPTURA', 'COMA', 'DIVIDIDO', 'ENTERO', 'IDENTIFICADOR', 'IGUAL', 'MAS', 'MENOS', 'MENSAJE', 'NUMERO_ENTERO', 'NUMERO_REAL', 'PARENTESIS_DER', 'PARENTESIS_IZQ', 'POR', 'PUNTO', 'PUNTO_Y_COMA', 'REAL', 'TEXTO'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_NUMERO_PEGADO_A_LETRA>\\d+[a-zA-Z_][a-zA-Z0-9_]*)|(?P<t_IDENTIFICADOR>[a-zA-Z_][a-zA-Z0-9_]*)|(?P<t_NUMERO_REAL>\\d+,\\d+)|(?P<t_NUMERO_ENTERO>\\d+)|(?P<t_CADENA_TEXTO>\\"([^\\\\\\n]|(\\\\.))*?\\")|(?P<t_COMENTARIO_SIMPLE>//.*)|(?P<t_COMENTARIO_MULTILINEA>/\\*[\\s\\S]*?\\*/)|(?P<t_nueva_linea>\\n+)|(?P<t_MAS>\\+)|(?P<t_PARENTESIS_DER>\\))|(?P<t_PARENTESIS_IZQ>\\()|(?P<t_POR>\\*)|(?P<t_PUNTO>\\.)|(?P<t_COMA>,)|(?P<t_DIVIDIDO>/)|(?P<t_IGUAL>=)|(?P<t_MENOS>-)|(?P<t_PUNTO_Y_COMA>;)', [None, ('t_NUMERO_PEGADO_A_LETRA', 'NUMERO_PEGADO_A_LETRA'), ('t_IDENTIFICADOR', 'IDENTIFICADOR'), ('t_NUMERO_REAL', 'NUMERO_REAL'), ('t_NUMERO_ENTERO', 'NUMERO_ENTERO'), ('t_CADENA_TEXTO', 'CADENA_TEXTO'), None, None, ('t_COMENTARIO_SIMPLE', 'COMENTARIO_SIMPLE'), ('t_COMENTARIO_MULTILINEA', 'COMENTARIO_MULTILINEA'), ('t_nueva_linea', 'nueva_linea'), (None, 'MAS'), (None, 'PARENTESIS_DER'), (None, 'PARENTESIS_IZQ'), (None, 'POR'), (None, 'PUNTO'), (None, 'COMA'), (None, 'DIVIDIDO'), (None, 'IGUAL'), (None, 'MENOS'), (None, 'PUNTO_Y_COMA')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
+_firma = '0b2692c6fbcfc91eabb88fd7c872924fa226ad02c9c79c509a0dd5d4b0ded19e'
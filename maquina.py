@@ -0,0 +1,594 @@
+"""Código de bytecode y máquina de pila para programas Costeñol ya validados.
+
+Compilador.compilar(codigo) analiza el programa y, si no tiene errores, traduce las
+sentencias a un flujo lineal de instrucciones (pares opcode, argumento en un array de
+enteros) con las variables en posiciones fijas. El Programa resultante se ejecuta
+tantas veces como se quiera, sin volver a recorrer el árbol:
+
+    programa = Compilador().compilar(codigo)['programa']
+    programa.ejecutar(entradas=['7', '2,5'])   # -> lista con lo que mostró Mensaje.Texto
+
+Programa.interpretar() corre el bytecode en la máquina de pila, instrucción por
+instrucción (antes lo decodifica una vez, fundiendo las secuencias más comunes); así un
+programa compilado corre cerca del doble de rápido que recorriendo el árbol (ver
+benchmarks/maquina_virtual.py). Programa.ejecutar() va más allá: la primera vez traduce
+el bytecode a una función de Python (las variables pasan a ser variables locales) y de
+ahí en adelante solo la llama, sin bucle de despacho. Programa.ejecutar_lote() corre esa
+misma función con una columna de NumPy por cada Captura, para muchas filas de entradas
+a la vez.
+
+A diferencia del análisis, que guarda las expresiones y las evalúa al mostrarlas, aquí
+cada asignación se evalúa en su momento con los valores que hay (como en cualquier
+lenguaje imperativo). Captura lee la siguiente entrada y la convierte al tipo pedido;
+sin entradas devuelve su parámetro, igual que el análisis. Una división por cero da
+un valor no evaluable (NaN) que se arrastra por las operaciones y Mensaje.Texto lo
+muestra como "[operación no evaluable]". Mensaje.Texto(5) muestra 5, no el texto del
+nodo que muestra el análisis.
+"""
+import math
+from array import array
+from functools import partial
+
+try:
+    import numpy as np
+except ImportError:
+    np = None       # Sin NumPy no hay ejecución por lotes (Programa.ejecutar_lote)
+
+from nodos import NUMERO, CADENA, VARIABLE, CAPTURAR, OPERACION_BINARIA, DECLARAR, ASIGNAR, Nodo
+
+# ----------------------- INSTRUCCIONES -----------------------------
+# Máquina de acumulador con pila: el valor en curso vive en una variable local y solo se
+# apila cuando el operando derecho de una operación es a su vez una operación. Cada
+# operación aritmética trae su operando derecho (variable, constante o tope de la pila)
+# en el opcode, así una hoja no cuesta una instrucción aparte.
+CARGAR_VARIABLE = 0     # acumulador = variables[arg]
+CARGAR_CONSTANTE = 1    # acumulador = constantes[arg]
+SUMAR = 2               # Operaciones: base + modo del operando derecho
+RESTAR = 5
+MULTIPLICAR = 8
+DIVIDIR = 11
+APILAR = 14             # Apila el acumulador
+GUARDAR = 15            # variables[arg] = acumulador
+MOSTRAR = 16            # Manda el acumulador a la salida
+CAPTURAR_VALOR = 17     # acumulador (el parámetro) = entrada leída; arg es el tipo
+
+# Modo del operando derecho: se suma a la base de la operación
+CON_VARIABLE, CON_CONSTANTE, CON_PILA = 0, 1, 2     # Con la pila: tope <op> acumulador
+
+OPERACIONES = {'+': SUMAR, '-': RESTAR, '*': MULTIPLICAR, '/': DIVIDIR}
+NOMBRES = ['CARGAR', 'CARGAR']
+for _nombre in ('SUMAR', 'RESTAR', 'MULTIPLICAR', 'DIVIDIR'):
+    NOMBRES += [_nombre, _nombre, _nombre + '_PILA']
+NOMBRES += ['APILAR', 'GUARDAR', 'MOSTRAR', 'CAPTURAR']
+TIPOS_CAPTURA = ('Entero', 'Real', 'Texto')
+SIMBOLOS = {SUMAR: '+', RESTAR: '-', MULTIPLICAR: '*'}
+
+# ⭐ Instrucciones de interpretar(): _decodificar() pasa el bytecode una vez a estas. En
+# Python cada vuelta del bucle de despacho cuesta más que la operación que hace, así que
+# las secuencias más comunes se funden en una sola instrucción (superinstrucciones) y las
+# constantes van en los registros, después de las variables: un operando hoja siempre es
+# registros[arg]. Las cuatro operaciones van seguidas en cada grupo (base + 0..3).
+M_OPERAR = 0            # acumulador <op>= registros[arg]
+M_CARGAR_OPERAR = 4     # arg (a, b): acumulador = registros[a] <op> registros[b]
+M_APILAR_OPERAR = 8     # Apila el acumulador y sigue como M_CARGAR_OPERAR
+M_OPERAR_PILA = 12      # acumulador = tope <op> acumulador
+M_CARGAR = 16           # acumulador = registros[arg]
+M_APILAR_CARGAR = 17    # Apila el acumulador; acumulador = registros[arg]
+M_GUARDAR = 18          # registros[arg] = acumulador
+M_GUARDAR_CARGAR = 19   # arg (a, b): registros[a] = acumulador; acumulador = registros[b]
+M_APILAR = 20
+M_MOSTRAR = 21
+M_CAPTURAR = 22         # arg (tipo, línea)
+M_DESCONOCIDA = 23      # arg (línea, opcode)
+
+# Más anidamiento que esto en una expresión traducida va a una variable temporal (el
+# parser de Python no acepta paréntesis anidados sin límite)
+PROFUNDIDAD_TRADUCCION = 40
+
+NO_EVALUABLE = math.nan
+
+class ErrorEjecucion(Exception):
+    """Error al ejecutar un programa (entrada inválida o que falta)"""
+
+    def __init__(self, linea, mensaje):
+        super().__init__(mensaje)
+        self.linea = linea
+
+def formatear_valor(valor):
+    """Texto que muestra Mensaje.Texto para un valor (igual que obtener_valor_expresion)"""
+    if isinstance(valor, float):
+        if math.isnan(valor):
+            return "[operación no evaluable]"
+        if math.isfinite(valor) and valor == int(valor):
+            return str(int(valor))
+    return str(valor)
+
+def dividir(dividendo, divisor):
+    """División de Costeñol: por cero da un valor no evaluable"""
+    return dividendo / divisor if divisor else NO_EVALUABLE
+
+def convertir_entrada(tipo, valor):
+    """Convierte una entrada de Captura al tipo pedido ('Entero', 'Real' o 'Texto')"""
+    if tipo == 'Texto':
+        return valor if isinstance(valor, str) else formatear_valor(valor)
+    if isinstance(valor, str):
+        texto = valor.strip()
+        # Los reales se escriben con coma, como en el código
+        return int(texto) if tipo == 'Entero' else float(texto.replace(',', '.'))
+    if tipo == 'Entero' and valor != int(valor):
+        raise ValueError(valor)
+    return int(valor) if tipo == 'Entero' else valor
+
+# ----------------------- PROGRAMA -----------------------------
+class Programa:
+    """Bytecode de un programa: instrucciones, constantes y nombres de las variables"""
+    __slots__ = ('codigo', 'lineas', 'constantes', 'variables', '_funcion', '_instrucciones')
+
+    def __init__(self, codigo, lineas, constantes, variables):
+        self.codigo = codigo            # array('i') de pares (opcode, argumento)
+        self.lineas = lineas            # array('i'): línea de cada instrucción
+        self.constantes = constantes    # Tupla de valores
+        self.variables = variables      # Tupla de nombres, por posición
+        self._funcion = None            # Traducción a Python, al ejecutar por primera vez
+        self._instrucciones = None      # Instrucciones M_*, al interpretar por primera vez
+
+    def __len__(self):
+        return len(self.codigo) // 2
+
+    def desensamblar(self):
+        """Listado legible de las instrucciones"""
+        filas = []
+        for i in range(0, len(self.codigo), 2):
+            op, arg = self.codigo[i], self.codigo[i + 1]
+            modo = op if op < SUMAR else (op - SUMAR) % 3 if op < APILAR else None
+            if modo == CON_VARIABLE or op == GUARDAR:
+                detalle = self.variables[arg]
+            elif modo == CON_CONSTANTE:
+                detalle = repr(self.constantes[arg])
+            elif op == CAPTURAR_VALOR:
+                detalle = TIPOS_CAPTURA[arg]
+            else:
+                detalle = ''
+            filas.append(f"{self.lineas[i // 2]:>5} {i // 2:>6}  {NOMBRES[op]:<16}{detalle}")
+        return '\n'.join(filas)
+
+    def ejecutar(self, entradas=None, salida=None):
+        """Ejecuta el programa; 'entradas' alimenta a Captura (textos o números)
+
+        Lo que muestra Mensaje.Texto se pasa a 'salida' (una función) o, si no se da,
+        se retorna como lista.
+        """
+        if self._funcion is None:
+            self._funcion = self._traducir()
+        mostrados = None
+        if salida is None:
+            mostrados = []
+            salida = mostrados.append
+        if entradas is None:
+            capturar = _sin_entrada
+        else:
+            siguiente = iter(entradas).__next__
+            capturar = lambda parametro, tipo, linea: self._capturar(siguiente, tipo, linea)
+        self._funcion(capturar, salida, dividir, formatear_valor)
+        return mostrados
+
+    def ejecutar_lote(self, columnas, filas=None):
+        """Ejecuta el programa para muchas filas de entradas a la vez (necesita NumPy)
+
+        'columnas' trae una columna por cada Captura, en el orden en que se ejecutan: una
+        secuencia de arreglos 1-D o un arreglo 2-D de filas × capturas. Las operaciones se
+        hacen sobre columnas enteras; una división por cero solo deja no evaluables las
+        filas donde el divisor es cero. Retorna un arreglo de textos de filas × mensajes:
+        la fila i es lo que mostraría ejecutar() con las entradas de la fila i. Los Entero
+        van en int64 (con desborde, a diferencia de los enteros de Python).
+        """
+        if np is None:
+            raise RuntimeError("La ejecución por lotes necesita NumPy (pip install numpy)")
+        if isinstance(columnas, np.ndarray) and columnas.ndim == 2:
+            columnas = columnas.T
+        columnas = list(columnas)
+        if filas is None:
+            filas = len(columnas[0]) if columnas else 1
+        if self._funcion is None:
+            self._funcion = self._traducir()
+
+        siguiente = iter(columnas).__next__
+
+        def capturar(parametro, tipo, linea):
+            return self._capturar(siguiente, tipo, linea, convertir=partial(_convertir_columna, filas))
+
+        mostrados = []
+        self._funcion(capturar, mostrados.append, _dividir_filas, partial(_formatear_filas, filas))
+        salida = np.empty((filas, len(mostrados)), dtype=object)
+        for j, columna in enumerate(mostrados):
+            salida[:, j] = columna
+        return salida
+
+    def interpretar(self, entradas=None, salida=None):
+        """Como ejecutar(), pero corriendo el bytecode en la máquina de pila"""
+        if self._instrucciones is None:
+            self._instrucciones = self._decodificar()
+        registros = [None] * len(self.variables)
+        registros += self.constantes
+        pila = []
+        apilar = pila.append
+        sacar = pila.pop
+        mostrados = None
+        if salida is None:
+            mostrados = []
+            salida = mostrados.append
+        siguiente = iter(entradas).__next__ if entradas is not None else None
+
+        acumulador = None
+        # ⭐ Despacho por rangos, con los grupos más frecuentes primero. El código no tiene
+        # saltos, así que se recorre con un for (sin contador de programa)
+        for op, arg in self._instrucciones:
+            if op < M_CARGAR_OPERAR:
+                if op == M_OPERAR:
+                    acumulador += registros[arg]
+                elif op == M_OPERAR + 1:
+                    acumulador -= registros[arg]
+                elif op == M_OPERAR + 2:
+                    acumulador *= registros[arg]
+                else:
+                    divisor = registros[arg]
+                    acumulador = acumulador / divisor if divisor else NO_EVALUABLE
+            elif op < M_OPERAR_PILA:
+                if op >= M_APILAR_OPERAR:
+                    apilar(acumulador)
+                    op -= M_APILAR_OPERAR - M_CARGAR_OPERAR
+                izq, der = arg
+                if op == M_CARGAR_OPERAR:
+                    acumulador = registros[izq] + registros[der]
+                elif op == M_CARGAR_OPERAR + 1:
+                    acumulador = registros[izq] - registros[der]
+                elif op == M_CARGAR_OPERAR + 2:
+                    acumulador = registros[izq] * registros[der]
+                else:
+                    divisor = registros[der]
+                    acumulador = registros[izq] / divisor if divisor else NO_EVALUABLE
+            elif op < M_CARGAR:
+                if op == M_OPERAR_PILA:
+                    acumulador = sacar() + acumulador
+                elif op == M_OPERAR_PILA + 1:
+                    acumulador = sacar() - acumulador
+                elif op == M_OPERAR_PILA + 2:
+                    acumulador = sacar() * acumulador
+                else:
+                    divisor = acumulador
+                    acumulador = sacar() / divisor if divisor else NO_EVALUABLE
+            elif op < M_APILAR:
+                if op == M_GUARDAR_CARGAR:
+                    destino, origen = arg
+                    registros[destino] = acumulador
+                    acumulador = registros[origen]
+                elif op == M_CARGAR:
+                    acumulador = registros[arg]
+                elif op == M_GUARDAR:
+                    registros[arg] = acumulador
+                else:
+                    apilar(acumulador)
+                    acumulador = registros[arg]
+            elif op == M_APILAR:
+                apilar(acumulador)
+            elif op == M_MOSTRAR:
+                salida(formatear_valor(acumulador))
+            elif op == M_CAPTURAR:
+                if siguiente is not None:
+                    acumulador = self._capturar(siguiente, *arg)
+            else:
+                raise ErrorEjecucion(arg[0], f"Instrucción desconocida: {arg[1]}")
+        return mostrados
+
+    def _decodificar(self):
+        """Las instrucciones de interpretar() (M_*) como pares (instrucción, argumento)
+
+        Leer del array crea un int por cada acceso; aquí se arman una vez. Una constante
+        pasa a ser su registro; CARGAR se funde con el APILAR o GUARDAR que la precede y
+        una operación con hoja, con el CARGAR (o APILAR + CARGAR) que la precede.
+        """
+        codigo, lineas = self.codigo, self.lineas
+        primera_constante = len(self.variables)
+        instrucciones = []
+        previa = None           # Instrucción M_* anterior, para fundirla con la actual
+        for i in range(0, len(codigo), 2):
+            op, arg = codigo[i], codigo[i + 1]
+            if op < APILAR:
+                modo = op if op < SUMAR else (op - SUMAR) % 3
+                if modo == CON_CONSTANTE:
+                    arg += primera_constante
+                if op < SUMAR:
+                    if previa == M_APILAR:
+                        instrucciones.pop()
+                        m = M_APILAR_CARGAR
+                    elif previa == M_GUARDAR:
+                        m, arg = M_GUARDAR_CARGAR, (instrucciones.pop()[1], arg)
+                    else:
+                        m = M_CARGAR
+                elif modo == CON_PILA:
+                    m = M_OPERAR_PILA + (op - SUMAR) // 3
+                elif previa == M_CARGAR or previa == M_APILAR_CARGAR:
+                    base = M_CARGAR_OPERAR if previa == M_CARGAR else M_APILAR_OPERAR
+                    m, arg = base + (op - SUMAR) // 3, (instrucciones.pop()[1], arg)
+                else:
+                    m = M_OPERAR + (op - SUMAR) // 3
+            elif op == APILAR:
+                m = M_APILAR
+            elif op == GUARDAR:
+                m = M_GUARDAR
+            elif op == MOSTRAR:
+                m = M_MOSTRAR
+            elif op == CAPTURAR_VALOR:
+                m, arg = M_CAPTURAR, (TIPOS_CAPTURA[arg], lineas[i // 2])
+            else:
+                m, arg = M_DESCONOCIDA, (lineas[i // 2], op)
+            instrucciones.append((m, arg))
+            previa = m
+        return instrucciones
+
+    def _capturar(self, siguiente, tipo, linea, convertir=convertir_entrada):
+        try:
+            valor = siguiente()
+        except StopIteration:
+            raise ErrorEjecucion(linea, f"¡Ombe! Captura.{tipo} en la línea {linea} "
+                                        f"no tiene entrada, se acabaron los datos.") from None
+        try:
+            return convertir(tipo, valor)
+        except (ValueError, TypeError, OverflowError) as e:
+            malo = e.args[0] if isinstance(e, _EntradaInvalida) else valor
+            raise ErrorEjecucion(linea, f"¡Nojoda! Captura.{tipo} en la línea {linea} "
+                                        f"esperaba un {tipo} y le llegó '{malo}'") from None
+
+    def _traducir(self):
+        """Traduce el bytecode a una función de Python equivalente
+
+        Recorre las instrucciones con una pila de textos en vez de valores. Cada valor es
+        (texto, profundidad, efectos); uno con Captura adentro se guarda en una temporal
+        antes de apilarlo, para que las entradas se lean en el mismo orden que en la máquina.
+        Cada variable se borra después de su última lectura: con lotes, cada una es un
+        arreglo con una fila por entrada.
+        """
+        codigo, constantes = self.codigo, self.constantes
+        ultimo_uso = {}
+        for i in range(0, len(codigo), 2):
+            op = codigo[i]
+            if op < APILAR and (op if op < SUMAR else (op - SUMAR) % 3) == CON_VARIABLE:
+                ultimo_uso[codigo[i + 1]] = i
+        cuerpo = []
+        temporales = 0
+        leidas = set()          # Variables y temporales que usa la sentencia en curso
+        vivas = set()
+
+        def guardar(texto):
+            nonlocal temporales
+            nombre = f"t{temporales}"
+            temporales += 1
+            cuerpo.append(f"    {nombre} = {texto}")
+            leidas.add(nombre)
+            return nombre
+
+        def operando(modo, arg):
+            if modo == CON_VARIABLE:
+                leidas.add(arg)
+                return f"v{arg}", 0, False
+            return f"k[{arg}]", 0, False
+
+        def liberar(i):
+            """Borra lo que la sentencia que termina en la instrucción i ya no necesita"""
+            muertas = [f"v{s}" if isinstance(s, int) else s for s in leidas
+                       if not isinstance(s, int) or (ultimo_uso[s] <= i and s in vivas)]
+            vivas.difference_update(s for s in leidas if isinstance(s, int) and ultimo_uso[s] <= i)
+            leidas.clear()
+            if muertas:
+                cuerpo.append(f"    del {', '.join(sorted(muertas))}")
+
+        acumulador = None
+        pila = []
+        for i in range(0, len(codigo), 2):
+            op, arg = codigo[i], codigo[i + 1]
+            if op < SUMAR:
+                acumulador = operando(op, arg)
+            elif op < APILAR:
+                base, modo = divmod(op - SUMAR, 3)
+                base = SUMAR + base * 3
+                if modo == CON_PILA:
+                    izq, der = pila.pop(), acumulador
+                else:
+                    izq, der = acumulador, operando(modo, arg)
+                if base == DIVIDIR:
+                    texto = f"dividir({izq[0]}, {der[0]})"
+                else:
+                    texto = f"({izq[0]} {SIMBOLOS[base]} {der[0]})"
+                acumulador = (texto, max(izq[1], der[1]) + 1, izq[2] or der[2])
+                if acumulador[1] > PROFUNDIDAD_TRADUCCION:
+                    acumulador = (guardar(texto), 0, False)
+            elif op == APILAR:
+                if acumulador[2]:
+                    acumulador = (guardar(acumulador[0]), 0, False)
+                pila.append(acumulador)
+            elif op == GUARDAR:
+                cuerpo.append(f"    v{arg} = {acumulador[0]}")
+                vivas.add(arg)
+                if ultimo_uso.get(arg, -1) < i:
+                    leidas.add(arg)       # Nadie la lee después: se borra enseguida
+                    ultimo_uso[arg] = i
+                liberar(i)
+            elif op == MOSTRAR:
+                cuerpo.append(f"    mostrar(formatear({acumulador[0]}))")
+                liberar(i)
+            elif op == CAPTURAR_VALOR:
+                texto = f"capturar({acumulador[0]}, {TIPOS_CAPTURA[arg]!r}, {self.lineas[i // 2]})"
+                acumulador = (texto, acumulador[1] + 1, True)
+                if acumulador[1] > PROFUNDIDAD_TRADUCCION:
+                    # Lo apilado con efectos ya está en temporales: leerla ahora no cambia el orden
+                    acumulador = (guardar(texto), 0, False)
+
+        # Las constantes se leen de la tupla (k, local por ser parámetro): repr() de un
+        # Real infinito o NaN no es código de Python válido
+        fuente = '\n'.join(['def _programa(capturar, mostrar, dividir, formatear, k=k):', *cuerpo, '    pass'])
+        espacio = {'k': constantes}
+        exec(compile(fuente, '<costeñol>', 'exec'), espacio)
+        return espacio['_programa']
+
+def _sin_entrada(parametro, tipo, linea):
+    """Captura sin entradas: devuelve su parámetro, como el análisis"""
+    return parametro
+
+# ----------------------- EJECUCIÓN POR LOTES -----------------------------
+# Los valores son escalares de Python (lo que no depende de ninguna Captura) o arreglos
+# con una fila por entrada; + - * de NumPy ya operan fila a fila.
+
+class _EntradaInvalida(ValueError):
+    """El valor de una columna que no se pudo convertir"""
+
+def _convertir_columna(filas, tipo, columna):
+    """Columna de entradas convertida al tipo de la Captura"""
+    arreglo = np.asarray(columna)
+    if arreglo.shape != (filas,):
+        raise ValueError(f"La columna de Captura.{tipo} tiene forma {arreglo.shape}, se esperaban {filas} filas")
+    texto = arreglo.dtype.kind in 'OU'
+    if tipo == 'Texto':
+        return arreglo.astype(object) if arreglo.dtype.kind == 'U' else _texto_arreglo(arreglo)
+    try:
+        if texto:
+            limpio = np.char.strip(arreglo.astype(str))
+            if tipo == 'Entero':
+                return limpio.astype(np.int64)
+            return np.char.replace(limpio, ',', '.').astype(np.float64)
+        if tipo == 'Entero':
+            if arreglo.dtype.kind == 'f' and not np.all(arreglo == np.trunc(arreglo)):
+                raise ValueError()
+            return arreglo.astype(np.int64)
+        return arreglo.astype(np.float64)
+    except (ValueError, TypeError, OverflowError):
+        # Se busca el primer valor malo para el mensaje
+        for valor in arreglo.tolist():
+            try:
+                convertir_entrada(tipo, valor)
+            except (ValueError, TypeError, OverflowError):
+                raise _EntradaInvalida(valor) from None
+        raise
+
+def _dividir_filas(dividendo, divisor):
+    """División fila a fila: solo las filas con divisor cero quedan no evaluables"""
+    if not isinstance(divisor, np.ndarray):
+        if not isinstance(dividendo, np.ndarray):
+            return dividir(dividendo, divisor)
+        return dividendo / divisor if divisor else np.full(dividendo.shape, NO_EVALUABLE)
+    resultado = np.full(np.broadcast(dividendo, divisor).shape, NO_EVALUABLE)
+    np.divide(dividendo, divisor, out=resultado, where=divisor != 0)
+    return resultado
+
+if np is not None:
+    _formatear_arreglo = np.frompyfunc(formatear_valor, 1, 1)
+    _texto_arreglo = np.frompyfunc(partial(convertir_entrada, 'Texto'), 1, 1)
+
+def _formatear_filas(filas, valor):
+    """Textos de Mensaje.Texto para cada fila"""
+    if isinstance(valor, np.ndarray):
+        return _formatear_arreglo(valor)
+    return np.full(filas, formatear_valor(valor), dtype=object)
+
+# ----------------------- GENERACIÓN DE CÓDIGO -----------------------------
+class _Generador:
+    """Traduce sentencias validadas a instrucciones"""
+
+    def __init__(self):
+        self.codigo = array('i')
+        self.lineas = array('i')
+        self.constantes = []
+        self.indice_constantes = {}
+        self.posiciones = {}        # Nombre de variable -> posición
+
+    def emitir(self, op, arg, linea):
+        self.codigo.append(op)
+        self.codigo.append(arg)
+        self.lineas.append(linea)
+
+    def constante(self, valor):
+        # El tipo va en la clave: 1 y 1.0 son iguales para un dict pero se muestran distinto
+        clave = (type(valor), valor)
+        indice = self.indice_constantes.get(clave)
+        if indice is None:
+            indice = self.indice_constantes[clave] = len(self.constantes)
+            self.constantes.append(valor)
+        return indice
+
+    def posicion(self, nombre):
+        posicion = self.posiciones.get(nombre)
+        if posicion is None:
+            posicion = self.posiciones[nombre] = len(self.posiciones)
+        return posicion
+
+    def operando(self, nodo):
+        """Modo y argumento de una hoja (variable o constante); None si no es hoja"""
+        clase = nodo.clase
+        if clase == VARIABLE:
+            return CON_VARIABLE, self.posicion(nodo.nombre)
+        if clase == NUMERO or clase == CADENA:
+            return CON_CONSTANTE, self.constante(nodo.valor)
+        return None
+
+    def expresion(self, expresion, linea):
+        """Emite el código que deja la expresión en el acumulador
+
+        Usa una pila propia en vez de recursión. Si el operando derecho es una hoja va
+        dentro de la operación; si no, se apila el izquierdo y se calcula el derecho.
+        """
+        pendientes = [(expresion, False)]
+        while pendientes:
+            nodo, listo = pendientes.pop()
+            if nodo is None:
+                self.emitir(APILAR, 0, linea)
+                continue
+            clase = nodo.clase
+            if clase == OPERACION_BINARIA:
+                base = OPERACIONES[nodo.op]
+                hoja = self.operando(nodo.der)
+                if listo:
+                    if hoja is None:
+                        self.emitir(base + CON_PILA, 0, linea)
+                    else:
+                        self.emitir(base + hoja[0], hoja[1], linea)
+                    continue
+                pendientes.append((nodo, True))
+                if hoja is None:
+                    pendientes.append((nodo.der, False))
+                    pendientes.append((None, True))     # APILAR entre los dos operandos
+                pendientes.append((nodo.izq, False))
+            elif clase == CAPTURAR:
+                if listo:
+                    self.emitir(CAPTURAR_VALOR, TIPOS_CAPTURA.index(nodo.tipo), linea)
+                else:
+                    pendientes.append((nodo, True))
+                    pendientes.append((nodo.parametro, False))
+            else:
+                hoja = self.operando(nodo)
+                if hoja is None:
+                    raise ValueError(f"No se puede compilar la expresión {nodo!r}")
+                self.emitir(CARGAR_VARIABLE + hoja[0], hoja[1], linea)
+
+    def sentencia(self, sentencia, linea):
+        clase = sentencia.clase
+        if clase == DECLARAR:
+            self.posicion(sentencia.nombre)     # Solo reserva la posición
+        elif clase == ASIGNAR:
+            self.expresion(sentencia.expresion, linea)
+            self.emitir(GUARDAR, self.posicion(sentencia.nombre), linea)
+        else:
+            valor = sentencia.valor
+            if isinstance(valor, Nodo):
+                self.expresion(valor, linea)
+            else:
+                self.emitir(CARGAR_CONSTANTE, self.constante(valor), linea)
+            self.emitir(MOSTRAR, 0, linea)
+
+def compilar_programa(sentencias):
+    """Programa para una lista de pares (sentencia, línea) sin errores"""
+    generador = _Generador()
+    for sentencia, linea in sentencias:
+        generador.sentencia(sentencia, linea)
+    variables = [None] * len(generador.posiciones)
+    for nombre, posicion in generador.posiciones.items():
+        variables[posicion] = nombre
+    return Programa(generador.codigo, generador.lineas, tuple(generador.constantes), tuple(variables))
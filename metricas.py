@@ -0,0 +1,174 @@
+import time
+import tracemalloc
+from functools import partial
+
+# ------------------- INSTRUMENTACIÓN DEL ANÁLISIS -------------------
+# Solo existe mientras dura un análisis con Compilador(medir=True): instala envolturas
+# sobre la instancia (tipos, evaluación, acciones del parser) y las quita al terminar,
+# así que con la medición apagada el compilador corre exactamente el mismo código.
+
+class Medicion:
+    """Tiempos por fase y contadores de un análisis"""
+
+    def __init__(self, compilador, memoria=False):
+        self.compilador = compilador
+        self.memoria = memoria
+        self.tokens = 0
+        self.reducciones = 0
+        self.evaluaciones = 0
+        self.pared = {'lexico': 0.0, 'sintactico': 0.0, 'semantico': 0.0}
+        self.cpu = {'lexico': 0.0, 'sintactico': 0.0, 'semantico': 0.0}
+        self._profundidad = 0
+        self._producciones = []
+        self._detener_memoria = False
+        self._memoria_inicial = 0
+        self._tokenizado_antes = False
+        self._detenida = False
+        self._parser_pared = None
+        self.memoria_pico = None
+
+        if memoria:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                self._detener_memoria = True
+            self._memoria_inicial = tracemalloc.get_traced_memory()[0]
+
+        self._instalar()
+        self._inicio_pared = time.perf_counter()
+        self._inicio_cpu = time.process_time()
+
+    # ---------------- ENVOLTURAS ----------------
+    def _instalar(self):
+        compilador = self.compilador
+        # Atributos de la instancia: tapan a los métodos de la clase, también en la recursión
+        compilador.obtener_tipo_expresion = partial(
+            self._semantico, type(compilador).obtener_tipo_expresion.__get__(compilador), False)
+        compilador.obtener_valor_expresion = partial(
+            self._semantico, type(compilador).obtener_valor_expresion.__get__(compilador), True)
+        compilador.evaluar_operacion = partial(
+            self._semantico, type(compilador).evaluar_operacion.__get__(compilador), True)
+
+        for produccion in compilador.parser.productions:
+            if produccion.callable is not None:
+                self._producciones.append((produccion, produccion.callable))
+                produccion.callable = partial(self._reducir, produccion.callable)
+
+    def detener(self):
+        """Cierra los relojes y devuelve el compilador a su estado normal (idempotente)"""
+        if self._detenida:
+            return
+        self._detenida = True
+        if self._parser_pared is not None:
+            self.terminar_parser()      # El parser se cortó con una excepción
+        self.pared_total = time.perf_counter() - self._inicio_pared
+        self.cpu_total = time.process_time() - self._inicio_cpu
+        if self.memoria:
+            self.memoria_pico = max(0, tracemalloc.get_traced_memory()[1] - self._memoria_inicial)
+            if self._detener_memoria:
+                tracemalloc.stop()
+
+        compilador = self.compilador
+        for nombre in ('obtener_tipo_expresion', 'obtener_valor_expresion', 'evaluar_operacion'):
+            compilador.__dict__.pop(nombre, None)
+        for produccion, original in self._producciones:
+            produccion.callable = original
+        self._producciones = []
+
+    def _reducir(self, accion, t):
+        self.reducciones += 1
+        return accion(t)
+
+    def _semantico(self, metodo, es_evaluacion, expresion):
+        if es_evaluacion:
+            self.evaluaciones += 1
+        # Solo se mide la llamada más externa: las recursivas ya quedan adentro
+        if self._profundidad:
+            return metodo(expresion)
+        self._profundidad = 1
+        pared, cpu = time.perf_counter(), time.process_time()
+        try:
+            return metodo(expresion)
+        finally:
+            self.pared['semantico'] += time.perf_counter() - pared
+            self.cpu['semantico'] += time.process_time() - cpu
+            self._profundidad = 0
+
+    # ---------------- FASES ----------------
+    def entrada(self, lexer, codigo, tokenfunc):
+        """Función de tokens para el parser, midiendo el léxico aparte
+
+        Con un texto se tokeniza todo primero (sin reloj por token); con un archivo por
+        bloques se mide cada llamada.
+        """
+        if tokenfunc is None:
+            pared, cpu = time.perf_counter(), time.process_time()
+            lexer.input(codigo)
+            tokens = list(iter(lexer.token, None))
+            self.pared['lexico'] += time.perf_counter() - pared
+            self.cpu['lexico'] += time.process_time() - cpu
+            self.tokens = len(tokens)
+            self._tokenizado_antes = True
+            return partial(next, iter(tokens), None)
+        return partial(self._token_medido, tokenfunc)
+
+    def _token_medido(self, tokenfunc):
+        pared, cpu = time.perf_counter(), time.process_time()
+        token = tokenfunc()
+        self.pared['lexico'] += time.perf_counter() - pared
+        self.cpu['lexico'] += time.process_time() - cpu
+        if token is not None:
+            self.tokens += 1
+        return token
+
+    def iniciar_parser(self):
+        self._parser_pared = time.perf_counter()
+        self._parser_cpu = time.process_time()
+
+    def terminar_parser(self):
+        """El parser incluye las acciones: se le restan el semántico y el léxico medidos adentro"""
+        pared = time.perf_counter() - self._parser_pared
+        cpu = time.process_time() - self._parser_cpu
+        self._parser_pared = None
+        self.pared['sintactico'] = max(0.0, pared - self.pared['semantico'] - self._lexico_en_parser('pared'))
+        self.cpu['sintactico'] = max(0.0, cpu - self.cpu['semantico'] - self._lexico_en_parser('cpu'))
+
+    def _lexico_en_parser(self, reloj):
+        # Con el texto ya tokenizado el parser no gastó tiempo léxico
+        return 0.0 if self._tokenizado_antes else getattr(self, reloj)['lexico']
+
+    def metricas(self):
+        """Diccionario con las métricas del análisis (después de detener())"""
+        metricas = {
+            fase: {'pared': self.pared[fase], 'cpu': self.cpu[fase]}
+            for fase in ('lexico', 'sintactico', 'semantico')
+        }
+        metricas['total'] = {'pared': self.pared_total, 'cpu': self.cpu_total}
+        metricas.update({
+            'tokens': self.tokens,
+            'reducciones': self.reducciones,
+            'evaluaciones': self.evaluaciones,
+            'simbolos': len(self.compilador.tabla_simbolos),
+            'memoria_pico': self.memoria_pico,
+        })
+        return metricas
+
+
+def metricas_acierto(compilador, pared, cpu):
+    """Métricas de un resultado que salió de la caché en disco (ver cache_compilacion.py)
+
+    Mismas claves que Medicion.metricas(): no hubo fases ni contadores, el total es lo
+    que tomó el acierto y 'cache_disco' le dice al gancho que no se analizó.
+    """
+    metricas = {fase: {'pared': 0.0, 'cpu': 0.0} for fase in ('lexico', 'sintactico', 'semantico')}
+    metricas['total'] = {'pared': pared, 'cpu': cpu}
+    metricas.update({
+        'tokens': 0,
+        'reducciones': 0,
+        'evaluaciones': 0,
+        'simbolos': len(compilador.tabla_simbolos),
+        'memoria_pico': None,
+        'cache_disco': 'acierto',
+    })
+    return metricas
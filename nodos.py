@@ -0,0 +1,179 @@
+# ------------------- NODOS DEL ÁRBOL SINTÁCTICO -------------------
+# Cada nodo usa __slots__ y una clase numérica pequeña (antes eran tuplas con etiquetas
+# de texto como ('operacion_binaria', op, izq, der)). ⭐ Los recorridos que pasan por
+# cada nodo despachan por type(nodo) con 'is': leer 'clase' busca el atributo en la
+# clase y cuesta más que el índice de la tupla. 'clase' queda para la forma compacta,
+# para conjuntos como HOJAS y para las comparaciones sueltas.
+
+# Clases de nodo
+NUMERO = 0
+CADENA = 1
+VARIABLE = 2
+ERROR = 3            # Identificador no declarado al momento de usarlo
+CAPTURAR = 4
+OPERACION_BINARIA = 5
+DECLARAR = 6
+ASIGNAR = 7
+MENSAJE_TEXTO = 8
+# Expresiones sin hijos
+HOJAS = frozenset((NUMERO, CADENA, VARIABLE, ERROR))
+
+class Nodo:
+    """Base de todos los nodos del árbol"""
+    __slots__ = ()
+    clase = None
+    etiqueta = None     # Etiqueta de la tupla equivalente del formato anterior
+
+    def como_tupla(self):
+        """Convierte el nodo (y sus hijos) a la tupla etiquetada del formato anterior"""
+        # Postorden con pila propia: un árbol muy profundo no desborda la recursión
+        hechas = []
+        pila = [(self, False)]
+        while pila:
+            nodo, listo = pila.pop()
+            campos = [getattr(nodo, campo) for campo in nodo.__slots__]
+            if not listo:
+                pila.append((nodo, True))
+                pila.extend((valor, False) for valor in reversed(campos) if isinstance(valor, Nodo))
+                continue
+            # Las tuplas de sus hijos son las últimas hechas, en orden
+            inicio = len(hechas) - sum(isinstance(valor, Nodo) for valor in campos)
+            hijos = iter(hechas[inicio:])
+            tupla = (nodo.etiqueta,) + tuple(
+                next(hijos) if isinstance(valor, Nodo) else valor for valor in campos)
+            del hechas[inicio:]
+            hechas.append(tupla)
+        return hechas[0]
+
+    def __str__(self):
+        # ⭐ Se conserva el texto de las tuplas: Mensaje.Texto(5) lo muestra tal cual
+        return str(self.como_tupla())
+
+    def __repr__(self):
+        campos = ', '.join(repr(getattr(self, campo)) for campo in self.__slots__)
+        return f"{type(self).__name__}({campos})"
+
+# ----------------------- EXPRESIONES -----------------------------
+class Numero(Nodo):
+    __slots__ = ('valor',)
+    clase = NUMERO
+    etiqueta = 'numero'
+
+    def __init__(self, valor):
+        self.valor = valor
+
+class Cadena(Nodo):
+    __slots__ = ('valor',)
+    clase = CADENA
+    etiqueta = 'cadena'
+
+    def __init__(self, valor):
+        self.valor = valor
+
+class Variable(Nodo):
+    __slots__ = ('nombre',)
+    clase = VARIABLE
+    etiqueta = 'variable'
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+
+class ErrorVariable(Nodo):
+    __slots__ = ('nombre',)
+    clase = ERROR
+    etiqueta = 'error'
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+
+class Capturar(Nodo):
+    __slots__ = ('tipo', 'parametro')
+    clase = CAPTURAR
+    etiqueta = 'capturar'
+
+    def __init__(self, tipo, parametro):
+        self.tipo = tipo
+        self.parametro = parametro
+
+class OperacionBinaria(Nodo):
+    __slots__ = ('op', 'izq', 'der')
+    clase = OPERACION_BINARIA
+    etiqueta = 'operacion_binaria'
+
+    def __init__(self, op, izq, der):
+        self.op = op
+        self.izq = izq
+        self.der = der
+
+# ----------------------- SENTENCIAS -----------------------------
+class Declarar(Nodo):
+    __slots__ = ('nombre', 'tipo')
+    clase = DECLARAR
+    etiqueta = 'declarar'
+
+    def __init__(self, nombre, tipo):
+        self.nombre = nombre
+        self.tipo = tipo
+
+class Asignar(Nodo):
+    __slots__ = ('nombre', 'expresion')
+    clase = ASIGNAR
+    etiqueta = 'asignar'
+
+    def __init__(self, nombre, expresion):
+        self.nombre = nombre
+        self.expresion = expresion
+
+class MensajeTexto(Nodo):
+    __slots__ = ('valor',)
+    clase = MENSAJE_TEXTO
+    etiqueta = 'mensaje_texto'
+
+    def __init__(self, valor):
+        self.valor = valor    # Texto literal o una expresión
+
+# ----------------------- FORMA COMPACTA -----------------------------
+# Una tupla plana de entradas (clase, campos que no son nodos) en postorden: los hijos
+# van antes que su padre y se toman de una pila al armar. Se guarda con marshal (ver
+# cache_compilacion.py), que no acepta tuplas muy anidadas, y se vuelve a armar sin
+# pasar por el parser ni por la recursión.
+
+def compactar(nodo):
+    """Nodo (y sus hijos) como tupla plana de entradas"""
+    entradas = []
+    pila = [nodo]
+    while pila:
+        actual = pila.pop()
+        if type(actual) is tuple:
+            entradas.append(actual)     # Sus hijos ya salieron
+            continue
+        campos = [getattr(actual, campo) for campo in actual.__slots__]
+        pila.append((actual.clase,) + tuple(valor for valor in campos if not isinstance(valor, Nodo)))
+        pila.extend(reversed([valor for valor in campos if isinstance(valor, Nodo)]))
+    return tuple(entradas)
+
+def expandir(compacto):
+    """Inverso de compactar()"""
+    pila = []
+    for entrada in compacto:
+        pila.append(_ARMAR[entrada[0]](entrada, pila))
+    return pila[-1]
+
+def _armar_operacion(entrada, pila):
+    der = pila.pop()
+    return OperacionBinaria(entrada[1], pila.pop(), der)
+
+# ⭐ Un constructor por clase, con los campos que son nodos ya conocidos: armar el
+# árbol es lo que más cuesta al leer de la caché
+_ARMAR = {
+    NUMERO: lambda entrada, pila: Numero(entrada[1]),
+    CADENA: lambda entrada, pila: Cadena(entrada[1]),
+    VARIABLE: lambda entrada, pila: Variable(entrada[1]),
+    ERROR: lambda entrada, pila: ErrorVariable(entrada[1]),
+    CAPTURAR: lambda entrada, pila: Capturar(entrada[1], pila.pop()),
+    OPERACION_BINARIA: _armar_operacion,
+    DECLARAR: lambda entrada, pila: Declarar(entrada[1], entrada[2]),
+    ASIGNAR: lambda entrada, pila: Asignar(entrada[1], pila.pop()),
+    # El valor de Mensaje.Texto es un texto literal (va en la entrada) o una expresión
+    MENSAJE_TEXTO: lambda entrada, pila: MensajeTexto(entrada[1] if len(entrada) > 1 else pila.pop()),
+}
@@ -0,0 +1,244 @@
+"""Optimización de programas Costeñol ya validados.
+
+optimizar() recibe las sentencias sin errores como pares (sentencia, línea), igual que
+maquina.compilar_programa, y hace tres cosas:
+
+    plegado        una operación entre constantes se reemplaza por su resultado
+                   ('2 * 3' queda como el número 6)
+    propagación    una variable cuyo valor es una constante se reemplaza por esa
+                   constante donde se lee, hasta que se le asigne otra cosa
+    asignaciones   se quita una asignación que nadie lee antes de que se vuelva a
+    muertas        asignar la variable (o antes de que termine el programa)
+
+Sigue la semántica de la ejecución (maquina.py): cada asignación vale lo que vale su
+expresión en ese momento. El análisis es distinto: guarda la expresión y la evalúa al
+mostrarla, así que si 'a' cambia después, 'b = a + 1' también cambia. Por eso
+Compilador(optimizar=True) solo pliega los subárboles sin variables antes de guardar
+el valor en tabla_simbolos (plegar_constantes), y lo demás se hace al compilar:
+
+    respuesta = Compilador().compilar(codigo, optimizar=True)
+    respuesta['optimizacion']   # {'plegadas', 'propagadas', 'eliminadas': [...]}
+
+Una asignación con Captura nunca se quita aunque nadie la lea: leería una entrada
+menos y las siguientes Captura recibirían otra.
+"""
+import math
+
+from cuerdas import Cuerda, concatenar
+from nodos import (NUMERO, CADENA, VARIABLE, CAPTURAR, OPERACION_BINARIA, ASIGNAR, MENSAJE_TEXTO, HOJAS,
+                   Nodo, Numero, Cadena, Capturar, OperacionBinaria, Asignar, MensajeTexto)
+
+# Motivos por los que se quita una asignación
+SOBRESCRITA = 'sobrescrita'     # Se vuelve a asignar antes de leerla
+SIN_LECTURA = 'sin_lectura'     # Nadie la lee de ahí hasta el final
+
+def calcular(op, val_izq, val_der):
+    """Resultado de 'val_izq op val_der' entre constantes, o None si no se puede plegar"""
+    try:
+        if op == '+':
+            resultado = val_izq + val_der
+        elif op == '-':
+            resultado = val_izq - val_der
+        elif op == '*':
+            resultado = val_izq * val_der
+        elif op == '/':
+            if not val_der:
+                return None     # No evaluable: se deja para que se vea igual que antes
+            resultado = val_izq / val_der
+        else:
+            return None
+    except (TypeError, OverflowError):
+        return None
+    if isinstance(resultado, float) and not math.isfinite(resultado):
+        return None
+    return resultado
+
+class Plegador:
+    """Pliega expresiones con una pila propia y lleva la cuenta de lo que cambió
+
+    'constantes' (nombre -> valor) son las variables que se pueden reemplazar por su
+    valor; 'textos' permite plegar 'Texto + Texto'. Nunca modifica un nodo: lo que
+    cambia se arma de nuevo y lo que no, se comparte con la expresión original.
+    """
+    __slots__ = ('constantes', 'textos', 'plegadas', 'propagadas')
+
+    def __init__(self, constantes=None, textos=False):
+        self.constantes = constantes
+        self.textos = textos
+        self.plegadas = 0       # Operaciones reemplazadas por su resultado
+        self.propagadas = 0     # Lecturas de variables reemplazadas por su valor
+
+    def es_constante(self, nodo):
+        clase = nodo.clase
+        return clase == NUMERO or (clase == CADENA and self.textos)
+
+    def plegar(self, expresion):
+        """La expresión con sus constantes plegadas (la misma si no había nada que plegar)"""
+        clase = expresion.clase
+        if clase == NUMERO or clase == CADENA:
+            return expresion
+        constantes = self.constantes
+        # Postorden: (nodo, False) por visitar, (nodo, True) cuando sus hijos ya están
+        # en 'hechos', en orden
+        hechos = []
+        pila = [(expresion, False)]
+        while pila:
+            nodo, listo = pila.pop()
+            clase = nodo.clase
+            if clase == OPERACION_BINARIA:
+                if not listo:
+                    pila.append((nodo, True))
+                    pila.append((nodo.der, False))
+                    pila.append((nodo.izq, False))
+                    continue
+                der = hechos.pop()
+                izq = hechos[-1]
+                if self.es_constante(izq) and self.es_constante(der) and izq.clase == der.clase:
+                    if izq.clase == CADENA:
+                        # Una Cuerda mientras siga sumándose: se arma al terminar la cadena
+                        resultado = concatenar(izq.valor, der.valor) if nodo.op == '+' else None
+                    else:
+                        resultado = calcular(nodo.op, izq.valor, der.valor)
+                    if resultado is not None:
+                        self.plegadas += 1
+                        hechos[-1] = Cadena(resultado) if izq.clase == CADENA else Numero(resultado)
+                        continue
+                izq, der = armar_texto(izq), armar_texto(der)
+                if izq is not nodo.izq or der is not nodo.der:
+                    nodo = OperacionBinaria(nodo.op, izq, der)
+                hechos[-1] = nodo
+            elif clase == CAPTURAR:
+                if not listo:
+                    pila.append((nodo, True))
+                    pila.append((nodo.parametro, False))
+                    continue
+                parametro = armar_texto(hechos[-1])
+                hechos[-1] = nodo if parametro is nodo.parametro else Capturar(nodo.tipo, parametro)
+            elif clase == VARIABLE and constantes is not None and nodo.nombre in constantes:
+                valor = constantes[nodo.nombre]
+                self.propagadas += 1
+                hechos.append(Cadena(valor) if isinstance(valor, str) else Numero(valor))
+            else:
+                hechos.append(nodo)
+        return armar_texto(hechos[0])
+
+def armar_texto(nodo):
+    """Una Cadena cuyo valor quedó como Cuerda, con el texto ya armado"""
+    if nodo.clase == CADENA and type(nodo.valor) is Cuerda:
+        return Cadena(str(nodo.valor))
+    return nodo
+
+def hay_plegables(expresion):
+    """Indica si alguna operación tiene dos constantes como operandos
+
+    Sin una así no hay nada que plegar (todo plegado empieza por una), y revisarlo
+    cuesta mucho menos que el recorrido de Plegador.
+    """
+    pila = [expresion]
+    while pila:
+        nodo = pila.pop()
+        clase = nodo.clase
+        if clase == OPERACION_BINARIA:
+            izq, der = nodo.izq, nodo.der
+            clase_izq = izq.clase
+            if clase_izq == der.clase and (clase_izq == NUMERO or clase_izq == CADENA):
+                return True
+            if clase_izq not in HOJAS:
+                pila.append(izq)
+            if der.clase not in HOJAS:
+                pila.append(der)
+        elif clase == CAPTURAR:
+            pila.append(nodo.parametro)
+    return False
+
+def plegar_constantes(expresion):
+    """Pliega las operaciones entre constantes de una expresión (sin propagar variables)"""
+    return Plegador(textos=True).plegar(expresion)
+
+def variables_leidas(expresion):
+    """Nombres de las variables que lee una expresión"""
+    leidas = set()
+    pila = [expresion]
+    while pila:
+        nodo = pila.pop()
+        clase = nodo.clase
+        if clase == VARIABLE:
+            leidas.add(nodo.nombre)
+        elif clase == OPERACION_BINARIA:
+            pila.append(nodo.izq)
+            pila.append(nodo.der)
+        elif clase == CAPTURAR:
+            pila.append(nodo.parametro)
+    return leidas
+
+def tiene_captura(expresion):
+    pila = [expresion]
+    while pila:
+        nodo = pila.pop()
+        clase = nodo.clase
+        if clase == CAPTURAR:
+            return True
+        if clase == OPERACION_BINARIA:
+            pila.append(nodo.izq)
+            pila.append(nodo.der)
+    return False
+
+def optimizar(sentencias):
+    """Pliega, propaga y quita asignaciones muertas de una lista de pares (sentencia, línea)
+
+    Retorna la nueva lista de pares y un informe {'plegadas', 'propagadas',
+    'eliminadas'}, donde cada eliminada es {'linea', 'variable', 'motivo'} (motivo
+    SOBRESCRITA o SIN_LECTURA), en el orden del programa. Las sentencias originales
+    no se modifican.
+    """
+    # Hacia adelante: plegado y propagación
+    constantes = {}
+    plegador = Plegador(constantes, textos=True)
+    plegadas = []
+    for sentencia, linea in sentencias:
+        clase = sentencia.clase
+        if clase == ASIGNAR:
+            expresion = plegador.plegar(sentencia.expresion)
+            if plegador.es_constante(expresion):
+                constantes[sentencia.nombre] = expresion.valor
+            else:
+                constantes.pop(sentencia.nombre, None)
+            if expresion is not sentencia.expresion:
+                sentencia = Asignar(sentencia.nombre, expresion)
+        elif clase == MENSAJE_TEXTO and isinstance(sentencia.valor, Nodo):
+            valor = plegador.plegar(sentencia.valor)
+            if valor is not sentencia.valor:
+                sentencia = MensajeTexto(valor)
+        plegadas.append((sentencia, linea))
+
+    # Hacia atrás: una asignación a una variable que no está viva no la lee nadie
+    vivas = set()
+    asignadas_despues = set()
+    eliminadas = []
+    quedan = []
+    for sentencia, linea in reversed(plegadas):
+        clase = sentencia.clase
+        if clase == ASIGNAR:
+            nombre = sentencia.nombre
+            if nombre not in vivas and not tiene_captura(sentencia.expresion):
+                eliminadas.append({
+                    'linea': linea,
+                    'variable': nombre,
+                    'motivo': SOBRESCRITA if nombre in asignadas_despues else SIN_LECTURA,
+                })
+                asignadas_despues.add(nombre)
+                continue
+            vivas.discard(nombre)
+            vivas.update(variables_leidas(sentencia.expresion))
+            asignadas_despues.add(nombre)
+        elif clase == MENSAJE_TEXTO and isinstance(sentencia.valor, Nodo):
+            vivas.update(variables_leidas(sentencia.valor))
+        quedan.append((sentencia, linea))
+    quedan.reverse()
+    eliminadas.reverse()
+
+    return quedan, {
+        'plegadas': plegador.plegadas,
+        'propagadas': plegador.propagadas,
+        'eliminadas': eliminadas,
+    }
@@ -1,181 +1,776 @@
+import inspect
+import io
+import os
+import queue
+import threading
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
 import ply.yacc as yacc
-from lexer import tokens, analizador_lexico, errores_lexicos, limpiar_errores_lexicos
+from lexer import (tokens, crear_analizador_lexico, limpiar_errores_lexicos, EntradaPorBloques,
+                   TAMANO_BLOQUE)
+from nodos import (NUMERO, CADENA, VARIABLE, ERROR, OPERACION_BINARIA, HOJAS, Nodo,
+                   Numero, Cadena, Variable, ErrorVariable, Capturar, OperacionBinaria,
+                   Declarar, Asignar, MensajeTexto)
+from lexer_rapido import AnalizadorLexicoRapido
+from diagnosticos import Diagnosticos, ErroresEnVivo
+from metricas import Medicion
+from simbolos import TablaSimbolos
+from maquina import compilar_programa
+from cuerdas import TEXTOS, concatenar
+from optimizador import optimizar as optimizar_sentencias, plegar_constantes, hay_plegables
+from tipos import (Tipo, ErrorTipo, NUMERICOS, es_error, es_error_fatal, SIN_VALOR,
+                   CAPTURA_ENTERO, CAPTURA_REAL, CAPTURA_TEXTO, SUMA_TEXTO, OPERACION_NO_NUMERICA,
+                   COMPATIBLES)
+
+class AnalisisCancelado(Exception):
+    """Se lanza cuando se pide cancelar un análisis en curso"""
+
+class CorteDiagnosticos(Exception):
+    """Se alcanzó max_errores o max_mensajes (o se cerró el generador) en analizar_stream"""
+
+class ReferenciaCircular(RecursionError):
+    """El valor de una variable depende de sí mismo (por ejemplo 'c = c + c')
+
+    Las variables guardan la expresión asignada, así que evaluar una de estas no
+    termina nunca; se reporta con el mismo mensaje que daba antes el desborde de la
+    recursión.
+    """
+    def __init__(self, variable):
+        super().__init__("maximum recursion depth exceeded")
+        self.variable = variable
+
+# Valor memorizado que no está (o ya no vale): None es un valor válido ("no evaluable")
+FALTA = object()
+
+# Lotes de mensajes que analizar_stream deja en camino antes de esperar al consumidor
+LOTES_EN_VUELO = 64
+
+# Analizadores léxicos que se pueden elegir con Compilador(lexico=...)
+ANALIZADORES_LEXICOS = {
+    'ply': crear_analizador_lexico,
+    'rapido': AnalizadorLexicoRapido,     # Escrito a mano, mismos tokens y errores (ver lexer_rapido.py)
+}
 
 class Compilador:
-    def __init__(self):
-        self.tabla_simbolos = {}
-        self.mensajes_consola = []
-        self.parser = yacc.yacc(module=self, debug=False, write_tables=False)
+    def __init__(self, lexico='ply', medir=False, memoria=False, gancho=None, cache=None,
+                 optimizar=False):
+        """Con 'medir' (o 'memoria', o un 'gancho') analizar() agrega 'instrumentacion' a las
+        estadísticas: tiempos por fase, contadores y, con 'memoria', el pico de memoria
+        (tracemalloc, que es lento). El gancho recibe ese diccionario después de cada análisis.
+
+        Con 'cache' (una CacheCompilacion, ver cache_compilacion.py) analizar() y
+        analizar_archivo() de una ruta devuelven el resultado guardado si el código ya se
+        analizó; las estadísticas dicen 'cache_disco': 'acierto' o 'fallo'. Un acierto deja
+        la tabla de símbolos como la dejaría el análisis, y con la medición encendida el
+        gancho recibe unas métricas con 'cache_disco': 'acierto' (sin fases ni contadores).
+
+        Con 'optimizar' cada asignación guarda su expresión con las operaciones entre
+        constantes ya plegadas (ver optimizador.py): los mensajes son los mismos, pero
+        mostrar una variable no vuelve a calcular sus constantes.
+        """
+        self.tabla_simbolos = TablaSimbolos()
+        self.diagnosticos = Diagnosticos()
+        # ⭐ Lexer propio para que varias instancias puedan analizar a la vez
+        if lexico not in ANALIZADORES_LEXICOS:
+            raise ValueError(f"Analizador léxico desconocido: {lexico!r} "
+                             f"(opciones: {', '.join(ANALIZADORES_LEXICOS)})")
+        self.analizador_lexico = ANALIZADORES_LEXICOS[lexico]()
+        # ⭐ Carga el autómata LALR de parsetab.py (ver construir_tablas.py); si la firma
+        # de la gramática no coincide, yacc rechaza las tablas y lo arma en memoria
+        self.parser = yacc.yacc(module=self, debug=False, write_tables=False, tabmodule='parsetab')
         self.ultima_linea_completa = 0
         self.linea_actual = 0
         self.ultima_linea_error_semicolon = -1
+        self.receptor_sentencias = None
+        # ⭐ Si el parser llegó a reducir 'programa': sin receptor, 'resultado' es la lista
+        # de sentencias; si no (el archivo terminó a media sentencia), es None
+        self.programa_reducido = False
+        # ⭐ Caché de valores por variable, validada con un sello de versión
+        self.versiones_valor = {}
+        self.dependientes = {}
+        self.cache_valores = {}
+        self.cache_aciertos = 0
+        self.cache_fallos = 0
+        self.cache_tipos = {}
+        # ⭐ Estado del análisis incremental (None mientras no se use analizar_incremental)
+        self.texto_incremental = None
+        self.puntos_control = None
+        self.inicios_control = None
+        self.diario = None
+        self.sentencias_incrementales = None
+        self._ultimo_token = None
+        self._reanudando = False
+        self._fin_reanudado = False
+        self._cancelar = None
+        # ⭐ Instrumentación opcional: apagada, el análisis no pasa por ningún código extra
+        self.medir = bool(medir or memoria or gancho is not None)
+        self.medir_memoria = memoria
+        self.gancho_metricas = gancho
+        self.cache_disco = cache
+        self.optimizar = optimizar
     
     tokens = tokens
     
     def reset(self):
         """Limpia el estado del compilador"""
         self.tabla_simbolos.clear()
-        self.mensajes_consola.clear()
+        self.diagnosticos = Diagnosticos()
         self.ultima_linea_completa = 0
         self.linea_actual = 0
         self.ultima_linea_error_semicolon = -1
+        self.programa_reducido = False
+        self.versiones_valor.clear()
+        self.dependientes.clear()
+        self.cache_valores.clear()
+        self.cache_aciertos = 0
+        self.cache_fallos = 0
+        self.cache_tipos.clear()
+        self.texto_incremental = None
+        self.puntos_control = None
+        self.inicios_control = None
+        self.diario = None
+        self.sentencias_incrementales = None
+        self._reanudando = False
     
     def agregar_mensaje(self, tipo, linea, mensaje):
         """Agrega un mensaje a la consola"""
-        self.mensajes_consola.append({
-            'tipo': tipo,
-            'linea': linea,
-            'mensaje': mensaje
-        })
+        self.diagnosticos.agregar(tipo, linea, mensaje)
     
     def obtener_estadisticas(self):
-        """Retorna estadísticas de compilación"""
-        aciertos = sum(1 for m in self.mensajes_consola if m['tipo'] == 'exito')
-        errores = sum(1 for m in self.mensajes_consola if m['tipo'] == 'error')
-        return {'aciertos': aciertos, 'errores': errores}
+        """Retorna estadísticas de compilación (de los contadores, sin recorrer mensajes)"""
+        conteo = self.diagnosticos.conteo
+        # ⭐ Todos los errores léxicos son de tipo 'error'
+        return {
+            'aciertos': conteo['exito'],
+            'errores': conteo['error'] + len(self.analizador_lexico.errores_lexicos),
+            'cache_aciertos': self.cache_aciertos,
+            'cache_fallos': self.cache_fallos
+        }
     
-    def analizar(self, codigo):
-        """Analiza el código y retorna los resultados"""
+    def analizar(self, codigo, receptor=None):
+        """Analiza el código y retorna los resultados
+
+        Si se pasa un receptor (función o generador ya iniciado), cada sentencia se le
+        entrega apenas se reduce y no se guarda la lista: 'resultado' sale en None.
+        """
+        if self.cache_disco is not None:
+            return self.cache_disco.analizar(self, codigo, receptor)
+        return self._analizar(codigo, receptor)
+    
+    def analizar_archivo(self, fuente, receptor=None, tamano_bloque=TAMANO_BLOQUE):
+        """Analiza un archivo (ruta u objeto binario abierto) leyéndolo por bloques
+
+        El código nunca está entero en memoria; con un receptor tampoco se guarda la
+        lista de sentencias. Los mensajes son los mismos que con analizar() sobre el
+        texto del archivo (UTF-8, con los saltos de línea normalizados).
+        """
+        if isinstance(fuente, (str, os.PathLike)):
+            if self.cache_disco is not None:
+                return self.cache_disco.analizar_archivo(self, fuente, receptor, tamano_bloque)
+            with open(fuente, encoding='utf-8') as archivo:
+                return self._analizar(None, receptor, archivo, tamano_bloque)
+        
+        archivo = io.TextIOWrapper(fuente, encoding='utf-8')
+        try:
+            return self._analizar(None, receptor, archivo, tamano_bloque)
+        finally:
+            archivo.detach()    # El objeto es de quien llamó: no se cierra
+    
+    def compilar(self, codigo, optimizar=False):
+        """Analiza el código y, si no tiene errores, lo traduce a bytecode (ver maquina.py)
+
+        Retorna lo mismo que analizar() más 'programa': un Programa listo para ejecutar,
+        o None si el análisis encontró errores. Con 'optimizar' las sentencias pasan antes
+        por optimizador.optimizar() y la respuesta trae su informe en 'optimizacion'.
+        """
+        sentencias = []
+        # La línea de cada sentencia es la última completa al momento de recibirla
+        respuesta = self._analizar(
+            codigo, lambda sentencia: sentencias.append((sentencia, self.ultima_linea_completa)))
+        respuesta['resultado'] = [sentencia for sentencia, _ in sentencias]
+        respuesta['programa'] = None
+        if respuesta['exito'] and respuesta['estadisticas']['errores'] == 0:
+            if optimizar:
+                sentencias, respuesta['optimizacion'] = optimizar_sentencias(sentencias)
+            respuesta['programa'] = compilar_programa(sentencias)
+        return respuesta
+    
+    def _analizar(self, codigo, receptor, archivo=None, tamano_bloque=TAMANO_BLOQUE):
+        """Análisis completo de un texto o, si se pasa 'archivo', de un archivo por bloques"""
         self.reset()
-        limpiar_errores_lexicos()  # ⭐ Limpiar errores léxicos anteriores
-        analizador_lexico.lineno = 1
+        errores_lexicos = self.analizador_lexico.errores_lexicos
+        limpiar_errores_lexicos(errores_lexicos)  # ⭐ Limpiar errores léxicos anteriores
+        self.analizador_lexico.lineno = 1
+        self.receptor_sentencias = self._preparar_receptor(receptor)
+        entrada = None
+        if archivo is not None:
+            entrada = EntradaPorBloques(self.analizador_lexico, archivo, tamano_bloque).token
+        medicion = Medicion(self, self.medir_memoria) if self.medir else None
         
         try:
-            resultado = self.parser.parse(codigo, lexer=analizador_lexico, tracking=True)
+            if medicion is not None:
+                entrada = medicion.entrada(self.analizador_lexico, codigo, entrada)
+                codigo = None
+                medicion.iniciar_parser()
+            resultado = self.parser.parse(codigo, lexer=self.analizador_lexico, tracking=True,
+                                          tokenfunc=entrada)
+            if medicion is not None:
+                medicion.terminar_parser()
+            self.programa_reducido = resultado is not None
+            if self.receptor_sentencias is not None:
+                resultado = None
             
-            # ⭐ Agregar errores léxicos a los mensajes
-            for error in errores_lexicos:
-                self.mensajes_consola.append(error)
-            
-            # ⭐ Ordenar mensajes por línea
-            self.mensajes_consola.sort(key=lambda x: x['linea'] if isinstance(x['linea'], int) else 999999)
-            
-            return {
+            # ⭐ Mensajes y errores léxicos intercalados por línea
+            respuesta = {
                 'exito': True,
                 'resultado': resultado,
-                'mensajes': self.mensajes_consola,
+                'mensajes': self.diagnosticos.ordenados(errores_lexicos),
                 'estadisticas': self.obtener_estadisticas()
             }
         except Exception as e:
-            # ⭐ Agregar errores léxicos incluso si hubo excepción
-            for error in errores_lexicos:
-                self.mensajes_consola.append(error)
-            
-            self.mensajes_consola.sort(key=lambda x: x['linea'] if isinstance(x['linea'], int) else 999999)
+            if archivo is not None and isinstance(e, (OSError, UnicodeDecodeError)):
+                raise   # No se pudo leer el archivo: le toca a quien llamó
+            # ⭐ Los errores léxicos se incluyen incluso si hubo excepción
+            self.agregar_mensaje('error', '?', f"¡Qué desastre! Algo se dañó en el análisis: {str(e)}")
+            respuesta = {
+                'exito': False,
+                'resultado': None,
+                'mensajes': self.diagnosticos.ordenados(errores_lexicos),
+                'estadisticas': self.obtener_estadisticas()
+            }
+        finally:
+            self.receptor_sentencias = None
+            if medicion is not None:
+                medicion.detener()
+        
+        if medicion is not None:
+            self._publicar_metricas(respuesta, medicion.metricas())
+        return respuesta
+    
+    def _publicar_metricas(self, respuesta, metricas):
+        """Agrega las métricas a las estadísticas y se las pasa al gancho, si hay uno"""
+        respuesta['estadisticas']['instrumentacion'] = metricas
+        if self.gancho_metricas is not None:
+            self.gancho_metricas(metricas)
+    
+    def _preparar_receptor(self, receptor):
+        """Convierte el receptor de sentencias en una función de un argumento"""
+        if receptor is None:
+            return None
+        if inspect.isgenerator(receptor):
+            if inspect.getgeneratorstate(receptor) == inspect.GEN_CREATED:
+                next(receptor)  # Arrancar el generador hasta su primer yield
+            return receptor.send
+        return receptor
+    
+    # ============ ANÁLISIS EN FLUJO ============
+    def analizar_stream(self, codigo=None, archivo=None, max_errores=None, max_mensajes=None,
+                        receptor=None, tamano_bloque=TAMANO_BLOQUE):
+        """Generador de los mensajes del análisis a medida que el lexer y el parser los producen
+
+        'codigo' es el texto; 'archivo' una ruta u objeto binario abierto que se lee por
+        bloques, como en analizar_archivo(). Los mensajes son los mismos diccionarios de
+        analizar(), pero en el orden en que aparecen (un error léxico sale cuando se lee
+        su token, no intercalado por línea) y sin quedar guardados en el compilador; las
+        sentencias van al receptor, si hay uno, y si no se descartan.
+
+        Con 'max_errores' o 'max_mensajes' el análisis se detiene apenas sale el mensaje
+        que completa la cuenta, así que en una entrada enorme y rota el tiempo depende de
+        los primeros N errores y no del tamaño. Cerrar el generador (un break) también lo
+        detiene. Al terminar retorna (valor de 'yield from') {'exito', 'cortado',
+        'estadisticas'}. El compilador no se debe usar mientras el generador esté abierto.
+        """
+        if (codigo is None) == (archivo is None):
+            raise ValueError("analizar_stream necesita 'codigo' o 'archivo' (solo uno de los dos)")
+        for limite in (max_errores, max_mensajes):
+            if limite is not None and limite < 1:
+                raise ValueError("max_errores y max_mensajes tienen que ser al menos 1")
+        
+        # ⭐ El parser de PLY no se puede pausar a mitad de camino: corre en un hilo y
+        # manda los mensajes por una cola acotada (si el consumidor se atrasa, espera)
+        cola = queue.Queue(LOTES_EN_VUELO)
+        cerrado = threading.Event()
+        lote = []
+        mensajes = errores = 0
+        
+        def avisar(mensaje):
+            nonlocal mensajes, errores
+            if cerrado.is_set():
+                raise CorteDiagnosticos()
+            lote.append(mensaje)
+            mensajes += 1
+            errores += mensaje['tipo'] == 'error'
+            if mensajes == max_mensajes or errores == max_errores:
+                raise CorteDiagnosticos()
+        
+        def siguiente():
+            nonlocal lote
+            if lote:
+                cola.put(('mensajes', lote))
+                lote = []
+            if cerrado.is_set():
+                raise CorteDiagnosticos()
+            return fuente()
+        
+        def producir():
+            nonlocal fuente
+            lexer = self.analizador_lexico
+            exito, cortado = True, False
+            try:
+                self.reset()
+                self.diagnosticos = Diagnosticos(avisar, guardar=False)
+                lexer.errores_lexicos = ErroresEnVivo(avisar)
+                lexer.lineno = 1
+                self.receptor_sentencias = self._preparar_receptor(receptor) or (lambda sentencia: None)
+                if texto is not None:
+                    fuente = EntradaPorBloques(lexer, texto, tamano_bloque).token
+                else:
+                    lexer.input(codigo)
+                    fuente = lexer.token
+                try:
+                    self.parser.parse(None, lexer=lexer, tracking=True, tokenfunc=siguiente)
+                except CorteDiagnosticos:
+                    raise
+                except Exception as e:
+                    if texto is not None and isinstance(e, (OSError, UnicodeDecodeError)):
+                        raise   # No se pudo leer el archivo: le toca a quien llamó
+                    exito = False
+                    self.agregar_mensaje('error', '?', f"¡Qué desastre! Algo se dañó en el análisis: {str(e)}")
+            except CorteDiagnosticos:
+                cortado = True
+            except BaseException as e:
+                cola.put(('excepcion', e))
+                return
+            finally:
+                self.receptor_sentencias = None
+                estadisticas = self.obtener_estadisticas()
+                lexer.errores_lexicos = []
+            if lote:
+                cola.put(('mensajes', lote))
+            cola.put(('fin', {'exito': exito, 'cortado': cortado, 'estadisticas': estadisticas}))
+        
+        fuente = None
+        texto = None
+        if isinstance(archivo, (str, os.PathLike)):
+            texto = open(archivo, encoding='utf-8')
+        elif archivo is not None:
+            texto = io.TextIOWrapper(archivo, encoding='utf-8')
+        hilo = threading.Thread(target=producir, name='analizar_stream', daemon=True)
+        hilo.start()
+        try:
+            while True:
+                clase, dato = cola.get()
+                if clase == 'mensajes':
+                    yield from dato
+                elif clase == 'fin':
+                    return dato
+                else:
+                    raise dato
+        finally:
+            # Cerrado antes de tiempo: se vacía la cola hasta que el hilo vea la señal
+            cerrado.set()
+            while hilo.is_alive():
+                try:
+                    cola.get(timeout=0.05)
+                except queue.Empty:
+                    pass
+            if isinstance(archivo, (str, os.PathLike)):
+                texto.close()
+            elif texto is not None:
+                texto.detach()  # El objeto es de quien llamó: no se cierra
+    
+    # ============ ANÁLISIS INCREMENTAL ============
+    def analizar_incremental(self, codigo, cancelar=None):
+        """Analiza el código reutilizando el análisis anterior hasta la primera sentencia afectada
+
+        En cada límite de sentencia se guarda un punto de control (posición, línea y tamaño
+        de las listas de estado); la tabla de símbolos se restaura deshaciendo un diario de
+        cambios. Tras una edición se vuelve al último punto anterior al cambio y solo se
+        analiza desde ahí. Los mensajes y el resultado son los mismos que los de analizar().
+
+        'cancelar' es un threading.Event opcional: si se activa, el análisis se corta en el
+        siguiente token con AnalisisCancelado (los puntos de control ya guardados se conservan).
+        """
+        indice = self._buscar_punto_control(codigo)
+        if indice is None:
+            self.reset()
+            self.puntos_control = []
+            self.inicios_control = []
+            self.diario = []
+            self.sentencias_incrementales = []
+            limpiar_errores_lexicos(self.analizador_lexico.errores_lexicos)
+            inicio, linea = 0, 1
+        else:
+            inicio, linea = self._restaurar_punto_control(indice)
+        
+        lexer = self.analizador_lexico
+        lexer.input(codigo)
+        lexer.lexpos = inicio
+        lexer.lineno = linea
+        self._ultimo_token = None
+        self._reanudando = indice is not None
+        self._fin_reanudado = False
+        self._cancelar = cancelar
+        self.receptor_sentencias = self.sentencias_incrementales.append
+        
+        try:
+            aceptado = self.parser.parse(None, lexer=lexer, tracking=True,
+                                         tokenfunc=self._siguiente_token) is not None
+            aceptado = aceptado or self._fin_reanudado
             
+            self.texto_incremental = codigo
+            return {
+                'exito': True,
+                'resultado': list(self.sentencias_incrementales) if aceptado else None,
+                'mensajes': self.diagnosticos.ordenados(lexer.errores_lexicos),
+                'estadisticas': self.obtener_estadisticas()
+            }
+        except AnalisisCancelado:
+            # Lo analizado hasta el último punto de control sigue sirviendo para la próxima vez
+            self.texto_incremental = codigo
+            raise
+        except Exception as e:
             self.agregar_mensaje('error', '?', f"¡Qué desastre! Algo se dañó en el análisis: {str(e)}")
+            self.texto_incremental = None  # El estado quedó a medias: la próxima vez, completo
             return {
                 'exito': False,
                 'resultado': None,
-                'mensajes': self.mensajes_consola,
+                'mensajes': self.diagnosticos.ordenados(lexer.errores_lexicos),
                 'estadisticas': self.obtener_estadisticas()
             }
+        finally:
+            self.receptor_sentencias = None
+            self._reanudando = False
+            self._cancelar = None
+    
+    def progreso(self):
+        """Fracción del código que ya leyó el lexer en el análisis en curso (de 0 a 1)"""
+        lexer = self.analizador_lexico
+        return min(1.0, lexer.lexpos / lexer.lexlen) if lexer.lexlen else 1.0
+    
+    def _siguiente_token(self):
+        """Entrega el siguiente token al parser recordando cuál fue el último leído"""
+        if self._cancelar is not None and self._cancelar.is_set():
+            raise AnalisisCancelado()
+        token = self.analizador_lexico.token()
+        self._ultimo_token = token
+        return token
+    
+    def _registrar_punto_control(self, fin_sentencia):
+        """Guarda el estado justo después de reducir una sentencia"""
+        ultimo = self._ultimo_token
+        if ultimo is None:
+            return  # Ya se leyó el fin del archivo, no hay nada después que reanudar
+        lexer = self.analizador_lexico
+        if ultimo.lexpos == fin_sentencia:
+            # El parser no ha pedido el siguiente token: se reanuda justo después del ';'
+            inicio, linea = lexer.lexpos, lexer.lineno
+        else:
+            # El token siguiente ya se leyó como lookahead: se reanuda volviendo a leerlo
+            inicio, linea = ultimo.lexpos, ultimo.lineno
+        self.puntos_control.append((
+            inicio, linea,
+            len(self.diagnosticos), len(lexer.errores_lexicos),
+            len(self.sentencias_incrementales), len(self.diario),
+            self.ultima_linea_completa, self.ultima_linea_error_semicolon,
+            self.cache_aciertos, self.cache_fallos
+        ))
+        self.inicios_control.append(inicio)
+    
+    def _buscar_punto_control(self, codigo):
+        """Índice del último punto de control que el cambio no afecta, o None"""
+        anterior = self.texto_incremental
+        if anterior is None or not self.puntos_control:
+            return None
+        
+        # Longitud del prefijo común: primero por bloques y luego carácter a carácter
+        fin = min(len(anterior), len(codigo))
+        comun = 0
+        while comun < fin and anterior[comun:comun + 4096] == codigo[comun:comun + 4096]:
+            comun += 4096
+        comun = min(comun, fin)
+        while comun < fin and anterior[comun] == codigo[comun]:
+            comun += 1
+        
+        # Los tokens pueden mirar hasta el fin de su línea (cadenas, comentarios //), así
+        # que solo sirven puntos cuya línea termina antes del primer carácter cambiado
+        limite = anterior.rfind('\n', 0, comun)
+        # Un /* sin cerrar hace que el lexer mire hasta el final del archivo
+        cierre = anterior.rfind('*/')
+        abierto = anterior.find('/*', cierre + 2 if cierre >= 0 else 0)
+        if abierto >= 0:
+            limite = min(limite, abierto)
+        
+        indice = bisect_right(self.inicios_control, limite) - 1
+        return indice if indice >= 0 else None
+    
+    def _restaurar_punto_control(self, indice):
+        """Vuelve el estado del compilador al punto de control indicado"""
+        (inicio, linea, n_mensajes, n_errores, n_sentencias, n_diario,
+         ultima_completa, ultima_error, cache_aciertos, cache_fallos) = self.puntos_control[indice]
+        del self.puntos_control[indice + 1:]
+        del self.inicios_control[indice + 1:]
+        self.diagnosticos.truncar(n_mensajes)
+        del self.analizador_lexico.errores_lexicos[n_errores:]
+        del self.sentencias_incrementales[n_sentencias:]
+        
+        # Deshacer los cambios a la tabla de símbolos en orden inverso
+        tabla = self.tabla_simbolos
+        for slot, existia, valor in reversed(self.diario[n_diario:]):
+            if existia:
+                tabla.asignar(slot, valor)
+            else:
+                tabla.quitar_ultima()   # En orden inverso, la declaración deshecha es la última
+        del self.diario[n_diario:]
+        
+        self.ultima_linea_completa = ultima_completa
+        self.ultima_linea_error_semicolon = ultima_error
+        # Los valores memorizados pueden venir de asignaciones deshechas
+        self.cache_valores.clear()
+        self.cache_tipos.clear()
+        self.cache_aciertos, self.cache_fallos = cache_aciertos, cache_fallos
+        return inicio, linea
     
     # ============ VALIDACIÓN DE TIPOS ============
     def obtener_tipo_expresion(self, expresion):
+        """Determina el tipo de una expresión (Tipo o ErrorTipo), una sola vez por nodo
+
+        ⭐ Calcula los nodos en postorden con una pila propia: cuando se calcula uno sus
+        hijos ya están en cache_tipos, así que 'x = 1 + 1 + ...' con cientos de miles de
+        términos no desborda la recursión de Python.
+        """
+        cache = self.cache_tipos
+        tipo = cache.get(expresion)
+        if tipo is not None:
+            return tipo
+        
+        clase = expresion.clase
+        if clase in HOJAS or (clase == OPERACION_BINARIA and expresion.izq.clase in HOJAS
+                              and expresion.der.clase in HOJAS):
+            # Lo más común (hojas y operaciones entre hojas) no necesita la pila
+            tipo = cache[expresion] = self.calcular_tipo_expresion(expresion)
+            return tipo
+        
+        # Nodos sin tipo en preorden (derecho antes que izquierdo): al revés, cada hijo
+        # queda antes que su padre y el subárbol izquierdo antes que el derecho
+        orden = []
+        pila = [expresion]
+        while pila:
+            nodo = pila.pop()
+            orden.append(nodo)
+            tipo_nodo = type(nodo)
+            if tipo_nodo is OperacionBinaria:
+                if nodo.izq not in cache:
+                    pila.append(nodo.izq)
+                if nodo.der not in cache:
+                    pila.append(nodo.der)
+            elif tipo_nodo is Capturar and nodo.parametro not in cache:
+                pila.append(nodo.parametro)
+        calcular = self.calcular_tipo_expresion
+        for nodo in reversed(orden):
+            cache[nodo] = calcular(nodo)
+        return cache[expresion]
+    
+    def calcular_tipo_expresion(self, expresion):
         """Determina el tipo de una expresión con validación estricta"""
+        tipo_nodo = type(expresion)
         # ⭐ FIX: Detectar expresiones de error
-        if expresion[0] == 'error':
-            return 'Error'
-        
-        if expresion[0] == 'numero':
-            valor = expresion[1]
-            return 'Entero' if isinstance(valor, int) else 'Real'
-        elif expresion[0] == 'cadena':
-            return 'Texto'
-        elif expresion[0] == 'variable':
-            variable = expresion[1]
-            if variable not in self.tabla_simbolos:
-                return 'Desconocido'
+        if tipo_nodo is ErrorVariable:
+            return Tipo.ERROR
+        
+        if tipo_nodo is Numero:
+            valor = expresion.valor
+            return Tipo.ENTERO if isinstance(valor, int) else Tipo.REAL
+        elif tipo_nodo is Cadena:
+            return Tipo.TEXTO
+        elif tipo_nodo is Variable:
+            variable = expresion.nombre
+            tabla = self.tabla_simbolos
+            slot = tabla.slot(variable)
+            if slot is None:
+                return Tipo.DESCONOCIDO
             
             # ⭐ VALIDAR SI LA VARIABLE TIENE VALOR ASIGNADO
-            if self.tabla_simbolos[variable]['valor'] is None:
-                return f'!Eche que! La variable "{variable}" no tiene valor todavía, asígnale algo primero'
+            if tabla.valores[slot] is None:
+                return ErrorTipo(SIN_VALOR, expresion,
+                    f'!Eche que! La variable "{variable}" no tiene valor todavía, asígnale algo primero')
             
-            return self.tabla_simbolos.get(variable, {}).get('tipo', 'Desconocido')
-        elif expresion[0] == 'capturar':
-            tipo_captura = expresion[1]
-            parametro = expresion[2]
+            return tabla.tipo(slot)
+        elif tipo_nodo is Capturar:
+            tipo_captura = Tipo(expresion.tipo)
+            parametro = expresion.parametro
             tipo_parametro = self.obtener_tipo_expresion(parametro)
+            causa = tipo_parametro if es_error(tipo_parametro) else None
         
-            if tipo_captura == 'Entero' and tipo_parametro != 'Entero':
-                return f'¡Nojoda tu que! Captura.Entero espera Entero, pero le mandaste {tipo_parametro}'
-            elif tipo_captura == 'Real' and tipo_parametro not in ['Entero', 'Real']:
-                return f'¡Nojoda tu que! Captura.Real espera un número, pero le mandaste {tipo_parametro}'
-            elif tipo_captura == 'Texto' and tipo_parametro != 'Texto':
-                return f'¡Nojoda tu que! Captura.Texto espera texto, pero le mandaste {tipo_parametro}'
+            if tipo_captura is Tipo.ENTERO and tipo_parametro is not Tipo.ENTERO:
+                return ErrorTipo(CAPTURA_ENTERO, expresion,
+                    f'¡Nojoda tu que! Captura.Entero espera Entero, pero le mandaste {tipo_parametro}', causa=causa)
+            elif tipo_captura is Tipo.REAL and tipo_parametro not in NUMERICOS:
+                return ErrorTipo(CAPTURA_REAL, expresion,
+                    f'¡Nojoda tu que! Captura.Real espera un número, pero le mandaste {tipo_parametro}', causa=causa)
+            elif tipo_captura is Tipo.TEXTO and tipo_parametro is not Tipo.TEXTO:
+                return ErrorTipo(CAPTURA_TEXTO, expresion,
+                    f'¡Nojoda tu que! Captura.Texto espera texto, pero le mandaste {tipo_parametro}', causa=causa)
         
             return tipo_captura
-        elif expresion[0] == 'operacion_binaria':
-            op, izq, der = expresion[1], expresion[2], expresion[3]
+        elif tipo_nodo is OperacionBinaria:
+            op, izq, der = expresion.op, expresion.izq, expresion.der
             tipo_izq = self.obtener_tipo_expresion(izq)
             tipo_der = self.obtener_tipo_expresion(der)
             
             # Si ya hay error en subexpresiones
-            if 'Error:' in str(tipo_izq) or 'Error:' in str(tipo_der):
-                return tipo_izq if 'Error:' in str(tipo_izq) else tipo_der
+            if es_error_fatal(tipo_izq):
+                return tipo_izq
+            if es_error_fatal(tipo_der):
+                return tipo_der
             
             # Validar suma con texto (solo permitida entre Texto + Texto)
             if op == '+':
-                if tipo_izq == 'Texto' or tipo_der == 'Texto':
-                    if tipo_izq == 'Texto' and tipo_der == 'Texto':
-                        return 'Texto'
+                if tipo_izq is Tipo.TEXTO or tipo_der is Tipo.TEXTO:
+                    if tipo_izq is Tipo.TEXTO and tipo_der is Tipo.TEXTO:
+                        return Tipo.TEXTO
                     else:
-                        return f'¡Nojoda que! no puedes sumar Texto con {tipo_izq if tipo_izq != "Texto" else tipo_der}'
+                        otro = tipo_izq if tipo_izq is not Tipo.TEXTO else tipo_der
+                        return ErrorTipo(SUMA_TEXTO, expresion, f'¡Nojoda que! no puedes sumar Texto con {otro}')
                 else:
-                    return 'Real'
+                    return Tipo.REAL
             else:
                 # Para -, *, / → solo números
-                if tipo_izq not in ['Entero', 'Real'] or tipo_der not in ['Entero', 'Real']:
-                    return f'Error: La operación "{op}" solo funciona con números, no con {tipo_izq} y {tipo_der}'
-                return 'Real'
+                if tipo_izq not in NUMERICOS or tipo_der not in NUMERICOS:
+                    return ErrorTipo(OPERACION_NO_NUMERICA, expresion,
+                        f'Error: La operación "{op}" solo funciona con números, no con {tipo_izq} y {tipo_der}',
+                        fatal=True)
+                return Tipo.REAL
         
-        return 'Desconocido'
+        return Tipo.DESCONOCIDO
     
     def obtener_valor_expresion(self, expresion):
-        """Obtiene el valor real de una expresión (para mostrar en mensajes)"""
-        # ⭐ FIX: No intentar obtener valor de expresiones de error
-        if expresion[0] == 'error':
-            return None
+        """Obtiene el valor real de una expresión (para mostrar en mensajes)
+
+        Las variables y las capturas solo pasan al valor de otra expresión: se siguen en
+        un ciclo y el texto final se memoriza para cada variable del camino.
+        """
+        tabla = self.tabla_simbolos
+        camino = []         # (variable, versión) por memorizar
+        en_camino = None    # Sus variables, para detectar ciclos (se arma al primer fallo)
+        while True:
+            tipo_nodo = type(expresion)
+            if tipo_nodo is Variable:
+                variable = expresion.nombre
+                slot = tabla.slot(variable)
+                if slot is None or tabla.valores[slot] is None:
+                    valor = f"[{variable}]"
+                    break
+                version, valor = self.buscar_valor_memorizado('texto', variable)
+                if valor is not FALTA:
+                    break
+                if en_camino is None:
+                    en_camino = set()
+                elif variable in en_camino:
+                    raise ReferenciaCircular(variable)
+                en_camino.add(variable)
+                camino.append((variable, version))
+                expresion = tabla.valores[slot]
+                continue
+            if tipo_nodo is Capturar:
+                # ⭐ FIX: Manejar Captura correctamente (muestra el valor del parámetro)
+                expresion = expresion.parametro
+                continue
+            
+            # ⭐ FIX: No intentar obtener valor de expresiones de error
+            if tipo_nodo is ErrorVariable:
+                valor = None
+            elif tipo_nodo is OperacionBinaria:
+                resultado = self.evaluar_operacion(expresion)
+                if resultado is not None:
+                    # Mostrar como Entero si es decimal exacto, sino como Real; una
+                    # Cuerda se arma aquí, al mostrarla
+                    if isinstance(resultado, float) and resultado == int(resultado):
+                        valor = str(int(resultado))
+                    else:
+                        valor = str(resultado)
+                else:
+                    valor = "[operación no evaluable]"
+            elif tipo_nodo is Cadena:
+                valor = expresion.valor
+            elif tipo_nodo is Numero:
+                valor = str(expresion.valor)
+            else:
+                valor = str(expresion)
+            break
         
-        if expresion[0] == 'operacion_binaria':
-            resultado = self.evaluar_operacion(expresion)
-            if resultado is not None:
-                # Mostrar como Entero si es decimal exacto, sino como Real
-                if isinstance(resultado, float) and resultado == int(resultado):
-                    return str(int(resultado))
-                return str(resultado)
-            return "[operación no evaluable]"
-        elif expresion[0] == 'cadena':
-            return expresion[1]
-        elif expresion[0] == 'variable':
-            variable = expresion[1]
-            if variable in self.tabla_simbolos and self.tabla_simbolos[variable]['valor'] is not None:
-                valor_almacenado = self.tabla_simbolos[variable]['valor']
-                return self.obtener_valor_expresion(valor_almacenado)
-            return f"[{variable}]"
-        elif expresion[0] == 'numero':
-            return str(expresion[1])
-        elif expresion[0] == 'capturar':
-            # ⭐ FIX: Manejar Captura correctamente
-            #tipo_captura = expresion[1]
-            parametro = expresion[2]
-            valor_parametro = self.obtener_valor_expresion(parametro)
-            return valor_parametro
-        else:
-            return str(expresion)
+        for variable, version in camino:
+            self.memorizar_valor('texto', variable, version, valor)
+        return valor
     
-    def tipos_compatibles(self, tipo_declarado, tipo_expresion):
-        """Verifica si los tipos son compatibles"""
-        if 'Error:' in str(tipo_expresion):
-            return False
+    # ============ CACHÉ DE VALORES ============
+    def buscar_valor_memorizado(self, clase, variable):
+        """Versión actual de la variable y su valor memorizado, o FALTA si no sirve"""
+        version = self.versiones_valor.get(variable, 0)
+        entrada = self.cache_valores.get((clase, variable))
+        if entrada is not None and entrada[0] == version:
+            self.cache_aciertos += 1
+            return version, entrada[1]
         
-        compatibilidad = {
-            'Entero': ['Entero'],
-            'Real': ['Entero', 'Real'],
-            'Texto': ['Texto']
-        }
-        return tipo_expresion in compatibilidad.get(tipo_declarado, [])
+        self.cache_fallos += 1
+        return version, FALTA
+    
+    def memorizar_valor(self, clase, variable, version, valor):
+        """Guarda el valor calculado con la versión que tenía la variable al empezar"""
+        self.cache_valores[(clase, variable)] = (version, valor)
+    
+    def registrar_asignacion(self, variable, expresion):
+        """Sube la versión de la variable y de todas las que dependen de ella"""
+        # Los valores se guardan como expresiones, así que 'b = a + a' depende de 'a'
+        for usada in self.variables_de_expresion(expresion):
+            self.dependientes.setdefault(usada, set()).add(variable)
+        
+        pendientes = [variable]
+        invalidadas = set()
+        while pendientes:
+            actual = pendientes.pop()
+            if actual in invalidadas:
+                continue
+            invalidadas.add(actual)
+            self.versiones_valor[actual] = self.versiones_valor.get(actual, 0) + 1
+            pendientes.extend(self.dependientes.get(actual, ()))
+    
+    def variables_de_expresion(self, expresion):
+        """Nombres de las variables que aparecen en una expresión"""
+        variables = set()
+        pendientes = [expresion]
+        while pendientes:
+            nodo = pendientes.pop()
+            tipo_nodo = type(nodo)
+            if tipo_nodo is Variable:
+                variables.add(nodo.nombre)
+            elif tipo_nodo is OperacionBinaria:
+                pendientes.append(nodo.der)
+                pendientes.append(nodo.izq)
+            elif tipo_nodo is Capturar:
+                pendientes.append(nodo.parametro)
+        return variables
+    
+    def plegar_valor(self, expresion):
+        """La expresión con sus operaciones entre constantes plegadas, si se muestra igual
+
+        Mensaje.Texto muestra el resultado de una operación sin decimales si es exacto
+        ('2,5 * 2' sale 5) y un número tal cual (5.0): en ese caso la raíz no se pliega.
+        """
+        if not hay_plegables(expresion):
+            return expresion    # ⭐ Sin el recorrido de Plegador: lo común es no tener nada
+        plegada = plegar_constantes(expresion)
+        if plegada.clase == NUMERO and plegada is not expresion:
+            valor = plegada.valor
+            if isinstance(valor, float) and valor == int(valor):
+                return expresion
+        return plegada
+    
+    def tipos_compatibles(self, codigo_declarado, tipo_expresion):
+        """Verifica si los tipos son compatibles (el declarado como código de la tabla)"""
+        if es_error(tipo_expresion):
+            return False
+        return tipo_expresion in COMPATIBLES[codigo_declarado]
     
     # ============ GRAMÁTICA PLY ============
     precedence = (
@@ -190,10 +785,24 @@ class Compilador:
     def p_lista_sentencias(self, t):
         '''lista_sentencias : lista_sentencias sentencia
                             | sentencia'''
+        # ⭐ Se agrega sobre la misma lista (lineal), en vez de copiarla en cada reducción
         if len(t) == 3:
-            t[0] = t[1] + [t[2]] if t[2] is not None else t[1]
+            lista, sentencia = t[1], t[2]
         else:
-            t[0] = [t[1]] if t[1] is not None else []
+            lista, sentencia = [], t[1]
+        
+        # Los tipos solo son válidos mientras se chequea la sentencia (dependen de la tabla)
+        self.cache_tipos.clear()
+        
+        if sentencia is not None:
+            if self.receptor_sentencias is not None:
+                self.receptor_sentencias(sentencia)
+            else:
+                lista.append(sentencia)
+        t[0] = lista
+        
+        if self.puntos_control is not None:
+            self._registrar_punto_control(t.lexspan(len(t) - 1)[1])
     
     def p_tipo(self, t):
         '''tipo : ENTERO
@@ -203,101 +812,169 @@ class Compilador:
     
     def p_sentencia_declaracion(self, t):
         'sentencia : IDENTIFICADOR tipo PUNTO_Y_COMA'
-        var, tipo_var = t[1], t[2]
-        linea = t.lineno(1)
-        
+        t[0] = self.declarar(t[1], t[2], t.lineno(1))
+    
+    def p_sentencia_declaracion_sin_punto_y_coma(self, t):
+        'sentencia : IDENTIFICADOR tipo'
+        t[0] = self.falta_punto_y_coma(t.lineno(1))
+    
+    def p_sentencia_asignacion(self, t):
+        'sentencia : IDENTIFICADOR IGUAL expresion PUNTO_Y_COMA'
+        t[0] = self.asignar(t[1], t[3], t.lineno(1))
+    
+    def p_sentencia_asignacion_sin_punto_y_coma(self, t):
+        'sentencia : IDENTIFICADOR IGUAL expresion'
+        t[0] = self.falta_punto_y_coma(t.lineno(1))
+    
+    def p_sentencia_mensaje(self, t):
+        '''sentencia : MENSAJE PUNTO TEXTO PARENTESIS_IZQ CADENA_TEXTO PARENTESIS_DER PUNTO_Y_COMA
+                     | MENSAJE PUNTO TEXTO PARENTESIS_IZQ expresion PARENTESIS_DER PUNTO_Y_COMA'''
+        t[0] = self.mostrar(t[5], t.lineno(1))
+    
+    def p_expresion_binaria(self, t):
+        '''expresion : expresion MAS expresion
+                     | expresion MENOS expresion
+                     | expresion POR expresion
+                     | expresion DIVIDIDO expresion'''
+        t[0] = OperacionBinaria(t[2], t[1], t[3])
+    
+    def p_expresion_grupo(self, t):
+        'expresion : PARENTESIS_IZQ expresion PARENTESIS_DER'
+        t[0] = t[2]
+    
+    def p_expresion_valor(self, t):
+        '''expresion : NUMERO_ENTERO
+                     | NUMERO_REAL'''
+        t[0] = Numero(t[1])
+    
+    def p_expresion_identificador(self, t):
+        'expresion : IDENTIFICADOR'
+        t[0] = self.usar_variable(t[1])
+    
+    def p_expresion_cadena(self, t):
+        'expresion : CADENA_TEXTO'
+        t[0] = Cadena(t[1])
+    
+    def p_expresion_captura(self, t):
+        'expresion : CAPTURA PUNTO tipo PARENTESIS_IZQ expresion PARENTESIS_DER'
+        t[0] = Capturar(t[3], t[5])
+    
+    def p_error(self, t):
+        if t:
+            self.error_sintaxis(t.lineno, t.value)
+            
+            # Better error recovery
+            while True:
+                tok = self.parser.token()
+                if not tok or tok.type == 'PUNTO_Y_COMA':
+                    break
+            self.parser.errok()
+            return tok
+        else:
+            # ⭐ Al reanudar un análisis incremental el parser arranca con la pila vacía: llegar
+            # al final sin sentencias nuevas equivale a terminar después de la última guardada
+            if self._reanudando and len(self.parser.statestack) == 1:
+                self._fin_reanudado = True
+                return
+            self.fin_inesperado()
+    
+    # ============ ACCIONES SEMÁNTICAS ============
+    # Lo que hace cada regla con la tabla de símbolos y la consola. Las reglas solo les
+    # pasan los valores de sus símbolos, así que también se pueden aplicar a sentencias
+    # que se parsearon en otro proceso (ver analisis_paralelo.py), en el mismo orden.
+    
+    def declarar(self, var, tipo_var, linea):
+        """Declaración completa ('x Entero;'): retorna la sentencia o None si hubo error"""
         if var in self.tabla_simbolos:
             self.agregar_mensaje('error', linea, f"¡Epa! La variable '{var}' ya la declaraste mano, no la repitas.")
-            t[0] = None
+            sentencia = None
         else:
-            self.tabla_simbolos[var] = {'tipo': tipo_var, 'valor': None, 'linea': linea}
+            slot = self.tabla_simbolos.declarar(var, tipo_var, linea)
+            if self.diario is not None:
+                self.diario.append((slot, False, None))
             self.agregar_mensaje('exito', linea, f"¡Bien ahí! Variable '{var}' quedó como {tipo_var}")
-            t[0] = ('declarar', var, tipo_var)
+            sentencia = Declarar(var, tipo_var)
         self.ultima_linea_completa = linea
+        return sentencia
     
-    def p_sentencia_declaracion_sin_punto_y_coma(self, t):
-        'sentencia : IDENTIFICADOR tipo'
-        var, tipo_var = t[1], t[2]
-        linea = t.lineno(1)
+    def falta_punto_y_coma(self, linea):
+        """Declaración o asignación sin ';' al final"""
         self.agregar_mensaje('error', linea, f"¡Ey cole! Te faltó el punto y coma (;) en la línea {linea}. ¡Todo está mal a partir de aquí!")
-        t[0] = None
+        return None
     
-    def p_sentencia_asignacion(self, t):
-        'sentencia : IDENTIFICADOR IGUAL expresion PUNTO_Y_COMA'
-        var, expr = t[1], t[3]
-        linea = t.lineno(1)
-        
-        if var not in self.tabla_simbolos:
+    def asignar(self, var, expr, linea):
+        """Asignación completa ('x = expresión;'): retorna la sentencia o None si hubo error"""
+        tabla = self.tabla_simbolos
+        slot = tabla.slot(var)
+        if slot is None:
             self.agregar_mensaje('error', linea, f"¡Ombe! La variable '{var}' no existe, declárala primero pues.")
-            t[0] = None
+            sentencia = None
         else:
-            tipo_declarado = self.tabla_simbolos[var]['tipo']
+            tipo_declarado = tabla.tipo(slot)
             tipo_expresion = self.obtener_tipo_expresion(expr)
             
-            if 'Error:' in str(tipo_expresion):
-                self.agregar_mensaje('error', linea, tipo_expresion)
-                t[0] = None
-            elif not self.tipos_compatibles(tipo_declarado, tipo_expresion):
+            if es_error_fatal(tipo_expresion):
+                tipo_expresion.linea = linea
+                self.agregar_mensaje('error', linea, str(tipo_expresion))
+                sentencia = None
+            elif not self.tipos_compatibles(tabla.tipos[slot], tipo_expresion):
                 self.agregar_mensaje('error', linea,
                     f"¡Esa vaina que cole! No puedes meter {tipo_expresion} en '{var}' que es {tipo_declarado}")
-                t[0] = None
+                sentencia = None
             else:
-                self.tabla_simbolos[var]['valor'] = expr
+                if self.optimizar:
+                    expr = self.plegar_valor(expr)
+                if self.diario is not None:
+                    self.diario.append((slot, True, tabla.valores[slot]))
+                tabla.asignar(slot, expr)
+                self.registrar_asignacion(var, expr)
                 self.agregar_mensaje('exito', linea, f"¡Tá bueno! {tipo_expresion} → {var}({tipo_declarado})")
-                t[0] = ('asignar', var, expr)
+                sentencia = Asignar(var, expr)
         self.ultima_linea_completa = linea
+        return sentencia
     
-    def p_sentencia_asignacion_sin_punto_y_coma(self, t):
-        'sentencia : IDENTIFICADOR IGUAL expresion'
-        var, expr = t[1], t[3]
-        linea = t.lineno(1)
-        self.agregar_mensaje('error', linea, f"¡Ey cole! Te faltó el punto y coma (;) en la línea {linea}. ¡Todo está mal a partir de aquí!")
-        t[0] = None
-    
-    def p_sentencia_mensaje(self, t):
-        '''sentencia : MENSAJE PUNTO TEXTO PARENTESIS_IZQ CADENA_TEXTO PARENTESIS_DER PUNTO_Y_COMA
-                     | MENSAJE PUNTO TEXTO PARENTESIS_IZQ expresion PARENTESIS_DER PUNTO_Y_COMA'''
-        linea = t.lineno(1)
-        valor_texto = t[5]
-        
+    def mostrar(self, valor_texto, linea):
+        """Mensaje.Texto(...) con un texto literal o una expresión: retorna la sentencia"""
         es_error = False
         error_mensaje = None
         valor_mostrar = None
         
         # ⭐ FIX: Detectar expresiones de error primero
-        if isinstance(valor_texto, tuple) and valor_texto[0] == 'error':
-            var_nombre = valor_texto[1]
+        es_nodo = isinstance(valor_texto, Nodo)
+        if es_nodo and valor_texto.clase == ERROR:
+            var_nombre = valor_texto.nombre
             self.agregar_mensaje('error', linea, f"¡Ombe! La variable '{var_nombre}' no existe, no puedo mostrar un fantasma.")
-            t[0] = None
             self.ultima_linea_completa = linea
-            return
+            return None
         
         # Check if it's an empty string
         if isinstance(valor_texto, str) and valor_texto == "":
             es_error = True
             error_mensaje = "¡Ombe! Mensaje.Texto está vacío, ponle algo pues."
-        elif isinstance(valor_texto, tuple) and valor_texto[0] == 'operacion_binaria':
+        elif es_nodo and valor_texto.clase == OPERACION_BINARIA:
             tipo_expresion = self.obtener_tipo_expresion(valor_texto)
-            if 'Error:' in str(tipo_expresion):
+            if es_error_fatal(tipo_expresion):
+                tipo_expresion.linea = linea
                 es_error = True
-                error_mensaje = tipo_expresion
+                error_mensaje = str(tipo_expresion)
             else:
                 valor_mostrar = self.obtener_valor_expresion(valor_texto)
         # Check if it's a variable
-        elif isinstance(valor_texto, tuple) and valor_texto[0] == 'variable':
-            var_nombre = valor_texto[1]
+        elif es_nodo and valor_texto.clase == VARIABLE:
+            var_nombre = valor_texto.nombre
+            slot = self.tabla_simbolos.slot(var_nombre)
             # Check if variable exists
-            if var_nombre not in self.tabla_simbolos:
+            if slot is None:
                 es_error = True
                 error_mensaje = f"¡Ombe! La variable '{var_nombre}' no existe, no puedo mostrar un fantasma."
             # Check if variable has a value assigned
-            elif self.tabla_simbolos[var_nombre]['valor'] is None:
+            elif self.tabla_simbolos.valores[slot] is None:
                 es_error = True
                 error_mensaje = f"¡Ombe! La variable '{var_nombre}' no tiene valor, asígnale algo primero."
             else:
                 valor_mostrar = self.obtener_valor_expresion(valor_texto)
-        elif isinstance(valor_texto, tuple) and valor_texto[0] == 'cadena':
-            valor_mostrar = valor_texto[1]
+        elif es_nodo and valor_texto.clase == CADENA:
+            valor_mostrar = valor_texto.valor
             if valor_mostrar == "":
                 es_error = True
                 error_mensaje = "¡Ombe! vale mía Mensaje.Texto está vacío, ponle algo pues."
@@ -309,109 +986,136 @@ class Compilador:
         elif valor_mostrar is not None:
             self.agregar_mensaje('exito', linea, f"Nojoda monstruo está bueno el valor es \"{valor_mostrar}\"")
         
-        t[0] = ('mensaje_texto', t[5])
         self.ultima_linea_completa = linea
+        return MensajeTexto(valor_texto)
     
-    def p_expresion_binaria(self, t):
-        '''expresion : expresion MAS expresion
-                     | expresion MENOS expresion
-                     | expresion POR expresion
-                     | expresion DIVIDIDO expresion'''
-        t[0] = ('operacion_binaria', t[2], t[1], t[3])
-    
-    def p_expresion_grupo(self, t):
-        'expresion : PARENTESIS_IZQ expresion PARENTESIS_DER'
-        t[0] = t[2]
-    
-    def p_expresion_valor(self, t):
-        '''expresion : NUMERO_ENTERO
-                     | NUMERO_REAL'''
-        t[0] = ('numero', t[1])
-    
-    def p_expresion_identificador(self, t):
-        'expresion : IDENTIFICADOR'
-        var = t[1]
-        linea = t.lineno(1)
+    def usar_variable(self, var):
+        """Nodo de una variable leída en una expresión (ErrorVariable si no está declarada)"""
         if var not in self.tabla_simbolos:
             # ⭐ NO agregar mensaje aquí, solo marcar como error
             # El mensaje se mostrará donde se use la variable
-            t[0] = ('error', var)
-        else:
-            t[0] = ('variable', var)
+            return ErrorVariable(var)
+        return Variable(var)
     
-    def p_expresion_cadena(self, t):
-        'expresion : CADENA_TEXTO'
-        t[0] = ('cadena', t[1])
-    
-    def p_expresion_captura(self, t):
-        'expresion : CAPTURA PUNTO tipo PARENTESIS_IZQ expresion PARENTESIS_DER'
-        t[0] = ('capturar', t[3], t[5])
-    
-    def p_error(self, t):
-        if t:
-            linea = t.lineno
-            
-            if linea > self.ultima_linea_completa + 1:
-                # Check if this is a new error (not duplicate)
-                if linea != self.ultima_linea_error_semicolon:
-                    # Only report if there's actual code on the previous line
-                    linea_anterior_tiene_codigo = False
-                    for msg in self.mensajes_consola:
-                        if msg['linea'] == linea - 1 and msg['tipo'] in ['exito', 'error']:
-                            linea_anterior_tiene_codigo = True
-                            break
-                    
-                    if linea_anterior_tiene_codigo:
-                        self.agregar_mensaje('error', linea, f"¡Ey cole! Te faltó el punto y coma (;) en la línea {linea - 1}. ¡Todo está mal a partir de aquí!")
-                        self.ultima_linea_error_semicolon = linea
-            else:
-                # If it's in the same line, it's a syntax error
-                self.agregar_mensaje('error', linea, f"¡Qué vaina! Hay un error con '{t.value}' aquí mano")
-            
-            # Better error recovery
-            while True:
-                tok = self.parser.token()
-                if not tok or tok.type == 'PUNTO_Y_COMA':
-                    break
-            self.parser.errok()
-            return tok
+    def error_sintaxis(self, linea, valor):
+        """Reporta el token inesperado 'valor' de la línea (p_error después se salta hasta el ';')"""
+        if linea > self.ultima_linea_completa + 1:
+            # Check if this is a new error (not duplicate)
+            if linea != self.ultima_linea_error_semicolon:
+                # Only report if there's actual code on the previous line
+                # ⭐ Consulta directa al índice por línea, sin recorrer los mensajes
+                if self.diagnosticos.tiene_codigo(linea - 1):
+                    self.agregar_mensaje('error', linea, f"¡Ey cole! Te faltó el punto y coma (;) en la línea {linea - 1}. ¡Todo está mal a partir de aquí!")
+                    self.ultima_linea_error_semicolon = linea
         else:
-            self.agregar_mensaje('error', '?', "¡Ombe! El archivo se acabó pero falta algo, revísalo completo.")
+            # If it's in the same line, it's a syntax error
+            self.agregar_mensaje('error', linea, f"¡Qué vaina! Hay un error con '{valor}' aquí mano")
+    
+    def fin_inesperado(self):
+        """El archivo terminó en la mitad de una sentencia"""
+        self.agregar_mensaje('error', '?', "¡Ombe! El archivo se acabó pero falta algo, revísalo completo.")
     
     def evaluar_operacion(self, expresion):
-        """Evalúa una operación binaria y retorna el resultado numérico"""
-        if expresion[0] == 'operacion_binaria':
-            op, izq, der = expresion[1], expresion[2], expresion[3]
-            
-            # Evaluar operandos recursivamente
-            val_izq = self.evaluar_operacion(izq)
-            val_der = self.evaluar_operacion(der)
-            
-            if val_izq is None or val_der is None:
-                return None
+        """Evalúa una operación binaria y retorna el resultado (número o texto)
+
+        ⭐ Postorden con pilas propias (nodos por visitar y valores ya calculados), en el
+        mismo orden que la versión recursiva: izquierdo, derecho y después la operación.
+        El valor de una variable se evalúa una vez por asignación y se memoriza. Una suma
+        de textos da una Cuerda (ver cuerdas.py), que se arma recién al mostrarla.
+        """
+        tabla = self.tabla_simbolos
+        # Nodos por visitar, el operador (texto) de una operación cuyos operandos ya se
+        # calcularon, o (variable, versión) cuando su valor ya está listo para memorizar
+        pendientes = [expresion]
+        valores = []
+        apilar, apilar_valor = pendientes.append, valores.append
+        en_curso = None            # Variables que se están evaluando (para detectar ciclos)
+        while pendientes:
+            nodo = pendientes.pop()
+            tipo_nodo = type(nodo)
+            if tipo_nodo is str:
+                val_der = valores.pop()
+                val_izq = valores[-1]
+                if val_izq is None or val_der is None:
+                    valores[-1] = None
+                else:
+                    valores[-1] = operar(nodo, val_izq, val_der)
+                continue
+            if tipo_nodo is tuple:
+                variable, version = nodo
+                en_curso.discard(variable)
+                self.memorizar_valor('numero', variable, version, valores[-1])
+                continue
             
-            try:
-                if op == '+':
-                    return val_izq + val_der
-                elif op == '-':
-                    return val_izq - val_der
-                elif op == '*':
-                    return val_izq * val_der
-                elif op == '/':
-                    if val_der == 0:
-                        return None
-                    return val_izq / val_der
-            except:
+            # ⭐ Ya se tiene type(nodo): despachar por identidad de la clase de Python
+            # evita leer nodo.clase (ver nodos.py)
+            if tipo_nodo is OperacionBinaria:
+                apilar(nodo.op)
+                apilar(nodo.der)
+                apilar(nodo.izq)
+            elif tipo_nodo is Numero or tipo_nodo is Cadena:
+                apilar_valor(nodo.valor)
+            elif tipo_nodo is Variable:
+                variable = nodo.nombre
+                slot = tabla.slot(variable)
+                if slot is None or tabla.valores[slot] is None:
+                    apilar_valor(None)
+                    continue
+                version, valor = self.buscar_valor_memorizado('numero', variable)
+                if valor is not FALTA:
+                    apilar_valor(valor)
+                    continue
+                if en_curso is None:
+                    en_curso = set()
+                elif variable in en_curso:
+                    raise ReferenciaCircular(variable)
+                en_curso.add(variable)
+                apilar((variable, version))
+                apilar(tabla.valores[slot])
+            elif tipo_nodo is Capturar:
+                # ⭐ FIX: Evaluar Captura - obtener el valor del parámetro
+                apilar(nodo.parametro)
+            else:
+                apilar_valor(None)
+        
+        return valores[0]
+
+
+def operar(op, val_izq, val_der):
+    """Resultado de 'val_izq op val_der', o None si no se puede calcular"""
+    if isinstance(val_izq, TEXTOS) or isinstance(val_der, TEXTOS):
+        # Solo 'Texto + Texto' tiene valor (y sin copiar: la suma de str es cuadrática)
+        if op == '+' and isinstance(val_izq, TEXTOS) and isinstance(val_der, TEXTOS):
+            return concatenar(val_izq, val_der)
+        return None
+    try:
+        if op == '+':
+            return val_izq + val_der
+        elif op == '-':
+            return val_izq - val_der
+        elif op == '*':
+            return val_izq * val_der
+        elif op == '/':
+            if val_der == 0:
                 return None
-        elif expresion[0] == 'numero':
-            return expresion[1]
-        elif expresion[0] == 'variable':
-            var = expresion[1]
-            if var in self.tabla_simbolos and self.tabla_simbolos[var]['valor'] is not None:
-                return self.evaluar_operacion(self.tabla_simbolos[var]['valor'])
-        elif expresion[0] == 'capturar':
-            # ⭐ FIX: Evaluar Captura - obtener el valor del parámetro
-            parametro = expresion[2]
-            return self.evaluar_operacion(parametro)
-        
-        return None
\ No newline at end of file
+            return val_izq / val_der
+    except:
+        return None
+    return None
+
+
+def analizar_muchos(codigos, hilos=None):
+    """Analiza varios programas a la vez en un pool de hilos
+
+    Cada hilo usa su propio Compilador; los resultados salen en el mismo orden de 'codigos'.
+    """
+    locales = threading.local()
+    
+    def analizar_uno(codigo):
+        compilador = getattr(locales, 'compilador', None)
+        if compilador is None:
+            compilador = locales.compilador = Compilador()
+        return compilador.analizar(codigo)
+    
+    with ThreadPoolExecutor(max_workers=hilos) as pool:
+        return list(pool.map(analizar_uno, codigos))
@@ -0,0 +1,52 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'leftMASMENOSleftPORDIVIDIDOCADENA_TEXTO CAPTURA COMA DIVIDIDO ENTERO IDENTIFICADOR IGUAL MAS MENOS MENSAJE NUMERO_ENTERO NUMERO_REAL PARENTESIS_DER PARENTESIS_IZQ POR PUNTO PUNTO_Y_COMA REAL TEXTOprograma : lista_sentenciaslista_sentencias : lista_sentencias sentencia\n                            | sentenciatipo : ENTERO\n                | REAL\n                | TEXTOsentencia : IDENTIFICADOR tipo PUNTO_Y_COMAsentencia : IDENTIFICADOR tiposentencia : IDENTIFICADOR IGUAL expresion PUNTO_Y_COMAsentencia : IDENTIFICADOR IGUAL expresionsentencia : MENSAJE PUNTO TEXTO PARENTESIS_IZQ CADENA_TEXTO PARENTESIS_DER PUNTO_Y_COMA\n                     | MENSAJE PUNTO TEXTO PARENTESIS_IZQ expresion PARENTESIS_DER PUNTO_Y_COMAexpresion : expresion MAS expresion\n                     | expresion MENOS expresion\n                     | expresion POR expresion\n                     | expresion DIVIDIDO expresionexpresion : PARENTESIS_IZQ expresion PARENTESIS_DERexpresion : NUMERO_ENTERO\n                     | NUMERO_REALexpresion : IDENTIFICADORexpresion : CADENA_TEXTOexpresion : CAPTURA PUNTO tipo PARENTESIS_IZQ expresion PARENTESIS_DER'
+    
+_lr_action_items = {'IDENTIFICADOR':([0,2,3,6,7,8,9,10,11,13,14,15,16,17,18,19,22,23,24,25,26,29,30,31,32,33,34,38,42,43,44,],[4,4,-3,-2,-8,14,-4,-5,-6,-7,-20,-10,14,-18,-19,-21,-9,14,14,14,14,14,-13,-14,-15,-16,-17,14,-11,-12,-22,]),'MENSAJE':([0,2,3,6,7,9,10,11,13,14,15,17,18,19,22,30,31,32,33,34,42,43,44,],[5,5,-3,-2,-8,-4,-5,-6,-7,-20,-10,-18,-19,-21,-9,-13,-14,-15,-16,-17,-11,-12,-22,]),'$end':([1,2,3,6,7,9,10,11,13,14,15,17,18,19,22,30,31,32,33,34,42,43,44,],[0,-1,-3,-2,-8,-4,-5,-6,-7,-20,-10,-18,-19,-21,-9,-13,-14,-15,-16,-17,-11,-12,-22,]),'IGUAL':([4,],[8,]),'ENTERO':([4,28,],[9,9,]),'REAL':([4,28,],[10,10,]),'TEXTO':([4,12,28,],[11,21,11,]),'PUNTO':([5,20,],[12,28,]),'PUNTO_Y_COMA':([7,9,10,11,14,15,17,18,19,30,31,32,33,34,39,40,44,],[13,-4,-5,-6,-20,22,-18,-19,-21,-13,-14,-15,-16,-17,42,43,-22,]),'PARENTESIS_IZQ':([8,9,10,11,16,21,23,24,25,26,29,35,38,],[16,-4,-5,-6,16,29,16,16,16,16,16,38,16,]),'NUMERO_ENTERO':([8,16,23,24,25,26,29,38,],[17,17,17,17,17,17,17,17,]),'NUMERO_REAL':([8,16,23,24,25,26,29,38,],[18,18,18,18,18,18,18,18,]),'CADENA_TEXTO':([8,16,23,24,25,26,29,38,],[19,19,19,19,19,19,36,19,]),'CAPTURA':([8,16,23,24,25,26,29,38,],[20,20,20,20,20,20,20,20,]),'MAS':([14,15,17,18,19,27,30,31,32,33,34,36,37,41,44,],[-20,23,-18,-19,-21,23,-13,-14,-15,-16,-17,-21,23,23,-22,]),'MENOS':([14,15,17,18,19,27,30,31,32,33,34,36,37,41,44,],[-20,24,-18,-19,-21,24,-13,-14,-15,-16,-17,-21,24,24,-22,]),'POR':([14,15,17,18,19,27,30,31,32,33,34,36,37,41,44,],[-20,25,-18,-19,-21,25,25,25,-15,-16,-17,-21,25,25,-22,]),'DIVIDIDO':([14,15,17,18,19,27,30,31,32,33,34,36,37,41,44,],[-20,26,-18,-19,-21,26,26,26,-15,-16,-17,-21,26,26,-22,]),'PARENTESIS_DER':([14,17,18,19,27,30,31,32,33,34,36,37,41,44,],[-20,-18,-19,-21,34,-13,-14,-15,-16,-17,39,40,44,-22,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'programa':([0,],[1,]),'lista_sentencias':([0,],[2,]),'sentencia':([0,2,],[3,6,]),'tipo':([4,28,],[7,35,]),'expresion':([8,16,23,24,25,26,29,38,],[15,27,30,31,32,33,37,41,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> programa","S'",1,None,None,None),
+  ('programa -> lista_sentencias','programa',1,'p_programa','parser.py',189),
+  ('lista_sentencias -> lista_sentencias sentencia','lista_sentencias',2,'p_lista_sentencias','parser.py',193),
+  ('lista_sentencias -> sentencia','lista_sentencias',1,'p_lista_sentencias','parser.py',194),
+  ('tipo -> ENTERO','tipo',1,'p_tipo','parser.py',201),
+  ('tipo -> REAL','tipo',1,'p_tipo','parser.py',202),
+  ('tipo -> TEXTO','tipo',1,'p_tipo','parser.py',203),
+  ('sentencia -> IDENTIFICADOR tipo PUNTO_Y_COMA','sentencia',3,'p_sentencia_declaracion','parser.py',207),
+  ('sentencia -> IDENTIFICADOR tipo','sentencia',2,'p_sentencia_declaracion_sin_punto_y_coma','parser.py',221),
+  ('sentencia -> IDENTIFICADOR IGUAL expresion PUNTO_Y_COMA','sentencia',4,'p_sentencia_asignacion','parser.py',228),
+  ('sentencia -> IDENTIFICADOR IGUAL expresion','sentencia',3,'p_sentencia_asignacion_sin_punto_y_coma','parser.py',253),
+  ('sentencia -> MENSAJE PUNTO TEXTO PARENTESIS_IZQ CADENA_TEXTO PARENTESIS_DER PUNTO_Y_COMA','sentencia',7,'p_sentencia_mensaje','parser.py',260),
+  ('sentencia -> MENSAJE PUNTO TEXTO PARENTESIS_IZQ expresion PARENTESIS_DER PUNTO_Y_COMA','sentencia',7,'p_sentencia_mensaje','parser.py',261),
+  ('expresion -> expresion MAS expresion','expresion',3,'p_expresion_binaria','parser.py',318),
+  ('expresion -> expresion MENOS expresion','expresion',3,'p_expresion_binaria','parser.py',319),
+  ('expresion -> expresion POR expresion','expresion',3,'p_expresion_binaria','parser.py',320),
+  ('expresion -> expresion DIVIDIDO expresion','expresion',3,'p_expresion_binaria','parser.py',321),
+  ('expresion -> PARENTESIS_IZQ expresion PARENTESIS_DER','expresion',3,'p_expresion_grupo','parser.py',325),
+  ('expresion -> NUMERO_ENTERO','expresion',1,'p_expresion_valor','parser.py',329),
+  ('expresion -> NUMERO_REAL','expresion',1,'p_expresion_valor','parser.py',330),
+  ('expresion -> IDENTIFICADOR','expresion',1,'p_expresion_identificador','parser.py',334),
+  ('expresion -> CADENA_TEXTO','expresion',1,'p_expresion_cadena','parser.py',345),
+  ('expresion -> CAPTURA PUNTO tipo PARENTESIS_IZQ expresion PARENTESIS_DER','expresion',6,'p_expresion_captura','parser.py',349),
+]
@@ -0,0 +1,394 @@
+"""Servidor de compilación: Compiladores ya armados esperando pedidos (sin interfaz gráfica).
+
+Arrancar un proceso por análisis paga cada vez importar ply, armar el lexer y cargar el
+autómata en Compilador(). El servidor arma una vez un pool de procesos con un
+Compilador cada uno y atiende pedidos JSON, uno por línea, por un socket Unix o por
+stdin/stdout:
+
+    python servidor_compilacion.py --socket /tmp/costenol.sock -j 4
+    python servidor_compilacion.py --stdio < pedidos.jsonl > respuestas.jsonl
+
+Pedidos (el 'id' es opcional y vuelve igual en la respuesta):
+
+    {"id": 1, "codigo": "a Entero; a = 1;"}
+    {"id": 2, "archivo": "programas/ejemplo.cos"}
+    {"id": 3, "op": "estadisticas"}
+
+Un análisis responde {"id", "exito", "aciertos", "errores", "mensajes", "segundos"}, con
+'segundos' el tiempo del análisis dentro del trabajador; un pedido mal formado responde
+{"id", "error"}. Cada conexión recibe sus respuestas en el orden de sus pedidos.
+
+Los pedidos que se juntan mientras los trabajadores están ocupados (de una o de varias
+conexiones) se mandan en lotes, para no pagar un viaje entre procesos por cada programa
+chico. Solo se aceptan '--pendientes' pedidos a la vez: con la cola llena el servidor
+deja de leer de las conexiones y el cliente queda esperando al escribir.
+"""
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import asyncio
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from parser import Compilador
+from compilar_lote import descartar_sentencia
+
+LIMITE_LINEA = 64 << 20         # Bytes máximos de un pedido (una línea)
+PENDIENTES = 256                # Pedidos aceptados y sin responder, en total
+LOTE_MAXIMO = 64                # Pedidos por lote
+BYTES_POR_LOTE = 1 << 20        # Un lote deja de crecer al pasar este tamaño de código
+MUESTRAS = 10000                # Latencias que se guardan para los percentiles
+
+# Compilador del proceso trabajador (se arma una sola vez por proceso)
+_compilador = None
+
+
+def iniciar_trabajador():
+    """Inicializa el Compilador del proceso para no pagar el arranque en cada pedido"""
+    global _compilador
+    _compilador = Compilador()
+
+
+def calentar():
+    """Tarea vacía: obliga al pool a arrancar sus procesos antes del primer pedido"""
+    return os.getpid()
+
+
+def analizar_pedido(pedido):
+    """Analiza un pedido ({'codigo': ...} o {'archivo': ...}) y retorna su respuesta sin 'id'"""
+    if _compilador is None:
+        iniciar_trabajador()
+
+    inicio = time.perf_counter()
+    try:
+        if 'archivo' in pedido:
+            resultado = _compilador.analizar_archivo(pedido['archivo'], receptor=descartar_sentencia)
+        else:
+            resultado = _compilador.analizar(pedido['codigo'], receptor=descartar_sentencia)
+    except (OSError, UnicodeDecodeError) as e:
+        return {
+            'exito': False,
+            'aciertos': 0,
+            'errores': 1,
+            'mensajes': [{'tipo': 'error', 'linea': '?', 'mensaje': f"¡Ombe! No pude leer el archivo: {e}"}],
+            'segundos': time.perf_counter() - inicio
+        }
+
+    return {
+        'exito': resultado['exito'],
+        'aciertos': resultado['estadisticas']['aciertos'],
+        'errores': resultado['estadisticas']['errores'],
+        'mensajes': resultado['mensajes'],
+        'segundos': time.perf_counter() - inicio
+    }
+
+
+def analizar_lote(pedidos):
+    """Un viaje al trabajador para varios pedidos"""
+    return [analizar_pedido(pedido) for pedido in pedidos]
+
+
+def percentiles(muestras):
+    """p50, p90, p99 y máximo (en milisegundos) de una lista de segundos"""
+    if not muestras:
+        return {'p50': None, 'p90': None, 'p99': None, 'max': None}
+    ordenadas = sorted(muestras)
+    ultima = len(ordenadas) - 1
+    return {
+        'p50': ordenadas[ultima * 50 // 100] * 1000,
+        'p90': ordenadas[ultima * 90 // 100] * 1000,
+        'p99': ordenadas[ultima * 99 // 100] * 1000,
+        'max': ordenadas[ultima] * 1000,
+    }
+
+
+class ServidorCompilacion:
+    """Cola de pedidos con contrapresión, despachada en lotes a un pool de Compiladores"""
+
+    def __init__(self, procesos=None, pendientes=PENDIENTES, lote_maximo=LOTE_MAXIMO):
+        self.procesos = procesos or os.cpu_count() or 1
+        self.pendientes = pendientes
+        self.lote_maximo = lote_maximo
+        self.pool = None
+        self.cola = None
+        self.despachador = None
+        # Estadísticas
+        self.inicio = time.monotonic()
+        self.recibidos = 0
+        self.respondidos = 0
+        self.invalidos = 0
+        self.lotes = 0
+        self.latencias = deque(maxlen=MUESTRAS)     # Desde que llega el pedido hasta su respuesta
+        self.analisis = deque(maxlen=MUESTRAS)      # Solo el análisis, medido en el trabajador
+
+    async def iniciar(self):
+        """Arranca el pool (con su Compilador ya armado en cada proceso) y el despachador"""
+        bucle = asyncio.get_running_loop()
+        self.cola = asyncio.Queue(self.pendientes)
+        self.pool = ProcessPoolExecutor(self.procesos, initializer=iniciar_trabajador)
+        await asyncio.gather(*(bucle.run_in_executor(self.pool, calentar) for _ in range(self.procesos)))
+        self.despachador = asyncio.create_task(self._despachar())
+
+    async def detener(self):
+        if self.despachador is not None:
+            self.despachador.cancel()
+            self.despachador = None
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    # ---------------- PEDIDOS ----------------
+    async def recibir(self, linea):
+        """Future con la respuesta a una línea del protocolo
+
+        Espera (contrapresión) mientras la cola esté llena.
+        """
+        futuro = asyncio.get_running_loop().create_future()
+        try:
+            pedido = json.loads(linea)
+            if not isinstance(pedido, dict):
+                raise ValueError("el pedido tiene que ser un objeto JSON")
+        except ValueError as e:
+            self.invalidos += 1
+            futuro.set_result({'id': None, 'error': f"Pedido inválido: {e}"})
+            return futuro
+
+        identificador = pedido.get('id')
+        op = pedido.get('op', 'analizar')
+        if op == 'estadisticas':
+            futuro.set_result({'id': identificador, 'estadisticas': self.estadisticas()})
+        elif op != 'analizar':
+            self.invalidos += 1
+            futuro.set_result({'id': identificador, 'error': f"Operación desconocida: {op!r}"})
+        elif not isinstance(pedido.get('codigo', pedido.get('archivo')), str):
+            self.invalidos += 1
+            futuro.set_result({'id': identificador, 'error': "Falta 'codigo' o 'archivo' (texto)"})
+        else:
+            self.recibidos += 1
+            await self.cola.put((pedido, futuro, time.perf_counter()))
+        return futuro
+
+    async def _despachar(self):
+        """Arma lotes con lo que haya en la cola apenas un trabajador queda libre"""
+        libres = asyncio.Semaphore(self.procesos)
+        while True:
+            await libres.acquire()
+            # ⭐ Mientras todos los trabajadores están ocupados la cola crece: el siguiente
+            # lote se lleva todo lo acumulado; sin carga, cada pedido sale solo y enseguida
+            lote = [await self.cola.get()]
+            tamano = len(lote[0][0].get('codigo', ''))
+            while len(lote) < self.lote_maximo and tamano < BYTES_POR_LOTE and not self.cola.empty():
+                lote.append(self.cola.get_nowait())
+                tamano += len(lote[-1][0].get('codigo', ''))
+            asyncio.create_task(self._procesar(lote, libres))
+
+    async def _procesar(self, lote, libres):
+        bucle = asyncio.get_running_loop()
+        try:
+            pedidos = [{clave: valor for clave, valor in pedido.items() if clave in ('codigo', 'archivo')}
+                       for pedido, _, _ in lote]
+            respuestas = await bucle.run_in_executor(self.pool, analizar_lote, pedidos)
+        except Exception as e:
+            respuestas = [{'error': f"¡Qué desastre! Se dañó el trabajador: {e}"}] * len(lote)
+        finally:
+            libres.release()
+        self.lotes += 1
+
+        ahora = time.perf_counter()
+        for (pedido, futuro, llegada), respuesta in zip(lote, respuestas):
+            respuesta = {'id': pedido.get('id'), **respuesta}
+            self.respondidos += 1
+            self.latencias.append(ahora - llegada)
+            if 'segundos' in respuesta:
+                self.analisis.append(respuesta['segundos'])
+            if not futuro.done():
+                futuro.set_result(respuesta)
+
+    def estadisticas(self):
+        """Contadores, tamaño de los lotes y percentiles de latencia (ms)"""
+        return {
+            'procesos': self.procesos,
+            'segundos_activo': time.monotonic() - self.inicio,
+            'recibidos': self.recibidos,
+            'respondidos': self.respondidos,
+            'invalidos': self.invalidos,
+            'en_cola': self.cola.qsize() if self.cola is not None else 0,
+            'lotes': self.lotes,
+            'pedidos_por_lote': self.respondidos / self.lotes if self.lotes else 0.0,
+            'latencia_ms': percentiles(self.latencias),
+            'analisis_ms': percentiles(self.analisis),
+        }
+
+    # ---------------- CONEXIONES ----------------
+    async def atender(self, leer, escribir):
+        """Atiende una conexión: lee pedidos y escribe las respuestas en el mismo orden
+
+        'leer' es una corrutina que retorna la siguiente línea (vacía al terminar) y
+        'escribir' una que manda una línea de respuesta.
+        """
+        # Acotada: si el cliente no lee sus respuestas, se deja de leer sus pedidos
+        en_orden = asyncio.Queue(self.pendientes)
+
+        async def responder():
+            while True:
+                futuro = await en_orden.get()
+                if futuro is None:
+                    return
+                await escribir(json.dumps(await futuro, ensure_ascii=False) + '\n')
+
+        escritor = asyncio.create_task(responder())
+        try:
+            while not escritor.done():
+                try:
+                    linea = await leer()
+                except ValueError:
+                    # Línea más larga que LIMITE_LINEA: no hay forma de seguir leyendo
+                    futuro = asyncio.get_running_loop().create_future()
+                    futuro.set_result({'id': None, 'error': f"Pedido de más de {LIMITE_LINEA} bytes"})
+                    await en_orden.put(futuro)
+                    break
+                if not linea:
+                    break
+                if linea.strip():
+                    await en_orden.put(await self.recibir(linea))
+        finally:
+            await en_orden.put(None)
+            try:
+                await escritor
+            except (ConnectionError, BrokenPipeError):
+                pass    # El cliente se fue sin leer sus respuestas
+
+    async def servir_socket(self, ruta, detener):
+        """Escucha en un socket Unix hasta que se active el evento 'detener'"""
+        async def conexion(lector, escritor):
+            async def escribir(texto):
+                escritor.write(texto.encode('utf-8'))
+                await escritor.drain()
+            try:
+                await self.atender(lector.readline, escribir)
+            finally:
+                escritor.close()
+
+        if os.path.exists(ruta):
+            os.remove(ruta)     # Socket viejo de un servidor que no cerró bien
+        servidor = await asyncio.start_unix_server(conexion, path=ruta, limit=LIMITE_LINEA)
+        try:
+            await detener.wait()
+        finally:
+            servidor.close()
+            await servidor.wait_closed()
+            if os.path.exists(ruta):
+                os.remove(ruta)
+
+    async def servir_stdio(self, entrada=None, salida=None):
+        """Atiende una sola conexión por stdin/stdout hasta el fin de la entrada"""
+        entrada = entrada or sys.stdin.buffer
+        salida = salida or sys.stdout.buffer
+        bucle = asyncio.get_running_loop()
+
+        async def leer():
+            linea = await bucle.run_in_executor(None, entrada.readline, LIMITE_LINEA + 1)
+            if len(linea) > LIMITE_LINEA:
+                raise ValueError("línea demasiado larga")
+            return linea
+
+        async def escribir(texto):
+            salida.write(texto.encode('utf-8'))
+            salida.flush()
+
+        await self.atender(leer, escribir)
+
+
+class ClienteCompilacion:
+    """Cliente síncrono del socket: un pedido y su respuesta a la vez"""
+
+    def __init__(self, ruta, espera=10.0):
+        """Conecta al socket, esperando hasta 'espera' segundos a que el servidor lo cree"""
+        limite = time.monotonic() + espera
+        while True:
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                self.socket.connect(ruta)
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                self.socket.close()
+                if time.monotonic() > limite:
+                    raise
+                time.sleep(0.05)
+        self.archivo = self.socket.makefile('rwb')
+        self.siguiente_id = 0
+
+    def pedir(self, pedido):
+        self.siguiente_id += 1
+        pedido = {'id': self.siguiente_id, **pedido}
+        self.archivo.write(json.dumps(pedido, ensure_ascii=False).encode('utf-8') + b'\n')
+        self.archivo.flush()
+        linea = self.archivo.readline()
+        if not linea:
+            raise ConnectionError("El servidor cerró la conexión")
+        return json.loads(linea)
+
+    def analizar(self, codigo):
+        return self.pedir({'codigo': codigo})
+
+    def analizar_archivo(self, ruta):
+        return self.pedir({'archivo': os.path.abspath(ruta)})
+
+    def estadisticas(self):
+        return self.pedir({'op': 'estadisticas'})['estadisticas']
+
+    def cerrar(self):
+        self.archivo.close()
+        self.socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+
+async def correr(opciones):
+    servidor = ServidorCompilacion(opciones.procesos, opciones.pendientes, opciones.lote_maximo)
+    await servidor.iniciar()
+    try:
+        if opciones.stdio:
+            await servidor.servir_stdio()
+        else:
+            detener = asyncio.Event()
+            bucle = asyncio.get_running_loop()
+            for senal in (signal.SIGINT, signal.SIGTERM):
+                bucle.add_signal_handler(senal, detener.set)
+            print(f"🚀 Escuchando en {opciones.socket} con {servidor.procesos} proceso(s)", file=sys.stderr)
+            await servidor.servir_socket(opciones.socket, detener)
+    finally:
+        await servidor.detener()
+    estadisticas = servidor.estadisticas()
+    latencia = estadisticas['latencia_ms']
+    if estadisticas['respondidos']:
+        print(f"📊 {estadisticas['respondidos']} pedido(s) en {estadisticas['lotes']} lote(s); latencia "
+              f"p50 {latencia['p50']:.2f} ms, p99 {latencia['p99']:.2f} ms", file=sys.stderr)
+
+
+def main(argv=None):
+    argumentos = argparse.ArgumentParser(description="Atiende pedidos de compilación con Compiladores ya armados")
+    modo = argumentos.add_mutually_exclusive_group(required=True)
+    modo.add_argument('--socket', metavar='RUTA', help="socket Unix donde escuchar")
+    modo.add_argument('--stdio', action='store_true', help="leer pedidos de stdin y responder por stdout")
+    argumentos.add_argument('-j', '--procesos', type=int, default=None,
+                            help="procesos trabajadores (por defecto, uno por núcleo)")
+    argumentos.add_argument('--pendientes', type=int, default=PENDIENTES,
+                            help=f"pedidos aceptados sin responder antes de dejar de leer (por defecto {PENDIENTES})")
+    argumentos.add_argument('--lote-maximo', type=int, default=LOTE_MAXIMO,
+                            help=f"pedidos por lote (por defecto {LOTE_MAXIMO})")
+    opciones = argumentos.parse_args(argv)
+    asyncio.run(correr(opciones))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,81 @@
+from array import array
+
+from tipos import TIPOS_DECLARABLES, CODIGOS_TIPO
+
+# ------------------- TABLA DE SÍMBOLOS -------------------
+# Cada variable recibe una posición (slot) al declararse y sus datos van en arreglos
+# paralelos: el tipo como código de un byte, la línea como entero y el valor (la
+# expresión asignada, o None) en una lista. Antes era un diccionario por variable
+# ({'tipo', 'valor', 'linea'}), que con cientos de miles de variables pesaba bastante.
+
+class TablaSimbolos:
+    """Variables declaradas: nombre -> slot, y tipo, valor y línea por slot"""
+    __slots__ = ('slots', 'nombres', 'tipos', 'valores', 'lineas')
+
+    def __init__(self):
+        self.slots = {}                 # Nombre -> slot
+        self.nombres = []               # Slot -> nombre
+        self.tipos = array('b')         # Slot -> código de tipo (ver tipos.CODIGOS_TIPO)
+        self.valores = []               # Slot -> expresión asignada, o None
+        self.lineas = array('q')        # Slot -> línea de la declaración
+
+    def __len__(self):
+        return len(self.nombres)
+
+    def __contains__(self, nombre):
+        return nombre in self.slots
+
+    def clear(self):
+        self.slots.clear()
+        self.nombres.clear()
+        del self.tipos[:]
+        self.valores = []       # Puede ser una secuencia de solo lectura (ver restaurar)
+        del self.lineas[:]
+
+    def restaurar(self, nombres, tipos, lineas, valores):
+        """Carga la tabla entera de una vez (un acierto de cache_compilacion.py)
+
+        'tipos' y 'lineas' son los bytes de sus arreglos; 'valores' puede ser una
+        secuencia que arma las expresiones al leerlas, hasta el próximo clear().
+        """
+        self.nombres = list(nombres)
+        self.slots = dict(zip(self.nombres, range(len(self.nombres))))
+        self.tipos = array('b', tipos)
+        self.lineas = array('q')
+        self.lineas.frombytes(lineas)
+        self.valores = valores
+
+    def slot(self, nombre):
+        """Slot de la variable, o None si no está declarada"""
+        return self.slots.get(nombre)
+
+    def declarar(self, nombre, tipo, linea):
+        """Agrega la variable (tipo como texto: 'Entero', 'Real' o 'Texto') y retorna su slot"""
+        slot = len(self.nombres)
+        self.slots[nombre] = slot
+        self.nombres.append(nombre)
+        self.tipos.append(CODIGOS_TIPO[tipo])
+        self.valores.append(None)
+        self.lineas.append(linea)
+        return slot
+
+    def quitar_ultima(self):
+        """Deshace la última declaración (el análisis incremental deshace en orden inverso)"""
+        del self.slots[self.nombres.pop()]
+        self.tipos.pop()
+        self.valores.pop()
+        self.lineas.pop()
+
+    def tipo(self, slot):
+        """Tipo declarado de la variable"""
+        return TIPOS_DECLARABLES[self.tipos[slot]]
+
+    def asignar(self, slot, expresion):
+        self.valores[slot] = expresion
+
+    def como_diccionario(self):
+        """La tabla en el formato anterior, {nombre: {'tipo', 'valor', 'linea'}} (para depurar)"""
+        return {
+            nombre: {'tipo': self.tipo(slot).value, 'valor': self.valores[slot], 'linea': self.lineas[slot]}
+            for slot, nombre in enumerate(self.nombres)
+        }
@@ -0,0 +1,57 @@
+from enum import Enum
+
+# ----------------------- TIPOS -----------------------------
+class Tipo(Enum):
+    """Tipos que puede tener una expresión de Costeñol"""
+    ENTERO = 'Entero'
+    REAL = 'Real'
+    TEXTO = 'Texto'
+    ERROR = 'Error'              # Expresión con una variable no declarada
+    DESCONOCIDO = 'Desconocido'
+
+    def __str__(self):
+        return self.value
+
+NUMERICOS = (Tipo.ENTERO, Tipo.REAL)
+
+# Tipos que se pueden declarar; la tabla de símbolos guarda su posición como código
+TIPOS_DECLARABLES = (Tipo.ENTERO, Tipo.REAL, Tipo.TEXTO)
+CODIGOS_TIPO = {tipo.value: codigo for codigo, tipo in enumerate(TIPOS_DECLARABLES)}
+# Tipos de expresión que acepta una variable de cada tipo, por código
+COMPATIBLES = ((Tipo.ENTERO,), (Tipo.ENTERO, Tipo.REAL), (Tipo.TEXTO,))
+
+# ------------------- ERRORES DE TIPO -------------------------
+# Códigos de error; los fatales son los que antes llevaban el prefijo 'Error:'
+SIN_VALOR = 'SIN_VALOR'
+CAPTURA_ENTERO = 'CAPTURA_ENTERO'
+CAPTURA_REAL = 'CAPTURA_REAL'
+CAPTURA_TEXTO = 'CAPTURA_TEXTO'
+SUMA_TEXTO = 'SUMA_TEXTO'
+OPERACION_NO_NUMERICA = 'OPERACION_NO_NUMERICA'
+
+class ErrorTipo:
+    """Error de tipos: código, nodo donde se originó y mensaje para la consola"""
+    __slots__ = ('codigo', 'nodo', 'mensaje', 'fatal', 'causa', 'linea')
+
+    def __init__(self, codigo, nodo, mensaje, fatal=False, causa=None):
+        self.codigo = codigo
+        self.nodo = nodo          # Subexpresión donde nació el error
+        self.mensaje = mensaje
+        self.causa = causa        # Error de una subexpresión que provocó este
+        # ⭐ Un error que envuelve a uno fatal también es fatal
+        self.fatal = fatal or es_error_fatal(causa)
+        self.linea = None         # La pone la sentencia que reporta el error
+
+    def __str__(self):
+        return self.mensaje
+
+    def __repr__(self):
+        return f"ErrorTipo({self.codigo!r}, {self.mensaje!r})"
+
+def es_error(tipo):
+    """Indica si el resultado de una validación de tipos es un error"""
+    return isinstance(tipo, ErrorTipo)
+
+def es_error_fatal(tipo):
+    """Indica si el resultado es un error que invalida toda la sentencia"""
+    return isinstance(tipo, ErrorTipo) and tipo.fatal